@@ -0,0 +1,16 @@
+"""
+Celery application for background jobs (Notion sync/ingest).
+
+Run a dedicated worker for the Notion queue with:
+    celery -A config worker -Q notion_sync --concurrency=2
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+app = Celery("config")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
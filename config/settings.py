@@ -346,3 +346,50 @@ LOGGING = {
 # RAG Search API Configuration
 RAG_API_BASE_URL = os.getenv('RAG_API_BASE_URL', 'http://localhost:8000')
 RAG_API_KEY = os.getenv('RAG_API_KEY', 'placeholder-api-key-change-in-production')
+RAG_INGEST_CONCURRENCY = int(os.getenv('RAG_INGEST_CONCURRENCY', '4'))
+RAG_INGEST_MAX_RETRIES = int(os.getenv('RAG_INGEST_MAX_RETRIES', '3'))
+# Pages with at least this much text are ingested as one RAG document per heading section (0 disables).
+RAG_SECTION_MIN_CHARS = int(os.getenv('RAG_SECTION_MIN_CHARS', '8000'))
+
+# Notion page views with ?source=mirror serve the synced copy without calling
+# Notion for this many seconds after it was last fetched or validated.
+NOTION_MIRROR_MAX_AGE_SECONDS = int(os.getenv('NOTION_MIRROR_MAX_AGE_SECONDS', '300'))
+
+# The dashboard follows sync jobs by long-polling their events. Server-Sent Events
+# hold a worker per open stream, so only enable them behind gthread or async workers.
+NOTION_SYNC_EVENT_STREAM = os.getenv('NOTION_SYNC_EVENT_STREAM', 'false').lower() == 'true'
+
+# Shared cache (Microsoft Graph drive catalogs and app-only tokens). Without
+# CACHE_REDIS_URL each worker process keeps its own in-memory cache, so app
+# tokens and their fetch lock are per-process too.
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', '')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+
+# Celery (background jobs). When CELERY_BROKER_URL is unset, Notion sync jobs
+# fall back to in-process threads in the web worker.
+# The Notion rate limit (NOTION_RATE_LIMIT_PER_SECOND, default 3 req/s) is a
+# per-process token bucket unless NOTION_RATE_LIMIT_REDIS_URL is set, so every
+# Gunicorn worker and Celery worker process gets its own full budget and
+# together they can exceed Notion's limit (answered with 429s).
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', '')
+CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND') or None
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_ROUTES = {
+    'notion_integration.tasks.*': {'queue': 'notion_sync'},
+}
+# Redis redelivers unacked tasks after the visibility timeout; keep it above the longest sync.
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'visibility_timeout': int(os.getenv('CELERY_VISIBILITY_TIMEOUT_SECONDS', str(6 * 60 * 60))),
+}
+# A running sync job renews its lease while it works; a redelivered task only takes
+# the job over once the last heartbeat is older than this.
+NOTION_SYNC_JOB_LEASE_SECONDS = int(os.getenv('NOTION_SYNC_JOB_LEASE_SECONDS', '600'))
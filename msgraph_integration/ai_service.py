@@ -156,6 +156,9 @@ class CompanyAssistantService:
                 elif source_type == "notion":
                     metadata = hit.get("metadata", {}) or {}
                     title = metadata.get("title") or "Notion content"
+                    if metadata.get("notion_section_title"):
+                        title = f"{title} › {metadata['notion_section_title']}"
+                    # Section documents carry the parent page URL as their source.
                     url = metadata.get("source") or ""
                     date = metadata.get("last_edited_time", "")
                     snippet = hit.get("content", "").strip() or summary or "Notion document match"
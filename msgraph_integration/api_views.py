@@ -13,18 +13,25 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.renderers import JSONRenderer
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.utils.http import content_disposition_header, http_date, quote_etag
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.conf import settings
 
-from .services_delegated import GraphServiceDelegated, GraphTokenExpiredError
+from .services_delegated import GraphServiceDelegated, GraphTokenExpiredError, batch_response_body
 from .serializers import UserProfileSerializer
+from .drive_catalog import drive_catalog_owner, get_drive_catalog, invalidate_drive_catalog
 from .models import CompanyAssistantSearchLog
 
 
 logger = logging.getLogger(__name__)
 RAG_API_TIMEOUT = 60
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+_BYTE_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Graph eTags contain commas ("{GUID},3"), so Django's comma-splitting parse_etags cannot read them.
+_ETAG_LIST_RE = re.compile(r'(?:W/)?"[^"]*"|\*')
 
 
 def _resolve_account_identifier(request) -> str:
@@ -110,6 +117,47 @@ def _notion_result_count(payload: dict | None) -> int:
     return 0
 
 
+def _parse_byte_range(range_header: str, size: int):
+    """
+    Parse a single-range `Range: bytes=...` header against a file of `size` bytes.
+
+    Returns an inclusive (start, end) tuple, or None when the header is absent,
+    malformed or asks for several ranges (the whole file is served then).
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = _BYTE_RANGE_RE.match((range_header or "").strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        # Suffix range: the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+        if int(last) == 0:
+            raise ValueError("Empty suffix range")
+    if start >= size:
+        raise ValueError("Range starts beyond the end of the file")
+    return start, end
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    etags = [value.removeprefix("W/") for value in _ETAG_LIST_RE.findall(header or "")]
+    return "*" in etags or etag in etags
+
+
+def _stream_download(upstream):
+    # Close the upstream connection however the client stops reading.
+    try:
+        yield from upstream.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES)
+    finally:
+        upstream.close()
+
+
 def parse_amount_from_filename(filename):
     """
     Parse transaction amount from expense receipt filename.
@@ -414,36 +462,12 @@ class MyTeamsChannelMessagesAPIView(APIView):
         try:
             max_per_channel = int(request.query_params.get('max_per_channel', 10))
             graph_service = GraphServiceDelegated()
+            # System event, deleted and bot messages are dropped while fetching
             messages_data = graph_service.get_all_my_channel_messages(
                 access_token, 
                 max_messages_per_channel=max_per_channel
             )
             
-            # Filter out system event messages, deleted messages, and bot messages
-            if messages_data.get('teams'):
-                for team in messages_data['teams']:
-                    if team.get('channels'):
-                        for channel in team['channels']:
-                            if channel.get('messages'):
-                                # Filter out unwanted messages:
-                                # - System event messages (content is '<systemEventMessage/>')
-                                # - Deleted messages (deletedDateTime is not None)
-                                # - Bot messages (from.user is None)
-                                channel['messages'] = [
-                                    msg for msg in channel['messages']
-                                    if msg.get('body', {}).get('content') != '<systemEventMessage/>'
-                                    and msg.get('deletedDateTime') is None
-                                    and msg.get('from', {}).get('user') is not None
-                                ]
-                
-                # Recalculate total_messages after filtering
-                total = 0
-                for team in messages_data['teams']:
-                    if team.get('channels'):
-                        for channel in team['channels']:
-                            total += len(channel.get('messages', []))
-                messages_data['total_messages'] = total
-            
             # Create response with cache-control headers to prevent caching
             response = Response(messages_data, status=status.HTTP_200_OK)
             response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
@@ -841,7 +865,19 @@ class AllAccessibleDrivesAPIView(APIView):
         - `_source`: 'personal' or 'sharepoint'
         - `_siteName`: SharePoint site name (for SharePoint drives)
         - `_siteId`: SharePoint site ID (for SharePoint drives)
+        
+        The catalog is cached per user. `cacheStatus` is `hit`, `stale` (served
+        while a background refresh runs) or `miss`; pass `refresh=true` to
+        rebuild it now, or DELETE this endpoint to drop it.
         """,
+        parameters=[
+            OpenApiParameter(
+                name='refresh',
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                description='Rebuild the cached drive catalog before responding',
+            ),
+        ],
         responses={200: dict},
         tags=['Microsoft Graph - SharePoint']
     )
@@ -858,8 +894,11 @@ class AllAccessibleDrivesAPIView(APIView):
             )
         
         try:
+            force_refresh = request.query_params.get('refresh', 'false').lower() == 'true'
             graph_service = GraphServiceDelegated()
-            all_drives = graph_service.list_all_accessible_drives(access_token)
+            all_drives = get_drive_catalog(
+                graph_service, access_token, drive_catalog_owner(request), force_refresh=force_refresh
+            )
             
             return Response(all_drives, status=status.HTTP_200_OK)
             
@@ -868,6 +907,19 @@ class AllAccessibleDrivesAPIView(APIView):
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    @extend_schema(
+        summary="Invalidate Cached Drive Catalog",
+        description="Drop the cached drive catalog so the next request lists drives from Microsoft Graph",
+        responses={204: None},
+        tags=['Microsoft Graph - SharePoint']
+    )
+    def delete(self, request):
+        """
+        Drop the cached drive catalog for the current user
+        """
+        invalidate_drive_catalog(drive_catalog_owner(request))
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class SearchAllDrivesIncludingSharePointAPIView(APIView):
@@ -890,6 +942,10 @@ class SearchAllDrivesIncludingSharePointAPIView(APIView):
         - `source`: 'personal' or 'sharepoint'
         - `siteName`: SharePoint site name (for SharePoint files)
         
+        Drives come from the cached drive catalog and are searched concurrently
+        under an overall deadline; drives that did not answer in time are listed
+        in `timedOutDrives` and `partial` is true.
+        
         Query parameters:
         - `q`: Search query (required)
         - `top`: Maximum number of results per drive (default: 50)
@@ -935,7 +991,10 @@ class SearchAllDrivesIncludingSharePointAPIView(APIView):
             top = int(request.query_params.get('top', 50))
             
             graph_service = GraphServiceDelegated()
-            results = graph_service.search_all_drives_including_sharepoint(access_token, query, top)
+            catalog = get_drive_catalog(graph_service, access_token, drive_catalog_owner(request))
+            results = graph_service.search_all_drives_including_sharepoint(
+                access_token, query, top, drives=catalog.get('value', [])
+            )
             
             return Response(results, status=status.HTTP_200_OK)
             
@@ -1416,14 +1475,19 @@ class AssistantChatAPIView(APIView):
             graph_service = GraphServiceDelegated()
             search_results = {}
 
-            def search_sharepoint():
-                return graph_service.global_search(access_token, keywords, size=10)
-
-            def search_teams():
-                return graph_service.global_search(access_token, keywords, entity_types=["chatMessage"], size=10)
+            graph_searches = {
+                'sharepoint': {'query': keywords, 'size': 10},
+                'teams': {'query': keywords, 'entity_types': ["chatMessage"], 'size': 10},
+                'email': {'query': keywords, 'entity_types': ["message"], 'size': 10},
+            }
+            graph_sources = [source_name for source_name in graph_searches if source_name in sources]
 
-            def search_email():
-                return graph_service.global_search(access_token, keywords, entity_types=["message"], size=10)
+            def search_graph():
+                # SharePoint, Teams and email searches share one $batch round-trip
+                results = graph_service.global_search_batch(
+                    access_token, [graph_searches[source_name] for source_name in graph_sources]
+                )
+                return dict(zip(graph_sources, results))
 
             def search_notion():
                 primary = _search_notion_rag(
@@ -1457,19 +1521,13 @@ class AssistantChatAPIView(APIView):
 
             with concurrent.futures.ThreadPoolExecutor() as executor:
                 futures = {}
-                if 'sharepoint' in sources:
-                    futures['sharepoint'] = executor.submit(search_sharepoint)
-                if 'teams' in sources:
-                    futures['teams'] = executor.submit(search_teams)
-                if 'email' in sources:
-                    futures['email'] = executor.submit(search_email)
+                if graph_sources:
+                    futures['graph'] = executor.submit(search_graph)
                 if 'notion' in sources:
                     futures['notion'] = executor.submit(search_notion)
 
                 source_timeouts = {
-                    "sharepoint": 20,
-                    "teams": 20,
-                    "email": 20,
+                    "graph": 20,
                     # Notion may do keyword search + fallback full-question search.
                     "notion": 45,
                 }
@@ -1485,6 +1543,19 @@ class AssistantChatAPIView(APIView):
                         )
                         search_results[source_name] = None
 
+                graph_results = search_results.pop('graph', None) or {}
+                for source_name in graph_sources:
+                    try:
+                        search_results[source_name] = batch_response_body(graph_results[source_name])
+                    except Exception as exc:
+                        if source_name in graph_results:
+                            logger.warning(
+                                "assistant_source_search_failed source=%s error=%s",
+                                source_name,
+                                str(exc),
+                            )
+                        search_results[source_name] = None
+
             # Stage 3: Synthesize answer with citations
             result = assistant.chat(
                 question=question,
@@ -1744,6 +1815,11 @@ class DownloadFileAPIView(APIView):
         Download a file from OneDrive or SharePoint by its item ID.
         
         The file will be returned as a binary download with appropriate content type.
+        It is streamed from Microsoft's download URL without being buffered here.
+        
+        Supports `Range: bytes=start-end` (206 Partial Content, with `If-Range`)
+        and conditional requests on the item eTag (`If-None-Match` → 304,
+        `If-Match` → 412).
         
         Query parameters:
         - `item_id`: File item ID (required)
@@ -1775,9 +1851,13 @@ class DownloadFileAPIView(APIView):
                     'application/octet-stream': {}
                 }
             },
+            206: {'description': 'Requested byte range of the file'},
+            304: {'description': 'Not modified (If-None-Match matched the eTag)'},
             400: {'description': 'Missing required parameter: item_id'},
             401: {'description': 'Not authenticated with Microsoft'},
             404: {'description': 'File not found'},
+            412: {'description': 'If-Match did not match the eTag'},
+            416: {'description': 'Range not satisfiable'},
             500: {'description': 'Server error'}
         },
         tags=['Microsoft Graph - OneDrive']
@@ -1806,23 +1886,52 @@ class DownloadFileAPIView(APIView):
             
             graph_service = GraphServiceDelegated()
             
-            # Get file metadata first to get filename and mime type
-            if drive_id:
-                endpoint = f"/drives/{drive_id}/items/{item_id}"
-            else:
-                endpoint = f"/me/drive/items/{item_id}"
-            
-            file_metadata = graph_service._make_request(endpoint, access_token)
+            # One metadata call: filename, mime type, size, eTag and the download URL
+            file_metadata = graph_service.get_drive_item(access_token, item_id, drive_id)
             filename = file_metadata.get('name', 'download')
             mime_type = file_metadata.get('file', {}).get('mimeType', 'application/octet-stream')
+            size = file_metadata.get('size')
+            etag = file_metadata.get('eTag')
+            etag = quote_etag(etag) if etag else None
+            last_modified = parse_datetime(file_metadata.get('lastModifiedDateTime') or '')
+            
+            validator_headers = {'Accept-Ranges': 'bytes'}
+            if etag:
+                validator_headers['ETag'] = etag
+            if last_modified:
+                validator_headers['Last-Modified'] = http_date(last_modified.timestamp())
+            
+            if etag and request.headers.get('If-Match') and not _etag_matches(request.headers['If-Match'], etag):
+                return HttpResponse(status=status.HTTP_412_PRECONDITION_FAILED, headers=validator_headers)
+            if etag and _etag_matches(request.headers.get('If-None-Match'), etag):
+                return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers=validator_headers)
+            
+            byte_range = None
+            range_header = request.headers.get('Range')
+            if_range = request.headers.get('If-Range')
+            # A Range with a stale If-Range validator gets the whole (changed) file
+            if range_header and isinstance(size, int) and (not if_range or (etag and if_range == etag)):
+                try:
+                    byte_range = _parse_byte_range(range_header, size)
+                except ValueError:
+                    return HttpResponse(
+                        status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                        headers={**validator_headers, 'Content-Range': f'bytes */{size}'},
+                    )
             
-            # Download the file content
-            file_content = graph_service.download_file(access_token, item_id, drive_id)
-            
-            # Return as HTTP response with appropriate headers
-            response = HttpResponse(file_content, content_type=mime_type)
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            response['Content-Length'] = len(file_content)
+            # Pipe the pre-authenticated download URL through in chunks
+            upstream = graph_service.open_download_stream(file_metadata, byte_range)
+            response = StreamingHttpResponse(_stream_download(upstream), content_type=mime_type)
+            for header, value in validator_headers.items():
+                response[header] = value
+            response['Content-Disposition'] = content_disposition_header(True, filename)
+            if byte_range is not None and upstream.status_code == status.HTTP_206_PARTIAL_CONTENT:
+                start, end = byte_range
+                response.status_code = status.HTTP_206_PARTIAL_CONTENT
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+                response['Content-Length'] = end - start + 1
+            elif isinstance(size, int):
+                response['Content-Length'] = size
             
             return response
             
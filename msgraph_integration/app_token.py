@@ -0,0 +1,199 @@
+"""
+Process-wide app-only (client credentials) token provider for Microsoft Graph.
+
+One MSAL ConfidentialClientApplication is built per process and its token cache
+is serialized to the Django cache, together with a fetch lock taken with
+cache.add. Tokens are only shared across gunicorn workers when that cache is
+shared, i.e. when CACHE_REDIS_URL is set; with the default LocMemCache both the
+serialized cache and the lock are per-process, so every worker fetches and
+refreshes its own token (a warning is logged once per process). Callers get the
+in-memory token without touching MSAL while it has more than
+MICROSOFT_GRAPH_TOKEN_REFRESH_MARGIN_SECONDS (default 300) left; inside that
+margin the still-valid token is returned and a background thread refreshes it.
+Only a cold start blocks on login.microsoftonline.com.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from msal import ConfidentialClientApplication, SerializableTokenCache
+
+
+logger = logging.getLogger(__name__)
+
+GRAPH_APP_SCOPES = ["https://graph.microsoft.com/.default"]
+TOKEN_CACHE_KEY_PREFIX = "msgraph:app_token_cache:"
+# Other workers wait this long for the one fetching a token before fetching their own.
+TOKEN_FETCH_LOCK_SECONDS = 15
+# Cache backends whose contents never leave the process.
+PER_PROCESS_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+_per_process_warning_logged = False
+
+
+class GraphAppTokenError(Exception):
+    """Raised when an app-only Microsoft Graph token cannot be acquired."""
+    pass
+
+
+def get_token_refresh_margin() -> float:
+    return float(os.getenv("MICROSOFT_GRAPH_TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+
+
+def _warn_if_cache_is_per_process() -> None:
+    global _per_process_warning_logged
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if backend in PER_PROCESS_CACHE_BACKENDS and not _per_process_warning_logged:
+        _per_process_warning_logged = True
+        logger.warning(
+            "graph_app_token_cache_per_process backend=%s; set CACHE_REDIS_URL to share app tokens across workers",
+            backend,
+        )
+
+
+class GraphAppTokenProvider:
+    """
+    Client credentials tokens for one app registration, shared across threads and workers.
+    """
+
+    def __init__(self, client_id: str, client_secret: str, tenant_id: str):
+        self.client_id = client_id
+        self.authority = f"https://login.microsoftonline.com/{tenant_id}"
+        key = hashlib.sha256(f"{tenant_id}:{client_id}".encode("utf-8")).hexdigest()[:16]
+        self.cache_key = f"{TOKEN_CACHE_KEY_PREFIX}{key}"
+        self.token_cache = SerializableTokenCache()
+        self.app = ConfidentialClientApplication(
+            client_id,
+            authority=self.authority,
+            client_credential=client_secret,
+            token_cache=self.token_cache,
+        )
+        self._fetch_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._tokens: dict[tuple, tuple[str, float]] = {}
+        self._refreshing: set[tuple] = set()
+        _warn_if_cache_is_per_process()
+
+    def get_token(self, scopes: list[str]) -> str:
+        key = tuple(sorted(scopes))
+        token = self._fresh_token(key)
+        if token:
+            return token
+        cached = self._tokens.get(key)
+        if cached and cached[1] - time.time() > 0:
+            self._refresh_in_background(key)
+            return cached[0]
+        return self._acquire(key)
+
+    def _refresh_in_background(self, key: tuple) -> None:
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self._acquire(key)
+            except Exception as exc:
+                logger.warning("graph_app_token_refresh_failed client_id=%s error=%s", self.client_id, exc)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name="graph-app-token-refresh", daemon=True).start()
+
+    def _fresh_token(self, key: tuple) -> Optional[str]:
+        cached = self._tokens.get(key)
+        if cached and cached[1] - time.time() > get_token_refresh_margin():
+            return cached[0]
+        return None
+
+    def _load_shared_cache(self) -> None:
+        serialized = cache.get(self.cache_key)
+        if serialized:
+            self.token_cache.deserialize(serialized)
+
+    def _acquire_from_msal(self, key: tuple) -> dict:
+        self._load_shared_cache()
+        result = self.app.acquire_token_for_client(scopes=list(key))
+        if "access_token" in result and result.get("expires_in", 0) <= get_token_refresh_margin():
+            # The shared cache still holds the expiring token; drop it so MSAL fetches a new one.
+            # Tokens for other scopes or app registrations in the same cache are left alone.
+            expiring = self.token_cache.search(
+                SerializableTokenCache.CredentialType.ACCESS_TOKEN,
+                target=list(key),
+                query={"client_id": self.client_id},
+            )
+            for entry in list(expiring):
+                self.token_cache.remove_at(entry)
+            result = self.app.acquire_token_for_client(scopes=list(key))
+        return result
+
+    def _acquire(self, key: tuple) -> str:
+        with self._fetch_lock:
+            # Another thread of this worker may have fetched while we waited.
+            token = self._fresh_token(key)
+            if token:
+                return token
+            lock_key = f"{self.cache_key}:lock"
+            have_lock = cache.add(lock_key, os.getpid(), timeout=TOKEN_FETCH_LOCK_SECONDS)
+            try:
+                if not have_lock:
+                    # Another worker is fetching; give it a moment to publish the token.
+                    deadline = time.monotonic() + TOKEN_FETCH_LOCK_SECONDS
+                    while cache.get(lock_key) is not None and time.monotonic() < deadline:
+                        time.sleep(0.2)
+                started = time.monotonic()
+                result = self._acquire_from_msal(key)
+                if "access_token" not in result:
+                    raise GraphAppTokenError(
+                        f"Failed to get token: {result.get('error')} - {result.get('error_description')}"
+                    )
+                expires_in = float(result.get("expires_in", 0))
+                if self.token_cache.has_state_changed:
+                    cache.set(self.cache_key, self.token_cache.serialize(), timeout=max(int(expires_in), 1))
+                    self.token_cache.has_state_changed = False
+                self._tokens[key] = (result["access_token"], time.time() + expires_in)
+                logger.info(
+                    "graph_app_token_acquired client_id=%s source=%s expires_in=%s duration_ms=%.1f",
+                    self.client_id,
+                    result.get("token_source", "unknown"),
+                    int(expires_in),
+                    (time.monotonic() - started) * 1000,
+                )
+                return result["access_token"]
+            finally:
+                if have_lock:
+                    cache.delete(lock_key)
+
+
+_providers: dict[tuple, GraphAppTokenProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_app_token_provider(
+    client_id: Optional[str] = None,
+    client_secret: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+) -> GraphAppTokenProvider:
+    """
+    Return the process-wide provider for an app registration (defaults from MICROSOFT_GRAPH_* env vars).
+    """
+    client_id = client_id or os.getenv("MICROSOFT_GRAPH_CLIENT_ID")
+    client_secret = client_secret or os.getenv("MICROSOFT_GRAPH_CLIENT_SECRET")
+    tenant_id = tenant_id or os.getenv("MICROSOFT_GRAPH_TENANT_ID", "common")
+    key = (client_id, tenant_id, hashlib.sha256((client_secret or "").encode("utf-8")).hexdigest())
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            provider = GraphAppTokenProvider(client_id, client_secret, tenant_id)
+            _providers[key] = provider
+        return provider
@@ -10,6 +10,7 @@ from django.utils.decorators import method_decorator
 from django.utils.http import url_has_allowed_host_and_scheme
 
 from .services_delegated import GraphServiceDelegated
+from .drive_catalog import drive_catalog_owner, invalidate_drive_catalog
 
 
 class GraphLoginView(View):
@@ -76,6 +77,8 @@ class GraphCallbackView(View):
             request.session['graph_access_token'] = token_response['access_token']
             request.session['graph_refresh_token'] = token_response.get('refresh_token')
             request.session['graph_token_expires_in'] = token_response.get('expires_in')
+            # A new sign-in may be a different Microsoft account
+            invalidate_drive_catalog(drive_catalog_owner(request))
             
             # Clean up state
             del request.session['oauth_state']
@@ -102,6 +105,7 @@ class GraphLogoutView(View):
         request.session.pop('graph_access_token', None)
         request.session.pop('graph_refresh_token', None)
         request.session.pop('graph_token_expires_in', None)
+        invalidate_drive_catalog(drive_catalog_owner(request))
         
         return redirect('home')
 
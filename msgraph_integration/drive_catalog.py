@@ -0,0 +1,111 @@
+"""
+Per-user cache of the drives (OneDrive + SharePoint document libraries) a user can reach.
+
+Listing the catalog walks personal drives, every SharePoint site and every
+site's libraries, but the result changes rarely. Entries are kept in the Django
+cache for MICROSOFT_GRAPH_DRIVE_CATALOG_MAX_STALE_SECONDS (default 24h) and are
+fresh for MICROSOFT_GRAPH_DRIVE_CATALOG_TTL_SECONDS (default 15 min); a stale
+entry is still served while one background thread per user refreshes it. The
+background refresh borrows the request's access token, which may since have
+expired; when it fails the entry is flagged and the next request refreshes it
+synchronously with its own token instead of serving the stale copy again.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+DRIVE_CATALOG_CACHE_PREFIX = "msgraph:drive_catalog:"
+
+_refreshing: set[str] = set()
+_refreshing_lock = threading.Lock()
+
+
+def get_drive_catalog_ttl() -> float:
+    return float(os.getenv("MICROSOFT_GRAPH_DRIVE_CATALOG_TTL_SECONDS", "900"))
+
+
+def get_drive_catalog_max_stale() -> int:
+    return int(os.getenv("MICROSOFT_GRAPH_DRIVE_CATALOG_MAX_STALE_SECONDS", "86400"))
+
+
+def drive_catalog_owner(request) -> str:
+    """
+    Cache owner for a request: the Django user, falling back to the session.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    return f"session:{request.session.session_key}"
+
+
+def _cache_key(owner: str) -> str:
+    return f"{DRIVE_CATALOG_CACHE_PREFIX}{owner}"
+
+
+def _with_cache_info(entry: Dict[str, Any], cache_status: str) -> Dict[str, Any]:
+    return {
+        **entry["catalog"],
+        "cachedAt": datetime.fromtimestamp(entry["fetched_at"], tz=timezone.utc).isoformat(),
+        "cacheStatus": cache_status,
+    }
+
+
+def refresh_drive_catalog(graph_service, access_token: str, owner: str) -> Dict[str, Any]:
+    """
+    List the catalog from Graph and store it for `owner`.
+    """
+    entry = {
+        "catalog": graph_service.list_all_accessible_drives(access_token),
+        "fetched_at": time.time(),
+    }
+    cache.set(_cache_key(owner), entry, timeout=get_drive_catalog_max_stale())
+    logger.info("drive_catalog_refreshed owner=%s drives=%s", owner, entry["catalog"].get("totalDrives", 0))
+    return entry
+
+
+def _refresh_in_background(graph_service, access_token: str, owner: str) -> None:
+    with _refreshing_lock:
+        if owner in _refreshing:
+            return
+        _refreshing.add(owner)
+
+    def run():
+        try:
+            refresh_drive_catalog(graph_service, access_token, owner)
+        except Exception as exc:
+            logger.warning("drive_catalog_refresh_failed owner=%s error=%s", owner, exc)
+            entry = cache.get(_cache_key(owner))
+            if entry is not None:
+                cache.set(_cache_key(owner), {**entry, "refresh_failed": True}, timeout=get_drive_catalog_max_stale())
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(owner)
+
+    threading.Thread(target=run, name=f"drive-catalog-{owner}", daemon=True).start()
+
+
+def get_drive_catalog(graph_service, access_token: str, owner: str, force_refresh: bool = False) -> Dict[str, Any]:
+    """
+    The user's drive catalog as returned by list_all_accessible_drives, plus
+    `cachedAt` and `cacheStatus` ("hit", "stale" or "miss").
+    """
+    entry = None if force_refresh else cache.get(_cache_key(owner))
+    if entry is None or entry.get("refresh_failed"):
+        return _with_cache_info(refresh_drive_catalog(graph_service, access_token, owner), "miss")
+
+    if time.time() - entry["fetched_at"] > get_drive_catalog_ttl():
+        _refresh_in_background(graph_service, access_token, owner)
+        return _with_cache_info(entry, "stale")
+    return _with_cache_info(entry, "hit")
+
+
+def invalidate_drive_catalog(owner: str) -> None:
+    cache.delete(_cache_key(owner))
@@ -5,9 +5,10 @@ Handles authentication and API calls to Microsoft Graph
 import os
 import logging
 from typing import Optional, Dict, Any
-from msal import ConfidentialClientApplication
 import requests
 
+from .app_token import GRAPH_APP_SCOPES, get_app_token_provider
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,29 +22,19 @@ class GraphService:
         self.client_secret = os.getenv('MICROSOFT_GRAPH_CLIENT_SECRET')
         self.tenant_id = os.getenv('MICROSOFT_GRAPH_TENANT_ID', 'common')
         self.authority = f"https://login.microsoftonline.com/{self.tenant_id}"
-        self.scopes = ["https://graph.microsoft.com/.default"]
+        self.scopes = GRAPH_APP_SCOPES
         self.graph_endpoint = "https://graph.microsoft.com/v1.0"
         
-        # Initialize MSAL app
-        self.app = ConfidentialClientApplication(
-            self.client_id,
-            authority=self.authority,
-            client_credential=self.client_secret,
-        )
+        # Process-wide MSAL app; its token cache is shared across workers
+        self.token_provider = get_app_token_provider(self.client_id, self.client_secret, self.tenant_id)
+        self.app = self.token_provider.app
     
     def _get_access_token(self) -> Optional[str]:
         """
-        Get access token using client credentials flow
+        Get access token using client credentials flow (served from the shared token cache)
         """
         try:
-            result = self.app.acquire_token_for_client(scopes=self.scopes)
-            
-            if "access_token" in result:
-                return result["access_token"]
-            else:
-                error = result.get("error")
-                error_description = result.get("error_description")
-                raise Exception(f"Failed to get token: {error} - {error_description}")
+            return self.token_provider.get_token(self.scopes)
         except Exception as e:
             raise Exception(f"Authentication error: {str(e)}")
     
@@ -2,10 +2,37 @@
 Microsoft Graph API Service - Delegated Permissions
 Handles OAuth 2.0 authorization code flow for delegated permissions
 """
+import concurrent.futures
+import logging
 import os
-from typing import Optional, Dict, Any
+import threading
+import time
+from typing import Optional, Dict, Any, List
 from msal import ConfidentialClientApplication
 import requests
+from requests.utils import requote_uri
+
+
+logger = logging.getLogger(__name__)
+
+# Graph rejects JSON batches with more than 20 sub-requests.
+GRAPH_BATCH_MAX_REQUESTS = 20
+GRAPH_RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# Default per-request timeout for single Graph calls.
+GRAPH_REQUEST_TIMEOUT_SECONDS = 60
+# Content of the placeholder messages Teams posts for member/channel events.
+TEAMS_SYSTEM_EVENT_CONTENT = '<systemEventMessage/>'
+
+
+def is_user_channel_message(message: Dict[str, Any]) -> bool:
+    """
+    True for messages a person posted: not system events, not deleted, not from a bot.
+    """
+    return (
+        (message.get('body') or {}).get('content') != TEAMS_SYSTEM_EVENT_CONTENT
+        and message.get('deletedDateTime') is None
+        and (message.get('from') or {}).get('user') is not None
+    )
 
 
 class GraphTokenExpiredError(Exception):
@@ -13,6 +40,26 @@ class GraphTokenExpiredError(Exception):
     pass
 
 
+class GraphBatchError(Exception):
+    """Raised for a failed sub-request of a Microsoft Graph JSON batch."""
+
+    def __init__(self, status_code: int, body: Any = None):
+        self.status_code = status_code
+        self.body = body
+        message = body.get('error', {}).get('message') if isinstance(body, dict) else None
+        super().__init__(f"Graph batch sub-request failed with status {status_code}: {message or body}")
+
+
+def batch_response_body(result: Dict[str, Any]) -> Any:
+    """
+    Return a batch sub-response body, raising GraphBatchError for non-2xx statuses.
+    """
+    status_code = result.get('status', 0)
+    if 200 <= status_code < 300:
+        return result.get('body') or {}
+    raise GraphBatchError(status_code, result.get('body'))
+
+
 class GraphServiceDelegated:
     """
     Service class for Microsoft Graph API with delegated permissions
@@ -43,6 +90,11 @@ class GraphServiceDelegated:
         
         self.graph_endpoint = "https://graph.microsoft.com/v1.0"
         
+        # Concurrent $batch POSTs share one throttle window: a 429 pauses all of them
+        self.batch_concurrency = max(int(os.getenv('MICROSOFT_GRAPH_BATCH_CONCURRENCY', '4')), 1)
+        self._throttle_lock = threading.Lock()
+        self._throttled_until = 0.0
+        
         # Initialize MSAL app
         self.app = ConfidentialClientApplication(
             self.client_id,
@@ -112,7 +164,14 @@ class GraphServiceDelegated:
             error_description = result.get("error_description")
             raise Exception(f"Failed to refresh token: {error} - {error_description}")
     
-    def _make_request(self, endpoint: str, access_token: str, method: str = "GET", data: Dict = None) -> Dict[str, Any]:
+    def _make_request(
+        self,
+        endpoint: str,
+        access_token: str,
+        method: str = "GET",
+        data: Dict = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Make authenticated request to Microsoft Graph API
         
@@ -121,6 +180,7 @@ class GraphServiceDelegated:
             access_token: User's access token
             method: HTTP method (GET, POST, etc.)
             data: Request body for POST/PATCH requests
+            timeout: Seconds to wait for Graph (default GRAPH_REQUEST_TIMEOUT_SECONDS)
             
         Returns:
             JSON response from API
@@ -132,7 +192,9 @@ class GraphServiceDelegated:
         
         url = f"{self.graph_endpoint}{endpoint}"
         
-        response = requests.request(method, url, headers=headers, json=data)
+        response = requests.request(
+            method, url, headers=headers, json=data, timeout=timeout or GRAPH_REQUEST_TIMEOUT_SECONDS
+        )
         if response.status_code == 401:
             raise GraphTokenExpiredError(
                 "Microsoft Graph token has expired or been revoked. Please sign in again."
@@ -141,6 +203,173 @@ class GraphServiceDelegated:
         
         return response.json()
     
+    @staticmethod
+    def _retry_after_seconds(headers: Optional[Dict[str, Any]], attempt: int) -> float:
+        retry_after = None
+        for key, value in (headers or {}).items():
+            if key.lower() == 'retry-after':
+                retry_after = value
+        try:
+            delay = float(retry_after) if retry_after is not None else 2 ** attempt
+        except (TypeError, ValueError):
+            delay = 2 ** attempt
+        return min(max(delay, 0.0), float(os.getenv('MICROSOFT_GRAPH_MAX_RETRY_DELAY_SECONDS', '30')))
+    
+    def _pause_requests(self, delay: float) -> None:
+        with self._throttle_lock:
+            self._throttled_until = max(self._throttled_until, time.monotonic() + delay)
+    
+    def _wait_for_throttle(self) -> None:
+        with self._throttle_lock:
+            remaining = self._throttled_until - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+    
+    def _post_batch(
+        self,
+        access_token: str,
+        sub_requests: List[Dict[str, Any]],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        POST one JSON batch (at most 20 sub-requests) and return sub-responses keyed by id.
+        Throttling of the batch request itself is retried here, and so are transport
+        errors when every sub-request is a GET. Once retries run out the last HTTP or
+        transport error is raised.
+        """
+        headers = {
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/json'
+        }
+        max_retries = max(int(os.getenv('MICROSOFT_GRAPH_BATCH_MAX_RETRIES', '3')), 0)
+        read_only = all(sub_request.get('method', 'GET') == 'GET' for sub_request in sub_requests)
+        last_error: Optional[Exception] = None
+        for attempt in range(max_retries + 1):
+            self._wait_for_throttle()
+            try:
+                response = requests.post(
+                    f"{self.graph_endpoint}/$batch",
+                    headers=headers,
+                    json={'requests': sub_requests},
+                    timeout=timeout or GRAPH_REQUEST_TIMEOUT_SECONDS,
+                )
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as exc:
+                # A batch with writes may have been applied, so only read-only batches are resent.
+                if not read_only:
+                    raise
+                last_error = exc
+                if attempt < max_retries:
+                    delay = self._retry_after_seconds(None, attempt)
+                    logger.warning(
+                        "graph_batch_retry error=%s attempt=%s/%s sleep_seconds=%s",
+                        type(exc).__name__, attempt + 1, max_retries, delay,
+                    )
+                    self._pause_requests(delay)
+                continue
+            if response.status_code == 401:
+                raise GraphTokenExpiredError(
+                    "Microsoft Graph token has expired or been revoked. Please sign in again."
+                )
+            if response.status_code in GRAPH_RETRYABLE_STATUSES and attempt < max_retries:
+                delay = self._retry_after_seconds(response.headers, attempt)
+                logger.warning(
+                    "graph_batch_retry status=%s attempt=%s/%s sleep_seconds=%s",
+                    response.status_code, attempt + 1, max_retries, delay,
+                )
+                self._pause_requests(delay)
+                continue
+            response.raise_for_status()
+            return {item.get('id'): item for item in response.json().get('responses', [])}
+        # Only transport errors exhaust the loop; HTTP errors are raised above by raise_for_status().
+        raise last_error
+    
+    def batch_requests(
+        self,
+        access_token: str,
+        batch_items: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Send Graph calls through JSON batching, 20 sub-requests per `/$batch` POST
+        
+        Args:
+            access_token: User's access token
+            batch_items: Calls as dicts with 'url' (relative endpoint, e.g. '/me/drives'),
+                optional 'method' (default GET) and optional 'body'
+            max_concurrency: Batch POSTs in flight at once (default MICROSOFT_GRAPH_BATCH_CONCURRENCY)
+            timeout: Seconds to wait for each batch POST (default GRAPH_REQUEST_TIMEOUT_SECONDS)
+            
+        Returns:
+            One dict per call, in input order, with 'status', 'headers' and 'body'.
+            Sub-requests answered with 429/5xx are retried (honouring Retry-After);
+            a sub-request that still fails is returned with its last status. Use
+            batch_response_body() to unwrap a result. A batch POST that still fails
+            raises its last HTTP or transport error.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(batch_items)
+        max_retries = int(os.getenv('MICROSOFT_GRAPH_BATCH_MAX_RETRIES', '3'))
+        concurrency = max(max_concurrency or self.batch_concurrency, 1)
+        pending = list(range(len(batch_items)))
+        attempt = 0
+        while pending:
+            retry = []
+            retry_delay = 0.0
+            chunks = []
+            for start in range(0, len(pending), GRAPH_BATCH_MAX_REQUESTS):
+                chunk = pending[start:start + GRAPH_BATCH_MAX_REQUESTS]
+                sub_requests = []
+                for index in chunk:
+                    item = batch_items[index]
+                    sub_request = {
+                        'id': str(index),
+                        'method': item.get('method', 'GET'),
+                        'url': requote_uri(item['url']),
+                    }
+                    if item.get('body') is not None:
+                        sub_request['body'] = item['body']
+                        sub_request['headers'] = {'Content-Type': 'application/json'}
+                    sub_requests.append(sub_request)
+                chunks.append((chunk, sub_requests))
+            
+            if len(chunks) == 1 or concurrency == 1:
+                chunk_responses = [
+                    self._post_batch(access_token, sub_requests, timeout=timeout) for _, sub_requests in chunks
+                ]
+            else:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as executor:
+                    chunk_responses = list(executor.map(
+                        lambda chunk_item: self._post_batch(access_token, chunk_item[1], timeout=timeout), chunks
+                    ))
+            
+            for (chunk, _), responses in zip(chunks, chunk_responses):
+                for index in chunk:
+                    sub_response = responses.get(str(index)) or {'status': 0, 'body': None}
+                    status_code = sub_response.get('status', 0)
+                    if status_code == 401:
+                        raise GraphTokenExpiredError(
+                            "Microsoft Graph token has expired or been revoked. Please sign in again."
+                        )
+                    results[index] = {
+                        'status': status_code,
+                        'headers': sub_response.get('headers') or {},
+                        'body': sub_response.get('body'),
+                    }
+                    if status_code in GRAPH_RETRYABLE_STATUSES and attempt < max_retries:
+                        retry.append(index)
+                        retry_delay = max(retry_delay, self._retry_after_seconds(sub_response.get('headers'), attempt))
+            
+            if retry:
+                logger.warning(
+                    "graph_batch_subrequest_retry count=%s attempt=%s/%s sleep_seconds=%s",
+                    len(retry), attempt + 1, max_retries, retry_delay,
+                )
+                self._pause_requests(retry_delay)
+            pending = retry
+            attempt += 1
+        
+        return results
+    
     def get_my_profile(self, access_token: str) -> Dict[str, Any]:
         """
         Get current user's profile
@@ -262,13 +491,23 @@ class GraphServiceDelegated:
         endpoint = f"/teams/{team_id}/channels/{channel_id}/messages?$top={top}"
         return self._make_request(endpoint, access_token)
     
-    def get_all_my_channel_messages(self, access_token: str, max_messages_per_channel: int = 10) -> Dict[str, Any]:
+    def get_all_my_channel_messages(
+        self,
+        access_token: str,
+        max_messages_per_channel: int = 10,
+        include_system_messages: bool = False
+    ) -> Dict[str, Any]:
         """
         Get recent messages from all channels the user has access to
         
+        Channels and messages are fetched with concurrent $batch calls. Teams keep
+        the order of /me/joinedTeams, channels keep Graph's order, and a failing
+        team or channel carries an 'error' instead of failing the whole result.
+        
         Args:
             access_token: User's access token
             max_messages_per_channel: Maximum messages to fetch per channel
+            include_system_messages: Keep system event, deleted and bot messages
             
         Returns:
             Dictionary with teams, channels, and messages
@@ -282,47 +521,50 @@ class GraphServiceDelegated:
         teams_response = self.get_my_joined_teams(access_token)
         teams = teams_response.get('value', [])
         
-        for team in teams:
+        # Channels for every team, then messages for every channel, each stage in $batch calls
+        channel_results = self.batch_requests(
+            access_token,
+            [{'url': f"/teams/{team.get('id')}/channels"} for team in teams]
+        )
+        
+        message_requests = []
+        for team, channel_result in zip(teams, channel_results):
             team_id = team.get('id')
             team_data = {
                 'id': team_id,
                 'displayName': team.get('displayName'),
                 'channels': []
             }
-            
-            # Get channels for this team
             try:
-                channels_response = self.get_team_channels(access_token, team_id)
-                channels = channels_response.get('value', [])
-                
-                for channel in channels:
-                    channel_id = channel.get('id')
-                    channel_data = {
-                        'id': channel_id,
-                        'displayName': channel.get('displayName'),
-                        'messages': []
-                    }
-                    
-                    # Get messages from this channel
-                    try:
-                        messages_response = self.get_channel_messages(
-                            access_token, 
-                            team_id, 
-                            channel_id, 
-                            top=max_messages_per_channel
-                        )
-                        messages = messages_response.get('value', [])
-                        channel_data['messages'] = messages
-                        result['total_messages'] += len(messages)
-                    except Exception as e:
-                        channel_data['error'] = str(e)
-                    
-                    team_data['channels'].append(channel_data)
-            except Exception as e:
+                channels = batch_response_body(channel_result).get('value', [])
+            except GraphBatchError as e:
                 team_data['error'] = str(e)
+                channels = []
             
+            for channel in channels:
+                team_data['channels'].append({
+                    'id': channel.get('id'),
+                    'displayName': channel.get('displayName'),
+                    'messages': []
+                })
+                message_requests.append({
+                    'url': f"/teams/{team_id}/channels/{channel.get('id')}/messages?$top={max_messages_per_channel}"
+                })
             result['teams'].append(team_data)
         
+        message_results = iter(self.batch_requests(access_token, message_requests))
+        for team_data in result['teams']:
+            for channel_data in team_data['channels']:
+                try:
+                    messages = batch_response_body(next(message_results)).get('value', [])
+                except GraphBatchError as e:
+                    channel_data['error'] = str(e)
+                    continue
+                if not include_system_messages:
+                    messages = [message for message in messages if is_user_channel_message(message)]
+                channel_data['messages'] = messages
+                result['total_messages'] += len(messages)
+        
         return result
     
     # OneDrive / Files Methods
@@ -427,7 +669,8 @@ class GraphServiceDelegated:
         access_token: str, 
         query: str,
         drive_id: Optional[str] = None,
-        top: int = 50
+        top: int = 50,
+        timeout: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Search for files and folders in OneDrive
@@ -437,6 +680,7 @@ class GraphServiceDelegated:
             query: Search query string
             drive_id: Optional drive ID (uses default drive if not provided)
             top: Maximum number of results to return
+            timeout: Seconds to wait for Graph (default GRAPH_REQUEST_TIMEOUT_SECONDS)
             
         Returns:
             Search results containing matching files and folders
@@ -446,7 +690,7 @@ class GraphServiceDelegated:
         else:
             endpoint = f"/me/drive/root/search(q='{query}')?$top={top}"
         
-        return self._make_request(endpoint, access_token)
+        return self._make_request(endpoint, access_token, timeout=timeout)
     
     def get_item_by_path(
         self,
@@ -496,35 +740,89 @@ class GraphServiceDelegated:
         drives_response = self.list_drives(access_token)
         drives = drives_response.get('value', [])
         
-        # Search each drive and combine results
-        all_results = []
+        return self.search_drives(access_token, query, drives, top)
+    
+    def search_drives(
+        self,
+        access_token: str,
+        query: str,
+        drives: List[Dict[str, Any]],
+        top: int = 50,
+        deadline_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Search the given drives concurrently and combine the results
+        
+        Drives that fail are skipped; drives still running when the deadline
+        passes are reported in 'timedOutDrives' and the results gathered so
+        far are returned with 'partial' set.
+        
+        Args:
+            access_token: User's access token
+            query: Search query string
+            drives: Drives as returned by list_drives() / list_all_accessible_drives()
+            top: Maximum number of results per drive (default: 50)
+            deadline_seconds: Overall time budget (default MICROSOFT_GRAPH_DRIVE_SEARCH_DEADLINE_SECONDS)
+            
+        Returns:
+            Combined search results in drive order with drive metadata
+        """
+        if deadline_seconds is None:
+            deadline_seconds = float(os.getenv('MICROSOFT_GRAPH_DRIVE_SEARCH_DEADLINE_SECONDS', '20'))
+        concurrency = max(int(os.getenv('MICROSOFT_GRAPH_DRIVE_SEARCH_CONCURRENCY', '8')), 1)
         
-        for drive in drives:
-            drive_id = drive.get('id')
-            drive_name = drive.get('name', 'Unknown')
-            drive_type = drive.get('driveType', 'unknown')
+        all_results = []
+        failed_drives = []
+        timed_out_drives = []
+        if drives:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(concurrency, len(drives)))
+            # No request outlives the deadline by more than its own timeout, so stragglers cannot pile up
+            futures = [
+                executor.submit(
+                    self.search_onedrive, access_token, query, drive.get('id'), top, timeout=deadline_seconds
+                )
+                for drive in drives
+            ]
+            concurrent.futures.wait(futures, timeout=deadline_seconds)
+            # Do not wait for stragglers; their results are dropped
+            executor.shutdown(wait=False, cancel_futures=True)
             
-            try:
-                # Search this drive
-                search_results = self.search_onedrive(access_token, query, drive_id, top)
+            for drive, future in zip(drives, futures):
+                drive_id = drive.get('id')
+                drive_name = drive.get('name', 'Unknown')
+                if not future.done() or future.cancelled():
+                    timed_out_drives.append({'id': drive_id, 'name': drive_name})
+                    continue
+                try:
+                    search_results = future.result()
+                except GraphTokenExpiredError:
+                    raise
+                except Exception as e:
+                    # If search fails for a drive, log it but continue with other drives
+                    logger.warning("graph_drive_search_failed drive_id=%s drive_name=%r error=%s", drive_id, drive_name, e)
+                    failed_drives.append({'id': drive_id, 'name': drive_name, 'error': str(e)})
+                    continue
                 
                 # Add drive metadata to each result
+                drive_info = {
+                    'id': drive_id,
+                    'name': drive_name,
+                    'type': drive.get('driveType', 'unknown'),
+                }
+                if '_source' in drive:
+                    drive_info['source'] = drive.get('_source', 'unknown')
+                    drive_info['siteName'] = drive.get('_siteName', '')
                 for item in search_results.get('value', []):
-                    item['_driveInfo'] = {
-                        'id': drive_id,
-                        'name': drive_name,
-                        'type': drive_type
-                    }
+                    item['_driveInfo'] = drive_info
                     all_results.append(item)
-            except Exception as e:
-                # If search fails for a drive, log it but continue with other drives
-                print(f"Failed to search drive {drive_name} ({drive_id}): {str(e)}")
-                continue
         
         return {
             'value': all_results,
-            'totalDrivesSearched': len(drives),
-            'totalResults': len(all_results)
+            'totalDrivesSearched': len(drives) - len(timed_out_drives),
+            'totalResults': len(all_results),
+            'failedDrives': failed_drives,
+            'timedOutDrives': timed_out_drives,
+            'partial': bool(timed_out_drives),
         }
     
     # SharePoint Sites Methods
@@ -591,38 +889,42 @@ class GraphServiceDelegated:
         """
         all_drives = []
         
-        # 1. Get user's personal drives (OneDrive)
+        # 1. Personal drives (OneDrive) and SharePoint sites in one $batch call
+        personal_result, sites_result = self.batch_requests(
+            access_token,
+            [{'url': '/me/drives'}, {'url': '/sites?search=*'}]
+        )
         try:
-            personal_drives = self.list_drives(access_token)
-            for drive in personal_drives.get('value', []):
+            for drive in batch_response_body(personal_result).get('value', []):
                 drive['_source'] = 'personal'
                 all_drives.append(drive)
-        except Exception as e:
-            print(f"Failed to get personal drives: {str(e)}")
+        except GraphBatchError as e:
+            logger.warning("graph_drive_catalog_personal_drives_failed error=%s", e)
         
-        # 2. Get SharePoint sites and their drives
         try:
-            sites_response = self.get_sharepoint_sites(access_token)
-            sites = sites_response.get('value', [])
-            
-            for site in sites:
-                site_id = site.get('id')
-                site_name = site.get('displayName', site.get('name', 'Unknown'))
-                
-                try:
-                    # Get all document libraries for this site
-                    site_drives = self.get_site_drives(access_token, site_id)
-                    
-                    for drive in site_drives.get('value', []):
-                        drive['_source'] = 'sharepoint'
-                        drive['_siteName'] = site_name
-                        drive['_siteId'] = site_id
-                        all_drives.append(drive)
-                except Exception as e:
-                    print(f"Failed to get drives for site {site_name}: {str(e)}")
-                    continue
-        except Exception as e:
-            print(f"Failed to get SharePoint sites: {str(e)}")
+            sites = batch_response_body(sites_result).get('value', [])
+        except GraphBatchError as e:
+            logger.warning("graph_drive_catalog_sites_failed error=%s", e)
+            sites = []
+        
+        # 2. Document libraries of every site, batched
+        site_drive_results = self.batch_requests(
+            access_token,
+            [{'url': f"/sites/{site.get('id')}/drives"} for site in sites]
+        )
+        for site, site_drives_result in zip(sites, site_drive_results):
+            site_id = site.get('id')
+            site_name = site.get('displayName', site.get('name', 'Unknown'))
+            try:
+                for drive in batch_response_body(site_drives_result).get('value', []):
+                    drive['_source'] = 'sharepoint'
+                    drive['_siteName'] = site_name
+                    drive['_siteId'] = site_id
+                    all_drives.append(drive)
+            except GraphBatchError as e:
+                logger.warning(
+                    "graph_drive_catalog_site_drives_failed site_id=%s site_name=%r error=%s", site_id, site_name, e
+                )
         
         return {
             'value': all_drives,
@@ -633,7 +935,9 @@ class GraphServiceDelegated:
         self,
         access_token: str,
         query: str,
-        top: int = 50
+        top: int = 50,
+        drives: Optional[List[Dict[str, Any]]] = None,
+        deadline_seconds: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Search across ALL accessible drives including SharePoint sites
@@ -645,48 +949,17 @@ class GraphServiceDelegated:
             access_token: User's access token
             query: Search query string
             top: Maximum number of results per drive (default: 50)
+            drives: Drive catalog to search (e.g. from the drive catalog cache);
+                listed with list_all_accessible_drives() when omitted
+            deadline_seconds: Overall time budget, see search_drives()
             
         Returns:
             Combined search results from all drives with drive metadata
         """
-        # Get all accessible drives (including SharePoint)
-        all_drives_response = self.list_all_accessible_drives(access_token)
-        drives = all_drives_response.get('value', [])
-        
-        # Search each drive and combine results
-        all_results = []
-        
-        for drive in drives:
-            drive_id = drive.get('id')
-            drive_name = drive.get('name', 'Unknown')
-            drive_type = drive.get('driveType', 'unknown')
-            source = drive.get('_source', 'unknown')
-            site_name = drive.get('_siteName', '')
-            
-            try:
-                # Search this drive
-                search_results = self.search_onedrive(access_token, query, drive_id, top)
-                
-                # Add drive metadata to each result
-                for item in search_results.get('value', []):
-                    item['_driveInfo'] = {
-                        'id': drive_id,
-                        'name': drive_name,
-                        'type': drive_type,
-                        'source': source,
-                        'siteName': site_name
-                    }
-                    all_results.append(item)
-            except Exception as e:
-                # If search fails for a drive, log it but continue with other drives
-                print(f"Failed to search drive {drive_name} ({drive_id}): {str(e)}")
-                continue
+        if drives is None:
+            drives = self.list_all_accessible_drives(access_token).get('value', [])
         
-        return {
-            'value': all_results,
-            'totalDrivesSearched': len(drives),
-            'totalResults': len(all_results)
-        }
+        return self.search_drives(access_token, query, drives, top, deadline_seconds)
     
     def get_expense_receipts(
         self,
@@ -758,44 +1031,82 @@ class GraphServiceDelegated:
         except Exception as e:
             raise Exception(f"Failed to get expense receipts: {str(e)}")
     
-    def download_file(
+    def get_drive_item(
         self,
         access_token: str,
         item_id: str,
         drive_id: Optional[str] = None
-    ) -> bytes:
+    ) -> Dict[str, Any]:
         """
-        Download a file's content from OneDrive or SharePoint
+        Get a file's metadata, including its eTag and pre-authenticated download URL
         
         Args:
             access_token: User's access token
-            item_id: The ID of the file to download
+            item_id: The ID of the file
             drive_id: Optional drive ID (uses default drive if not provided)
             
         Returns:
-            File content as bytes
+            Item metadata
         """
-        # First get the file metadata to get the download URL
         if drive_id:
             endpoint = f"/drives/{drive_id}/items/{item_id}"
         else:
             endpoint = f"/me/drive/items/{item_id}"
         
-        # Get file metadata including download URL
-        file_metadata = self._make_request(endpoint, access_token)
+        return self._make_request(endpoint, access_token)
+    
+    def open_download_stream(
+        self,
+        file_metadata: Dict[str, Any],
+        byte_range: Optional[tuple] = None
+    ) -> requests.Response:
+        """
+        Open a streaming GET on a file's pre-authenticated download URL
         
-        # Get the download URL
+        Args:
+            file_metadata: Item metadata from get_drive_item()
+            byte_range: Optional inclusive (start, end) byte offsets to request
+            
+        Returns:
+            Unread requests.Response (stream=True); the caller must close it
+        """
         download_url = file_metadata.get('@microsoft.graph.downloadUrl')
-        
         if not download_url:
             raise Exception("Download URL not available for this file")
         
-        # Download the file content
-        # Note: The download URL is pre-authenticated, no need to add Authorization header
-        response = requests.get(download_url)
+        # The download URL is pre-authenticated, no need to add Authorization header
+        headers = {}
+        if byte_range is not None:
+            headers['Range'] = f"bytes={byte_range[0]}-{byte_range[1]}"
+        response = requests.get(download_url, headers=headers, stream=True, timeout=60)
+        if response.status_code >= 400:
+            response.close()
         response.raise_for_status()
+        return response
+    
+    def download_file(
+        self,
+        access_token: str,
+        item_id: str,
+        drive_id: Optional[str] = None
+    ) -> bytes:
+        """
+        Download a file's content from OneDrive or SharePoint into memory
+        
+        Prefer get_drive_item() + open_download_stream() for anything that is
+        passed straight through to a client.
         
-        return response.content
+        Args:
+            access_token: User's access token
+            item_id: The ID of the file to download
+            drive_id: Optional drive ID (uses default drive if not provided)
+            
+        Returns:
+            File content as bytes
+        """
+        file_metadata = self.get_drive_item(access_token, item_id, drive_id)
+        with self.open_download_stream(file_metadata) as response:
+            return response.content
     
     def global_search(
         self,
@@ -821,11 +1132,22 @@ class GraphServiceDelegated:
         Returns:
             Search results from Microsoft Graph Search API
         """
+        # Make POST request to search/query endpoint
+        endpoint = "/search/query"
+        request_body = self._global_search_body(query, entity_types, from_index, size)
+        return self._make_request(endpoint, access_token, method="POST", data=request_body)
+    
+    @staticmethod
+    def _global_search_body(
+        query: str,
+        entity_types: Optional[list] = None,
+        from_index: int = 0,
+        size: int = 25
+    ) -> Dict[str, Any]:
         if entity_types is None:
             entity_types = ["driveItem", "listItem", "site"]
         
-        # Construct the search request payload
-        request_body = {
+        return {
             "requests": [
                 {
                     "entityTypes": entity_types,
@@ -837,8 +1159,27 @@ class GraphServiceDelegated:
                 }
             ]
         }
+    
+    def global_search_batch(
+        self,
+        access_token: str,
+        searches: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several global searches in one $batch call
         
-        # Make POST request to search/query endpoint
-        endpoint = "/search/query"
-        return self._make_request(endpoint, access_token, method="POST", data=request_body)
-
+        Args:
+            access_token: User's access token
+            searches: Keyword arguments for global_search() per search
+                (query, entity_types, from_index, size)
+            
+        Returns:
+            Batch results in input order; unwrap each with batch_response_body()
+        """
+        return self.batch_requests(
+            access_token,
+            [
+                {'method': 'POST', 'url': '/search/query', 'body': self._global_search_body(**search)}
+                for search in searches
+            ]
+        )
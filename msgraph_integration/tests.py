@@ -1,3 +1,327 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+import msal
+import requests
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from .app_token import GRAPH_APP_SCOPES, GraphAppTokenProvider
+from .drive_catalog import get_drive_catalog, invalidate_drive_catalog
+from .services_delegated import GraphBatchError, GraphServiceDelegated, batch_response_body
+
+
+def _batch_response(responses, status_code=200, headers=None):
+    response = mock.Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = {"responses": responses}
+    return response
+
+
+@mock.patch("msgraph_integration.services_delegated.time.sleep")
+@mock.patch("msgraph_integration.services_delegated.ConfidentialClientApplication")
+class GraphBatchTestCase(SimpleTestCase):
+    def test_batch_requests_chunks_demuxes_and_retries_throttled_sub_requests(self, _msal, sleep):
+        calls = []
+
+        def fake_post(url, headers=None, json=None, timeout=None):
+            calls.append(json["requests"])
+            responses = []
+            # Answer in reverse order so demultiplexing by id is exercised.
+            for sub_request in reversed(json["requests"]):
+                if sub_request["id"] == "3" and len(calls) <= 2:
+                    responses.append({"id": "3", "status": 429, "headers": {"Retry-After": "2"}, "body": {}})
+                else:
+                    responses.append({"id": sub_request["id"], "status": 200, "body": {"url": sub_request["url"]}})
+            return _batch_response(responses)
+
+        service = GraphServiceDelegated()
+        with mock.patch("msgraph_integration.services_delegated.requests.post", side_effect=fake_post):
+            results = service.batch_requests("token", [{"url": f"/items/{index}"} for index in range(25)])
+
+        # The first two batches go out concurrently; the throttled sub-request is resent alone.
+        self.assertEqual(sorted(len(call) for call in calls[:2]), [5, 20])
+        self.assertEqual(calls[2], [{"id": "3", "method": "GET", "url": "/items/3"}])
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args[0][0], 2.0, places=1)
+        self.assertEqual([batch_response_body(result)["url"] for result in results], [f"/items/{i}" for i in range(25)])
+
+    def test_batch_requests_raise_last_transport_error_once_retries_run_out(self, _msal, _sleep):
+        service = GraphServiceDelegated()
+        timeouts = []
+
+        def fake_post(url, headers=None, json=None, timeout=None):
+            timeouts.append(timeout)
+            raise requests.exceptions.ReadTimeout(f"attempt {len(timeouts)}")
+
+        with mock.patch.dict("os.environ", {"MICROSOFT_GRAPH_BATCH_MAX_RETRIES": "2"}), mock.patch(
+            "msgraph_integration.services_delegated.requests.post", side_effect=fake_post
+        ):
+            with self.assertRaisesMessage(requests.exceptions.ReadTimeout, "attempt 3"):
+                service.batch_requests("token", [{"url": "/me/drives"}], timeout=5)
+            self.assertEqual(timeouts, [5, 5, 5])
+
+            timeouts.clear()
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                service.batch_requests("token", [{"method": "POST", "url": "/search/query", "body": {}}])
+            # A batch with writes may already have been applied, so it is not resent.
+            self.assertEqual(timeouts, [60])
+
+    def test_channel_messages_isolate_failures_and_drop_non_user_messages(self, _msal, _sleep):
+        service = GraphServiceDelegated()
+        batches = [
+            [
+                {"id": "0", "status": 200, "body": {"value": [{"id": "c1", "displayName": "General"}, {"id": "c2"}]}},
+                {"id": "1", "status": 403, "body": {"error": {"message": "Forbidden"}}},
+            ],
+            [
+                {
+                    "id": "0",
+                    "status": 200,
+                    "body": {
+                        "value": [
+                            {"id": "m1", "from": {"user": {"displayName": "Ann"}}, "deletedDateTime": None},
+                            {"id": "m2", "from": None, "body": {"content": "<systemEventMessage/>"}},
+                            {"id": "m3", "from": {"application": {"displayName": "Bot"}}},
+                            {"id": "m4", "from": {"user": {}}, "deletedDateTime": "2026-01-01T00:00:00Z"},
+                        ]
+                    },
+                },
+                {"id": "1", "status": 404, "body": {"error": {"message": "Not found"}}},
+            ],
+        ]
+        teams = {"value": [{"id": "t1", "displayName": "Alpha"}, {"id": "t2", "displayName": "Beta"}]}
+
+        with mock.patch.object(service, "get_my_joined_teams", return_value=teams), mock.patch(
+            "msgraph_integration.services_delegated.requests.post",
+            side_effect=[_batch_response(batch) for batch in batches],
+        ):
+            result = service.get_all_my_channel_messages("token")
+
+        alpha, beta = result["teams"]
+        self.assertEqual(result["total_messages"], 1)
+        self.assertEqual([team["displayName"] for team in result["teams"]], ["Alpha", "Beta"])
+        self.assertEqual([message["id"] for message in alpha["channels"][0]["messages"]], ["m1"])
+        self.assertIn("Not found", alpha["channels"][1]["error"])
+        self.assertIn("Forbidden", beta["error"])
+        with self.assertRaises(GraphBatchError):
+            batch_response_body(batches[0][1])
+
+
+class DriveCatalogTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.graph_service = mock.Mock()
+        self.graph_service.list_all_accessible_drives.return_value = {"value": [{"id": "d1"}], "totalDrives": 1}
+
+    def test_catalog_is_cached_refreshed_in_background_when_stale_and_invalidated(self):
+        first = get_drive_catalog(self.graph_service, "token", "user:1")
+        second = get_drive_catalog(self.graph_service, "token", "user:1")
+
+        self.assertEqual((first["cacheStatus"], second["cacheStatus"]), ("miss", "hit"))
+        self.assertEqual(second["value"], [{"id": "d1"}])
+        self.assertEqual(self.graph_service.list_all_accessible_drives.call_count, 1)
+
+        with mock.patch.dict("os.environ", {"MICROSOFT_GRAPH_DRIVE_CATALOG_TTL_SECONDS": "0"}), mock.patch(
+            "msgraph_integration.drive_catalog.threading.Thread"
+        ) as thread:
+            time.sleep(0.01)
+            stale = get_drive_catalog(self.graph_service, "token", "user:1")
+        self.assertEqual(stale["cacheStatus"], "stale")
+        thread.return_value.start.assert_called_once()
+
+        invalidate_drive_catalog("user:1")
+        self.assertEqual(get_drive_catalog(self.graph_service, "token", "user:1")["cacheStatus"], "miss")
+
+    def test_failed_background_refresh_makes_the_next_request_refetch(self):
+        get_drive_catalog(self.graph_service, "old-token", "user:2")
+        self.graph_service.list_all_accessible_drives.side_effect = [RuntimeError("token expired"), {"value": []}]
+
+        with mock.patch.dict("os.environ", {"MICROSOFT_GRAPH_DRIVE_CATALOG_TTL_SECONDS": "0"}), mock.patch(
+            "msgraph_integration.drive_catalog.threading.Thread", _RunNowThread
+        ):
+            time.sleep(0.01)
+            stale = get_drive_catalog(self.graph_service, "old-token", "user:2")
+            refetched = get_drive_catalog(self.graph_service, "new-token", "user:2")
+
+        self.assertEqual(stale["cacheStatus"], "stale")
+        self.assertEqual((refetched["cacheStatus"], refetched["value"]), ("miss", []))
+        self.graph_service.list_all_accessible_drives.assert_called_with("new-token")
+
+
+@mock.patch("msgraph_integration.services_delegated.ConfidentialClientApplication")
+class DriveSearchTestCase(SimpleTestCase):
+    def test_search_drives_returns_partial_results_at_deadline(self, _msal):
+        service = GraphServiceDelegated()
+        release = threading.Event()
+
+        timeouts = []
+
+        def fake_search(access_token, query, drive_id, top, timeout=None):
+            timeouts.append(timeout)
+            if drive_id == "slow":
+                release.wait(5)
+            if drive_id == "broken":
+                raise RuntimeError("boom")
+            return {"value": [{"name": f"{drive_id}.docx"}]}
+
+        drives = [
+            {"id": "fast", "name": "Fast", "_source": "sharepoint", "_siteName": "Team"},
+            {"id": "slow", "name": "Slow"},
+            {"id": "broken", "name": "Broken"},
+        ]
+        try:
+            with mock.patch.object(service, "search_onedrive", side_effect=fake_search):
+                results = service.search_drives("token", "plan", drives, deadline_seconds=0.2)
+        finally:
+            release.set()
+
+        self.assertTrue(results["partial"])
+        self.assertEqual([item["name"] for item in results["value"]], ["fast.docx"])
+        self.assertEqual(results["value"][0]["_driveInfo"]["siteName"], "Team")
+        self.assertEqual(results["timedOutDrives"], [{"id": "slow", "name": "Slow"}])
+        self.assertEqual(results["failedDrives"][0]["id"], "broken")
+        self.assertEqual(timeouts, [0.2, 0.2, 0.2])
+
+
+class DownloadFileAPITestCase(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(username="downloader", password="pw")
+        self.client.force_login(user)
+        session = self.client.session
+        session["graph_access_token"] = "token"
+        session.save()
+        self.metadata = {
+            "name": "drawing.dwg",
+            "size": 10,
+            "eTag": '"{ABC},3"',
+            "lastModifiedDateTime": "2026-01-02T03:04:05Z",
+            "file": {"mimeType": "application/acad"},
+            "@microsoft.graph.downloadUrl": "https://download.example/drawing",
+        }
+        patcher = mock.patch("msgraph_integration.api_views.GraphServiceDelegated")
+        self.graph_service = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.graph_service.get_drive_item.return_value = self.metadata
+        self.url = reverse("msgraph:api-download-file")
+
+    def test_range_request_streams_partial_content(self):
+        upstream = mock.Mock(status_code=206)
+        upstream.iter_content.return_value = iter([b"23", b"45"])
+        self.graph_service.open_download_stream.return_value = upstream
+
+        response = self.client.get(self.url, {"item_id": "item-1"}, HTTP_RANGE="bytes=2-5")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"2345")
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(response["Content-Length"], "4")
+        self.assertEqual(response["ETag"], '"{ABC},3"')
+        self.assertIn('filename="drawing.dwg"', response["Content-Disposition"])
+        self.graph_service.get_drive_item.assert_called_once_with("token", "item-1", None)
+        self.graph_service.open_download_stream.assert_called_once_with(self.metadata, (2, 5))
+        response.close()
+        upstream.close.assert_called_once()
+
+    def test_conditional_and_unsatisfiable_requests_skip_the_download(self):
+        not_modified = self.client.get(self.url, {"item_id": "item-1"}, HTTP_IF_NONE_MATCH='"{ABC},3"')
+        unsatisfiable = self.client.get(self.url, {"item_id": "item-1"}, HTTP_RANGE="bytes=20-")
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(unsatisfiable.status_code, 416)
+        self.assertEqual(unsatisfiable["Content-Range"], "bytes */10")
+        self.graph_service.open_download_stream.assert_not_called()
+
+
+class _FakeMsalHttpClient:
+    """Answers MSAL's tenant discovery and client credentials token requests."""
+
+    def __init__(self):
+        self.token_requests = 0
+
+    def _response(self, payload):
+        return mock.Mock(status_code=200, text=json.dumps(payload), headers={})
+
+    def get(self, url, **kwargs):
+        base = "https://login.microsoftonline.com/tenant"
+        return self._response(
+            {
+                "authorization_endpoint": f"{base}/oauth2/v2.0/authorize",
+                "token_endpoint": f"{base}/oauth2/v2.0/token",
+                "issuer": f"{base}/v2.0",
+            }
+        )
+
+    def post(self, url, **kwargs):
+        self.token_requests += 1
+        return self._response(
+            {"access_token": f"token-{self.token_requests}", "expires_in": 3600, "token_type": "Bearer"}
+        )
+
+    def close(self):
+        pass
+
+
+class _RunNowThread:
+    def __init__(self, target, **kwargs):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+class GraphAppTokenProviderTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.http_client = _FakeMsalHttpClient()
+
+        def build_app(*args, **kwargs):
+            return msal.ConfidentialClientApplication(*args, http_client=self.http_client, **kwargs)
+
+        patcher = mock.patch("msgraph_integration.app_token.ConfidentialClientApplication", side_effect=build_app)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_token_is_shared_across_workers_through_the_serialized_cache(self):
+        first_worker = GraphAppTokenProvider("client", "secret", "tenant")
+        second_worker = GraphAppTokenProvider("client", "secret", "tenant")
+
+        self.assertEqual(first_worker.get_token(GRAPH_APP_SCOPES), "token-1")
+        self.assertEqual(first_worker.get_token(GRAPH_APP_SCOPES), "token-1")
+        self.assertEqual(second_worker.get_token(GRAPH_APP_SCOPES), "token-1")
+        self.assertEqual(self.http_client.token_requests, 1)
+
+    def test_expiring_token_is_served_while_it_refreshes_in_background(self):
+        provider = GraphAppTokenProvider("client", "secret", "tenant")
+        provider.get_token(GRAPH_APP_SCOPES)
+
+        with mock.patch.dict("os.environ", {"MICROSOFT_GRAPH_TOKEN_REFRESH_MARGIN_SECONDS": "3700"}), mock.patch(
+            "msgraph_integration.app_token.threading.Thread", _RunNowThread
+        ):
+            served = provider.get_token(GRAPH_APP_SCOPES)
+
+        self.assertEqual(served, "token-1")
+        self.assertEqual(self.http_client.token_requests, 2)
+        self.assertEqual(provider.get_token(GRAPH_APP_SCOPES), "token-2")
+
+    def test_forced_refresh_only_drops_tokens_for_the_requested_scopes(self):
+        provider = GraphAppTokenProvider("client", "secret", "tenant")
+        other_scopes = ["https://other.example/.default"]
+        provider.get_token(GRAPH_APP_SCOPES)
+        provider.get_token(other_scopes)
+
+        with mock.patch.dict("os.environ", {"MICROSOFT_GRAPH_TOKEN_REFRESH_MARGIN_SECONDS": "3700"}):
+            provider._acquire_from_msal(tuple(GRAPH_APP_SCOPES))
+
+        remaining = provider.token_cache.search(msal.SerializableTokenCache.CredentialType.ACCESS_TOKEN)
+        self.assertEqual(
+            sorted(entry["target"] for entry in remaining),
+            ["https://graph.microsoft.com/.default", "https://other.example/.default"],
+        )
+        self.assertEqual(self.http_client.token_requests, 3)
@@ -3,7 +3,19 @@ from django.utils.html import format_html
 from django.utils import timezone
 from zoneinfo import ZoneInfo
 
-from .models import NotionContent, NotionSyncJob
+from .models import NotionContent, NotionContentSection, NotionDatabaseMirror, NotionSyncJob, NotionSyncWatermark
+from .search import filter_search_matches, supports_full_text
+
+
+class NotionContentSectionInline(admin.TabularInline):
+    model = NotionContentSection
+    fields = ("position", "anchor", "title", "rag_document_id", "content_hash", "last_ingested_at")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(NotionContent)
@@ -22,10 +34,12 @@ class NotionContentAdmin(admin.ModelAdmin):
     )
     list_filter = ("object_type", "is_archived", "parent_type", "last_edited_time", "last_ingested_at")
     search_fields = ("notion_id", "title", "url", "plain_text")
+    search_help_text = "Matches title and page text (full-text on PostgreSQL) or an exact Notion id."
     ordering = ("-last_edited_time", "-synced_at")
     list_per_page = 50
     list_max_show_all = 500
     date_hierarchy = "last_edited_time"
+    inlines = (NotionContentSectionInline,)
 
     readonly_fields = (
         "notion_id",
@@ -38,22 +52,31 @@ class NotionContentAdmin(admin.ModelAdmin):
         "is_archived",
         "plain_text",
         "raw_metadata",
+        "content_fingerprint",
         "content_hash",
         "rag_document_id",
         "last_ingested_at",
         "synced_at",
+        "mirror_validated_at",
     )
 
     fieldsets = (
         ("Core", {"fields": ("notion_id", "object_type", "title", "url")}),
         ("Hierarchy", {"fields": ("parent_type", "parent_notion_id")}),
-        ("Timing", {"fields": ("last_edited_time", "last_ingested_at", "synced_at")}),
+        ("Timing", {"fields": ("last_edited_time", "last_ingested_at", "synced_at", "mirror_validated_at")}),
         ("Status", {"fields": ("is_archived",)}),
-        ("RAG Tracking", {"fields": ("rag_document_id", "content_hash")}),
+        ("RAG Tracking", {"fields": ("rag_document_id", "content_fingerprint", "content_hash")}),
         ("Content", {"fields": ("plain_text",), "classes": ("collapse",)}),
         ("Raw Metadata", {"fields": ("raw_metadata",), "classes": ("collapse",)}),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        # On PostgreSQL go through the tsvector/trigram indexes instead of ILIKE over plain_text.
+        search_term = search_term.strip()
+        if not search_term or not supports_full_text(queryset):
+            return super().get_search_results(request, queryset, search_term)
+        return filter_search_matches(queryset, search_term), False
+
     def text_preview(self, obj: NotionContent) -> str:
         if not obj.plain_text:
             return ""
@@ -93,6 +116,33 @@ class NotionContentAdmin(admin.ModelAdmin):
         }
 
 
+@admin.register(NotionSyncWatermark)
+class NotionSyncWatermarkAdmin(admin.ModelAdmin):
+    list_display = ("object_type", "last_edited_time", "updated_at")
+    ordering = ("object_type",)
+    readonly_fields = ("object_type", "last_edited_time", "updated_at")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(NotionDatabaseMirror)
+class NotionDatabaseMirrorAdmin(admin.ModelAdmin):
+    list_display = ("database_id", "rows_last_edited_time", "reconciled_at", "updated_at")
+    ordering = ("database_id",)
+    search_fields = ("database_id",)
+    readonly_fields = ("database_id", "rows_last_edited_time", "reconciled_at", "updated_at")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(NotionSyncJob)
 class NotionSyncJobAdmin(admin.ModelAdmin):
     PACIFIC_TZ = ZoneInfo("America/Los_Angeles")
@@ -100,13 +150,14 @@ class NotionSyncJobAdmin(admin.ModelAdmin):
     list_display = (
         "job_id",
         "status",
+        "executor",
         "cancel_requested",
         "created_by",
         "created_at_pacific",
         "started_at_pacific",
         "finished_at_pacific",
     )
-    list_filter = ("status", "created_at", "started_at", "finished_at")
+    list_filter = ("status", "executor", "created_at", "started_at", "finished_at")
     search_fields = ("job_id", "created_by__username", "created_by__email", "error_message")
     ordering = ("-created_at",)
     list_per_page = 50
@@ -114,14 +165,18 @@ class NotionSyncJobAdmin(admin.ModelAdmin):
     readonly_fields = (
         "job_id",
         "status",
+        "executor",
         "cancel_requested",
         "cancel_requested_at",
         "created_by",
+        "attached_users",
         "created_at_pacific",
         "started_at_pacific",
         "finished_at_pacific",
         "parameters",
+        "progress_events",
         "progress_log",
+        "checkpoint",
         "result",
         "error_message",
         "created_at",
@@ -130,12 +185,13 @@ class NotionSyncJobAdmin(admin.ModelAdmin):
     )
 
     fieldsets = (
-        ("Core", {"fields": ("job_id", "status", "created_by")}),
+        ("Core", {"fields": ("job_id", "status", "executor", "created_by", "attached_users")}),
         ("Cancellation", {"fields": ("cancel_requested", "cancel_requested_at")}),
         ("Timing (Pacific)", {"fields": ("created_at_pacific", "started_at_pacific", "finished_at_pacific")}),
         ("Timing (UTC)", {"fields": ("created_at", "started_at", "finished_at"), "classes": ("collapse",)}),
         ("Parameters", {"fields": ("parameters",)}),
-        ("Progress", {"fields": ("progress_log",), "classes": ("collapse",)}),
+        ("Progress", {"fields": ("progress_events", "progress_log"), "classes": ("collapse",)}),
+        ("Checkpoint", {"fields": ("checkpoint",), "classes": ("collapse",)}),
         ("Result", {"fields": ("result",), "classes": ("collapse",)}),
         ("Error", {"fields": ("error_message",), "classes": ("collapse",)}),
     )
@@ -163,6 +219,18 @@ class NotionSyncJobAdmin(admin.ModelAdmin):
             "view": True,
         }
 
+    def progress_events(self, obj):
+        events = list(obj.events.order_by("-seq")[:50])
+        if not events:
+            return "—"
+        lines = [
+            f"#{event.seq} {self._format_pacific(event.ts)} {event.event} {event.details or ''}"
+            for event in reversed(events)
+        ]
+        return format_html("<pre>{}</pre>", "\n".join(lines))
+
+    progress_events.short_description = "Recent events"
+
     def _format_pacific(self, dt):
         if not dt:
             return "—"
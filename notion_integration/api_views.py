@@ -1,35 +1,225 @@
 """
 Notion API endpoints.
 """
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
 import logging
+import queue
 import time
 import uuid
-import hashlib
 import threading
+from collections import deque
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
 import requests
 
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from drf_spectacular.types import OpenApiTypes
 from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags, quote_etag
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
 from django.utils import timezone as django_timezone
-from django.db import close_old_connections
-
-from .models import NotionContent, NotionSyncJob
+from django.db import close_old_connections, transaction
+from django.db.models import Exists, F, Max, OuterRef, Q
+
+from .models import (
+    NotionContent,
+    NotionContentSection,
+    NotionDatabaseMirror,
+    NotionDatabaseRow,
+    NotionSyncJob,
+    NotionSyncJobEvent,
+    NotionSyncLock,
+    NotionSyncWatermark,
+)
+from .block_cache import NotionPageBlockCache
+from .rate_limit import get_rate_limit_metrics
+from .search import refresh_search_vectors, search_notion_content
+from .sections import split_notion_sections
 from .services import NotionService, NotionSyncCancelled
 
 RAG_API_TIMEOUT = 90
+RAG_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Ingest POSTs are not idempotent: a timeout or 500/502/504 may come after the document
+# was stored, so they are only retried when the RAG service rejected them outright.
+RAG_POST_RETRYABLE_STATUS_CODES = {429, 503}
+# Upper bound for caller-supplied concurrency query params (thread pool sizes).
+MAX_REQUEST_CONCURRENCY = 16
+RAG_RETRY_BASE_DELAY_SECONDS = 1.0
+RAG_RETRY_MAX_DELAY_SECONDS = 30.0
+# Notion rounds last_edited_time to the minute, so incremental discovery keeps
+# scanning a little past the stored watermark before it stops.
+SYNC_WATERMARK_OVERLAP = timedelta(minutes=5)
+# Delta row queries cannot see deleted or archived rows, so each database's
+# mirror is fully re-listed this often.
+DATABASE_ROW_RECONCILE_INTERVAL = timedelta(hours=24)
+SYNC_CANCEL_POLL_SECONDS = 1.0
+SYNC_JOB_HEARTBEAT_SECONDS = 30.0
+SYNC_CHECKPOINT_SECONDS = 5.0
+SYNC_DISCOVERY_QUEUE_SIZE = 200
+# Search streams in discovery order; a checkpoint records where the fetch stopped in each.
+SYNC_DISCOVERY_STREAMS = ("page", "database")
+# Stored last_edited_time is looked up for at most this many queued items at a time.
+SYNC_DISCOVERY_BATCH_SIZE = 100
+# Search results repeat only around page boundaries; dedup against this many recent ids.
+# Must stay above SYNC_UPSERT_BATCH_SIZE so one upsert batch never holds an id twice.
+SYNC_DISCOVERY_DEDUP_WINDOW = 1000
+SYNC_UPSERT_BATCH_SIZE = 50
+SYNC_UPSERT_FLUSH_SECONDS = 10.0
+NOTION_CONTENT_SYNC_FIELDS = [
+    "object_type",
+    "title",
+    "url",
+    "parent_type",
+    "parent_notion_id",
+    "last_edited_time",
+    "is_archived",
+    "plain_text",
+    "headings",
+    "raw_metadata",
+    "content_fingerprint",
+    "synced_at",
+    "mirror_validated_at",
+]
+SYNC_PROGRESS_FLUSH_EVERY = 25
+SYNC_PROGRESS_FLUSH_SECONDS = 2.0
+SYNC_PROGRESS_RETENTION = 400
+SYNC_PROGRESS_TAIL = 50
+SYNC_EVENT_STREAM_POLL_SECONDS = 2.0
+SYNC_EVENT_STREAM_HEARTBEAT_SECONDS = 15.0
+# Streams end after this long and the browser reconnects with Last-Event-ID, so a
+# watcher holds a web worker well inside Gunicorn's --timeout and never for a whole sync.
+SYNC_EVENT_STREAM_MAX_SECONDS = 25.0
+SYNC_EVENT_LONG_POLL_MAX_SECONDS = 30.0
+SYNC_EVENT_BATCH_SIZE = 200
+SYNC_LOCK_NAME = "notion_sync"
+SYNC_ACTIVE_STATUSES = [NotionSyncJob.STATUS_QUEUED, NotionSyncJob.STATUS_RUNNING]
+SYNC_TERMINAL_STATUSES = {NotionSyncJob.STATUS_SUCCEEDED, NotionSyncJob.STATUS_FAILED, NotionSyncJob.STATUS_CANCELED}
+# High-volume per-item events are buffered; everything else is written immediately.
+SYNC_PROGRESS_BUFFERED_EVENTS = {"item_started", "item_stage", "item_finished", "search_discovery_progress"}
 
 
 class SyncCancelled(Exception):
     """Raised when a sync job cancellation has been requested."""
 
 
+class NotionMirrorNotAPage(Exception):
+    """Raised when a page read-through names a mirrored database."""
+
+
+class SyncCancelToken:
+    """
+    Callable cancellation check for a sync job that reads the DB at most once per poll interval.
+
+    With a `lease_owner` it also renews the job's lease every SYNC_JOB_HEARTBEAT_SECONDS
+    and reports cancellation once another worker has taken the job over.
+    The flag is sticky: once cancellation is observed it is never re-queried.
+    """
+
+    def __init__(self, job_pk: int, poll_seconds: float = SYNC_CANCEL_POLL_SECONDS, lease_owner: str = ""):
+        self.job_pk = job_pk
+        self.poll_seconds = poll_seconds
+        self.lease_owner = lease_owner
+        self.lease_lost = False
+        self._canceled = False
+        self._checked_at = None
+        self._heartbeat_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __call__(self) -> bool:
+        if self._canceled or self.lease_lost:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if self.lease_owner and now - self._heartbeat_at >= SYNC_JOB_HEARTBEAT_SECONDS:
+                self._heartbeat_at = now
+                if not _renew_sync_job_lease(self.job_pk, self.lease_owner):
+                    self.lease_lost = True
+                    return True
+            if self._checked_at is not None and now - self._checked_at < self.poll_seconds:
+                return False
+            self._checked_at = now
+            cancel_requested = (
+                NotionSyncJob.objects.filter(pk=self.job_pk).values_list("cancel_requested", flat=True).first()
+            )
+            if cancel_requested:
+                self._canceled = True
+            return self._canceled
+
+
+class SyncProgressRecorder:
+    """
+    Buffered `record(event, **fields)` callable that appends NotionSyncJobEvent rows.
+
+    Buffered events are bulk-inserted every SYNC_PROGRESS_FLUSH_EVERY events or
+    SYNC_PROGRESS_FLUSH_SECONDS, whichever comes first; lifecycle events flush
+    the buffer straight away.
+    """
+
+    def __init__(
+        self,
+        job: NotionSyncJob,
+        logger=None,
+        flush_every: int = SYNC_PROGRESS_FLUSH_EVERY,
+        flush_seconds: float = SYNC_PROGRESS_FLUSH_SECONDS,
+    ):
+        self.job = job
+        self.logger = logger or logging.getLogger(__name__)
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self._buffer: list[NotionSyncJobEvent] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        last_seq = NotionSyncJobEvent.objects.filter(job=job).aggregate(last=Max("seq"))["last"]
+        self._seq = last_seq or 0
+
+    def __call__(self, event: str, **fields) -> None:
+        with self._lock:
+            self._seq += 1
+            self._buffer.append(
+                NotionSyncJobEvent(
+                    job=self.job,
+                    seq=self._seq,
+                    ts=datetime.now(timezone.utc),
+                    event=event,
+                    details=fields,
+                )
+            )
+            should_flush = (
+                event not in SYNC_PROGRESS_BUFFERED_EVENTS
+                or len(self._buffer) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+            if should_flush:
+                self._flush_locked()
+        self.logger.info("notion_sync_async job_id=%s event=%s details=%s", self.job.job_id, event, fields)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._buffer:
+            NotionSyncJobEvent.objects.bulk_create(self._buffer)
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def prune(self, keep: int = SYNC_PROGRESS_RETENTION) -> int:
+        """
+        Drop all but the newest `keep` events for the job.
+        """
+        self.flush()
+        deleted, _ = NotionSyncJobEvent.objects.filter(job=self.job, seq__lte=self._seq - keep).delete()
+        return deleted
+
+
 def _property_to_text(prop: dict) -> str:
     if not isinstance(prop, dict):
         return ""
@@ -69,30 +259,88 @@ def _property_to_text(prop: dict) -> str:
     return ""
 
 
-def _get_database_rows_text(notion: NotionService, database_id: str, should_cancel=None) -> str:
-    lines = []
-    cursor = None
+def _database_row_text(notion: NotionService, row: dict) -> str:
+    row_title = notion.extract_title(row)
+    property_parts = []
+    for key, value in (row.get("properties") or {}).items():
+        text_value = _property_to_text(value)
+        if text_value:
+            property_parts.append(f"{key}: {text_value}")
+
+    if property_parts:
+        return f"{row_title or row.get('id')}: " + " | ".join(property_parts)
+    return row_title or ""
+
+
+def _sync_database_rows(notion: NotionService, database_id: str, should_cancel=None, record=None) -> str:
+    """
+    Refresh the local row mirror of a database and rebuild its text from the mirror.
 
+    Only rows edited since the mirror's watermark are queried. A full pass runs
+    for a new mirror and every DATABASE_ROW_RECONCILE_INTERVAL, and drops rows
+    Notion no longer returns (deleted or archived), which a delta query cannot see.
+    """
+    mirror, _ = NotionDatabaseMirror.objects.get_or_create(database_id=database_id)
+    pass_started = django_timezone.now()
+    watermark = mirror.rows_last_edited_time
+    full = (
+        watermark is None
+        or mirror.reconciled_at is None
+        or mirror.reconciled_at < pass_started - DATABASE_ROW_RECONCILE_INTERVAL
+    )
+    query_filter = None
+    if not full:
+        query_filter = {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": (watermark - SYNC_WATERMARK_OVERLAP).isoformat()},
+        }
+    # Ascending edit order means a row edited mid-pass moves behind the cursor, never past it.
+    sorts = [{"timestamp": "last_edited_time", "direction": "ascending"}]
+
+    fetched = 0
+    requests_made = 0
+    cursor = None
     while True:
         if callable(should_cancel) and should_cancel():
             raise SyncCancelled("Cancellation requested while reading database rows.")
-        response = notion.query_database(database_id=database_id, page_size=100, start_cursor=cursor)
-        rows = response.get("results", [])
-        for row in rows:
+        response = notion.query_database(
+            database_id=database_id,
+            page_size=100,
+            start_cursor=cursor,
+            query_filter=query_filter,
+            sorts=sorts,
+        )
+        requests_made += 1
+        mirrored = []
+        for row in response.get("results", []):
             if callable(should_cancel) and should_cancel():
                 raise SyncCancelled("Cancellation requested while processing database rows.")
-            row_title = notion.extract_title(row)
-            properties = row.get("properties", {})
-            property_parts = []
-            for key, value in properties.items():
-                text_value = _property_to_text(value)
-                if text_value:
-                    property_parts.append(f"{key}: {text_value}")
-
-            if property_parts:
-                lines.append(f"{row_title or row.get('id')}: " + " | ".join(property_parts))
-            elif row_title:
-                lines.append(row_title)
+            row_id = row.get("id")
+            if not row_id:
+                continue
+            edited = _parse_notion_time(row.get("last_edited_time"))
+            if edited and (watermark is None or edited > watermark):
+                watermark = edited
+            mirrored.append(
+                NotionDatabaseRow(
+                    database_id=database_id,
+                    row_id=row_id,
+                    title=(notion.extract_title(row) or "")[:512],
+                    text=_database_row_text(notion, row),
+                    created_time=_parse_notion_time(row.get("created_time")),
+                    last_edited_time=edited,
+                    synced_at=pass_started,
+                )
+            )
+        if mirrored:
+            NotionDatabaseRow.objects.bulk_create(
+                mirrored,
+                batch_size=100,
+                update_conflicts=True,
+                unique_fields=["row_id"],
+                update_fields=["database_id", "title", "text", "created_time", "last_edited_time", "synced_at"],
+            )
+            fetched += len(mirrored)
 
         if not response.get("has_more"):
             break
@@ -100,7 +348,31 @@ def _get_database_rows_text(notion: NotionService, database_id: str, should_canc
         if not cursor:
             break
 
-    return "\n".join(lines)
+    removed = 0
+    if full:
+        # Every row Notion still returns was stamped with this pass's synced_at.
+        removed, _ = NotionDatabaseRow.objects.filter(database_id=database_id, synced_at__lt=pass_started).delete()
+        mirror.reconciled_at = pass_started
+    mirror.rows_last_edited_time = watermark
+    mirror.save(update_fields=["rows_last_edited_time", "reconciled_at", "updated_at"])
+
+    rows = (
+        NotionDatabaseRow.objects.filter(database_id=database_id)
+        .exclude(text="")
+        .order_by("created_time", "row_id")
+        .values_list("text", flat=True)
+    )
+    text = "\n".join(rows.iterator())
+    if callable(record):
+        record(
+            "database_rows_synced",
+            notion_id=database_id,
+            mode="full" if full else "delta",
+            rows_fetched=fetched,
+            rows_removed=removed,
+            requests=requests_made,
+        )
+    return text
 
 
 def _parse_notion_time(value: str | None) -> datetime | None:
@@ -109,6 +381,93 @@ def _parse_notion_time(value: str | None) -> datetime | None:
     return parse_datetime(value)
 
 
+def _build_notion_content_row(
+    notion: NotionService,
+    notion_id: str,
+    object_type: str,
+    metadata: dict,
+    plain_text: str,
+    headings: list,
+    fallback: dict | None = None,
+) -> NotionContent:
+    """
+    Unsaved NotionContent for a fetched page or database, ready for `_bulk_upsert_notion_content`.
+    """
+    fallback = fallback or {}
+    parent_type, parent_notion_id = notion.extract_parent_info(metadata)
+    row = NotionContent(
+        notion_id=notion_id,
+        object_type=object_type,
+        title=notion.extract_title(metadata) or notion.extract_title(fallback),
+        url=metadata.get("url") or fallback.get("url") or "",
+        parent_type=parent_type,
+        parent_notion_id=parent_notion_id,
+        last_edited_time=_parse_notion_time(metadata.get("last_edited_time")),
+        is_archived=bool(metadata.get("archived", False)),
+        plain_text=plain_text,
+        headings=headings,
+        raw_metadata=metadata,
+        mirror_validated_at=django_timezone.now(),
+    )
+    # bulk_create skips save(), so set the fingerprint the ingest stage compares against.
+    row.content_fingerprint = row.compute_content_hash()
+    return row
+
+
+def _bulk_upsert_notion_content(rows: list[NotionContent]) -> set[str]:
+    """
+    Insert-or-update synced rows in one transaction; returns the notion_ids that were newly created.
+    """
+    if not rows:
+        return set()
+    notion_ids = [row.notion_id for row in rows]
+    with transaction.atomic():
+        existing = set(NotionContent.objects.filter(notion_id__in=notion_ids).values_list("notion_id", flat=True))
+        NotionContent.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["notion_id"],
+            update_fields=NOTION_CONTENT_SYNC_FIELDS,
+        )
+        refresh_search_vectors(NotionContent.objects.filter(notion_id__in=notion_ids))
+    return {notion_id for notion_id in notion_ids if notion_id not in existing}
+
+
+def _save_block_cache(block_cache: NotionPageBlockCache, complete: bool, record) -> None:
+    # A cache write failure only costs refetches next time; it must not fail the item.
+    try:
+        block_cache.save(prune=complete)
+    except Exception as exc:
+        record("block_cache_save_failed", notion_id=block_cache.page_id, error=str(exc))
+        return
+    record("block_cache_saved", notion_id=block_cache.page_id, hits=block_cache.hits, misses=block_cache.misses)
+
+
+def _discovery_resume_point(marker: tuple[str, str | None, int]) -> dict:
+    """
+    Checkpoint discovery state that restarts search at `marker`: (stream, page cursor, offset in that page).
+    """
+    stream, cursor, offset = marker
+    state = {}
+    reached = False
+    for name in SYNC_DISCOVERY_STREAMS:
+        if name == stream:
+            reached = True
+            state[name] = {"cursor": cursor, "offset": offset, "done": False}
+        else:
+            state[name] = {"cursor": None, "offset": 0, "done": not reached}
+    return state
+
+
+def _concurrency_param(raw: str | None) -> int | None:
+    """
+    Parse a concurrency query param, clamped to 1..MAX_REQUEST_CONCURRENCY.
+    """
+    if not raw:
+        return None
+    return min(max(int(raw), 1), MAX_REQUEST_CONCURRENCY)
+
+
 def _parse_sync_params(request) -> dict:
     include_database_rows = request.query_params.get("include_database_rows", "true").lower() != "false"
     max_items_raw = request.query_params.get("max_items")
@@ -118,6 +477,9 @@ def _parse_sync_params(request) -> dict:
     max_blocks_per_page = int(max_blocks_raw) if max_blocks_raw else 5000
     max_depth_raw = request.query_params.get("max_depth")
     max_depth = int(max_depth_raw) if max_depth_raw else 20
+    block_fetch_concurrency_raw = request.query_params.get("block_fetch_concurrency")
+    block_fetch_concurrency = _concurrency_param(block_fetch_concurrency_raw)
+    incremental = request.query_params.get("incremental", "false").lower() == "true"
     debug = request.query_params.get("debug", "false").lower() == "true"
     return {
         "include_database_rows": include_database_rows,
@@ -125,6 +487,8 @@ def _parse_sync_params(request) -> dict:
         "recursive": recursive,
         "max_blocks_per_page": max_blocks_per_page,
         "max_depth": max_depth,
+        "block_fetch_concurrency": block_fetch_concurrency,
+        "incremental": incremental,
         "debug": debug,
     }
 
@@ -135,178 +499,386 @@ def _run_notion_sync(params: dict, user_label: str, record) -> dict:
     processed = 0
     created = 0
     updated = 0
+    skipped_unchanged = 0
     errors = []
-    seen_ids = set()
     canceled = False
     should_cancel = params.get("_should_cancel")
+    incremental = params.get("incremental", False)
+
+    # Resume state: where the fetch stopped in each search stream (page cursor plus
+    # offset into that page) and the items that failed. Discovery re-runs from there.
+    save_checkpoint = params.get("_save_checkpoint")
+    checkpoint = dict(params.get("_resume_checkpoint") or {})
+    discovery_state = {
+        name: {"cursor": None, "offset": 0, "done": False, **(checkpoint.get("discovery") or {}).get(name, {})}
+        for name in SYNC_DISCOVERY_STREAMS
+    }
+    resume_state = {name: dict(value) for name, value in discovery_state.items()}
+    retry_items = [dict(item) for item in checkpoint.get("failed") or []]
+
+    # Discovery runs on a producer thread and streams items through a bounded
+    # queue; only a window of recent ids is kept for dedup.
+    discovery_queue: queue.Queue = queue.Queue(maxsize=SYNC_DISCOVERY_QUEUE_SIZE)
+    stop_discovery = threading.Event()
+    discovery_lock = threading.Lock()
+    recent_ids = deque(item["id"] for item in retry_items[-SYNC_DISCOVERY_DEDUP_WINDOW:])
+    recent_id_set = set(recent_ids)
+    discovered_total = 0
+    discovered_counts = {"page": 0, "database": 0}
+    discovery_finished = False
+    discovery_error = None
+    last_checkpoint_at = 0.0
+    # Search position of the next item to fetch: a marker from discovery, or a full
+    # discovery state while retrying failed items or once every discovered item was fetched.
+    fetch_position: tuple | dict = resume_state
+
+    def write_checkpoint(index: int, force: bool = False) -> None:
+        nonlocal last_checkpoint_at
+        if not callable(save_checkpoint):
+            return
+        if not force and time.monotonic() - last_checkpoint_at < SYNC_CHECKPOINT_SECONDS:
+            return
+        last_checkpoint_at = time.monotonic()
+        state = _discovery_resume_point(fetch_position) if isinstance(fetch_position, tuple) else fetch_position
+        save_checkpoint(
+            {
+                "stage": "fetch" if discovery_finished and discovery_error is None else "discovery",
+                "discovery": state,
+                # Retries from the resumed checkpoint that this run has not reached yet stay failed.
+                "failed": [{"id": error["id"], "object": error["object"]} for error in errors] + retry_items[index:],
+                "newest_seen": {key: value.isoformat() for key, value in dict(newest_seen).items()},
+            }
+        )
 
-    page_results = []
-    database_results = []
-    combined = []
+    # Database last_edited_time does not move when rows change, so databases can
+    # only be skipped when their rows are not being mirrored.
+    skippable_types = {"page"} if params["include_database_rows"] else {"page", "database"}
+    watermarks = {}
+    # Stored last_edited_time for the batch of items being processed.
+    stored_edit_times = {}
+    if incremental:
+        watermarks = {mark.object_type: mark.last_edited_time for mark in NotionSyncWatermark.objects.all()}
+    newest_seen = {
+        key: parsed
+        for key, value in (checkpoint.get("newest_seen") or {}).items()
+        if (parsed := _parse_notion_time(value)) is not None
+    }
+    pending_rows: list[NotionContent] = []
+    pending_finished: list[dict] = []
+    last_upsert = time.monotonic()
+
+    def flush_pending():
+        nonlocal created, updated, processed, last_upsert
+        last_upsert = time.monotonic()
+        if not pending_rows:
+            return
+        rows = list(pending_rows)
+        finished = list(pending_finished)
+        pending_rows.clear()
+        pending_finished.clear()
+        try:
+            created_ids = _bulk_upsert_notion_content(rows)
+        except Exception as exc:
+            processed -= len(rows)
+            for row in rows:
+                record("item_failed", notion_id=row.notion_id, object_type=row.object_type, error=str(exc))
+                errors.append({"id": row.notion_id, "object": row.object_type, "error": str(exc)})
+            return
+        created += len(created_ids)
+        updated += len(rows) - len(created_ids)
+        record("upsert_batch_written", rows=len(rows), created=len(created_ids), updated=len(rows) - len(created_ids))
+        for entry in finished:
+            record("item_finished", status="created" if entry["notion_id"] in created_ids else "updated", **entry)
 
     def ensure_not_canceled():
         if callable(should_cancel) and should_cancel():
             raise SyncCancelled("Cancellation requested.")
 
-    try:
-        for item in notion.iterate_search_results(query="", filter_type="page", should_cancel=should_cancel):
-            ensure_not_canceled()
-            page_results.append(item)
-            combined.append(item)
-            if len(page_results) % 25 == 0:
-                record(
-                    "search_discovery_progress",
-                    discovered_pages=len(page_results),
-                    discovered_databases=len(database_results),
-                    discovered_total=len(combined),
-                )
-        for item in notion.iterate_search_results(query="", filter_type="database", should_cancel=should_cancel):
-            ensure_not_canceled()
-            database_results.append(item)
-            combined.append(item)
-            if len(database_results) % 10 == 0:
-                record(
-                    "search_discovery_progress",
-                    discovered_pages=len(page_results),
-                    discovered_databases=len(database_results),
-                    discovered_total=len(combined),
-                )
-        record(
-            "search_discovery_complete",
-            discovered_pages=len(page_results),
-            discovered_databases=len(database_results),
-            discovered_total=len(combined),
-        )
-    except (SyncCancelled, NotionSyncCancelled):
-        canceled = True
-        record(
-            "sync_canceled",
-            processed=processed,
-            created=created,
-            updated=updated,
-            errors_count=len(errors),
-            stage="discovery",
-            discovered_pages=len(page_results),
-            discovered_databases=len(database_results),
-            discovered_total=len(combined),
+    def passed_watermark(item: dict, object_type: str) -> bool:
+        edited = _parse_notion_time(item.get("last_edited_time"))
+        if edited is None:
+            return False
+        if newest_seen.get(object_type) is None or edited > newest_seen[object_type]:
+            newest_seen[object_type] = edited
+        watermark = watermarks.get(object_type)
+        if watermark is None or object_type not in skippable_types:
+            return False
+        return edited < watermark - SYNC_WATERMARK_OVERLAP
+
+    def load_stored_edit_times(batch: list[dict]) -> None:
+        nonlocal stored_edit_times
+        if not incremental:
+            return
+        ids = [item["id"] for item in batch if item.get("id") and item.get("object") in skippable_types]
+        stored_edit_times = dict(
+            NotionContent.objects.filter(notion_id__in=ids).values_list("notion_id", "last_edited_time")
         )
-        duration = round(time.monotonic() - started, 3)
+
+    def is_unchanged(item: dict, object_type: str) -> bool:
+        if not incremental or object_type not in skippable_types:
+            return False
+        stored = stored_edit_times.get(item.get("id"))
+        return stored is not None and stored == _parse_notion_time(item.get("last_edited_time"))
+
+    def discovery_progress() -> dict:
         return {
-            "success": False,
-            "canceled": True,
-            "duration_seconds": duration,
-            "processed": processed,
-            "created": created,
-            "updated": updated,
-            "errors_count": len(errors),
-            "errors": errors[:25],
-            "total_discovered": len(combined),
-            "include_database_rows": params["include_database_rows"],
-            "recursive": params["recursive"],
-            "max_blocks_per_page": params["max_blocks_per_page"],
-            "max_depth": params["max_depth"],
-            "user": user_label,
+            "discovered_pages": discovered_counts["page"],
+            "discovered_databases": discovered_counts["database"],
+            "discovered_total": discovered_total,
         }
 
-    for item in combined:
+    def emit(kind: str, payload=None) -> bool:
+        while not stop_discovery.is_set():
+            try:
+                discovery_queue.put((kind, payload), timeout=SYNC_CANCEL_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def discover() -> None:
+        # Producer thread: Notion search calls only; events go through the queue
+        # so every DB write stays on the coordinating thread.
+        nonlocal discovered_total
         try:
+            for filter_type, progress_every in zip(SYNC_DISCOVERY_STREAMS, (25, 10)):
+                with discovery_lock:
+                    stream_state = discovery_state[filter_type]
+                    if stream_state["done"]:
+                        continue
+                    start_cursor = stream_state["cursor"]
+                    # Results of the first page the resumed fetch already got past.
+                    skip = stream_state["offset"]
+
+                def on_page(next_cursor, stream_state=stream_state):
+                    with discovery_lock:
+                        stream_state["cursor"] = next_cursor
+                        stream_state["offset"] = 0
+
+                for item in notion.iterate_search_results(
+                    query="",
+                    filter_type=filter_type,
+                    should_cancel=stop_discovery.is_set,
+                    start_cursor=start_cursor,
+                    on_page=on_page,
+                ):
+                    if skip:
+                        skip -= 1
+                        continue
+                    with discovery_lock:
+                        marker = (filter_type, stream_state["cursor"], stream_state["offset"])
+                        stream_state["offset"] += 1
+                    if passed_watermark(item, filter_type):
+                        emit(
+                            "event",
+                            (
+                                "search_discovery_watermark_reached",
+                                {"object_type": filter_type, "watermark": watermarks[filter_type].isoformat()},
+                            ),
+                        )
+                        break
+                    notion_id = item.get("id")
+                    if not notion_id or notion_id in recent_id_set:
+                        continue
+                    if len(recent_ids) >= SYNC_DISCOVERY_DEDUP_WINDOW:
+                        recent_id_set.discard(recent_ids.popleft())
+                    recent_ids.append(notion_id)
+                    recent_id_set.add(notion_id)
+                    discovered_total += 1
+                    discovered_counts[filter_type] += 1
+                    if not emit("item", (item, marker)):
+                        return
+                    if discovered_counts[filter_type] % progress_every == 0:
+                        emit("event", ("search_discovery_progress", discovery_progress()))
+                with discovery_lock:
+                    stream_state["done"] = True
+            emit("event", ("search_discovery_complete", discovery_progress()))
+        except NotionSyncCancelled:
+            return
+        except Exception as exc:
+            emit("error", exc)
+        emit("done")
+
+    def iter_items():
+        nonlocal discovery_finished, discovery_error
+        # Failed items from the resumed checkpoint are retried first, at the resumed search position.
+        for start in range(0, len(retry_items), SYNC_DISCOVERY_BATCH_SIZE):
+            batch = retry_items[start:start + SYNC_DISCOVERY_BATCH_SIZE]
+            load_stored_edit_times(batch)
+            yield from ((item, None) for item in batch)
+        held = None
+        while True:
             ensure_not_canceled()
-        except (SyncCancelled, NotionSyncCancelled):
-            canceled = True
-            record(
-                "sync_canceled",
-                processed=processed,
-                created=created,
-                updated=updated,
-                errors_count=len(errors),
-            )
-            break
+            if held is not None:
+                (kind, payload), held = held, None
+            else:
+                try:
+                    kind, payload = discovery_queue.get(timeout=SYNC_CANCEL_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+            if kind == "item":
+                # Take whatever discovery has already queued so stored edit times
+                # are read with one query per batch, without waiting for more.
+                batch = [payload]
+                while len(batch) < SYNC_DISCOVERY_BATCH_SIZE:
+                    try:
+                        message = discovery_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if message[0] != "item":
+                        held = message
+                        break
+                    batch.append(message[1])
+                load_stored_edit_times([item for item, _ in batch])
+                yield from batch
+            elif kind == "event":
+                record(payload[0], **payload[1])
+            elif kind == "error":
+                discovery_error = payload
+            else:
+                discovery_finished = True
+                return
 
-        notion_id = item.get("id")
-        if not notion_id or notion_id in seen_ids:
-            continue
-        seen_ids.add(notion_id)
+    if checkpoint:
+        record(
+            "sync_resumed",
+            stage=checkpoint.get("stage"),
+            retry_items=len(retry_items),
+            **{f"{name}_cursor": state["cursor"] for name, state in resume_state.items() if not state["done"]},
+        )
 
-        if params["max_items"] is not None and processed >= params["max_items"]:
-            break
+    producer = threading.Thread(target=discover, name="notion-sync-discovery", daemon=True)
+    producer.start()
+    next_index = 0
+    current_notion_id = None
 
-        object_type = item.get("object")
-        if object_type not in {"page", "database"}:
-            continue
-
-        try:
-            item_started = time.monotonic()
-            record("item_started", notion_id=notion_id, object_type=object_type)
+    try:
+        for index, (item, marker) in enumerate(iter_items()):
+            next_index = index
+            current_notion_id = None
+            if marker is not None:
+                fetch_position = marker
+
+            if len(pending_rows) >= SYNC_UPSERT_BATCH_SIZE or (
+                pending_rows and time.monotonic() - last_upsert >= SYNC_UPSERT_FLUSH_SECONDS
+            ):
+                flush_pending()
+                write_checkpoint(index, force=True)
+            elif not pending_rows:
+                write_checkpoint(index)
             ensure_not_canceled()
-            if object_type == "page":
-                record("item_stage", notion_id=notion_id, object_type=object_type, stage="fetch_page_content")
-                page_payload = notion.get_page_content(
-                    notion_id,
-                    recursive=params["recursive"],
-                    max_blocks=params["max_blocks_per_page"],
-                    max_depth=params["max_depth"],
-                    should_cancel=should_cancel,
-                )
-                ensure_not_canceled()
-                metadata = page_payload.get("metadata", {})
-                plain_text = page_payload.get("text_content", "")
-            else:
-                record("item_stage", notion_id=notion_id, object_type=object_type, stage="fetch_database")
-                metadata = notion.retrieve_database(notion_id)
+
+            notion_id = item.get("id")
+            if not notion_id:
+                continue
+
+            if params["max_items"] is not None and processed >= params["max_items"]:
+                break
+
+            object_type = item.get("object")
+            if object_type not in {"page", "database"}:
+                continue
+
+            if is_unchanged(item, object_type):
+                skipped_unchanged += 1
+                continue
+
+            try:
+                item_started = time.monotonic()
+                current_notion_id = notion_id
+                record("item_started", notion_id=notion_id, object_type=object_type)
                 ensure_not_canceled()
-                plain_text = ""
-                if params["include_database_rows"]:
-                    record("item_stage", notion_id=notion_id, object_type=object_type, stage="fetch_database_rows")
-                    plain_text = _get_database_rows_text(notion, notion_id, should_cancel=should_cancel)
+                if object_type == "page":
+                    record("item_stage", notion_id=notion_id, object_type=object_type, stage="fetch_page_content")
+                    block_cache = NotionPageBlockCache.for_page(notion_id)
+                    page_payload = notion.get_page_content(
+                        notion_id,
+                        recursive=params["recursive"],
+                        max_blocks=params["max_blocks_per_page"],
+                        max_depth=params["max_depth"],
+                        should_cancel=should_cancel,
+                        concurrency=params.get("block_fetch_concurrency"),
+                        block_cache=block_cache,
+                        include_blocks=False,
+                    )
+                    if block_cache is not None:
+                        _save_block_cache(
+                            block_cache,
+                            complete=page_payload.get("block_count", 0) < params["max_blocks_per_page"],
+                            record=record,
+                        )
+                    ensure_not_canceled()
+                    metadata = page_payload.get("metadata", {})
+                    plain_text = page_payload.get("text_content", "")
+                    headings = page_payload.get("headings") or []
+                else:
+                    record("item_stage", notion_id=notion_id, object_type=object_type, stage="fetch_database")
+                    metadata = notion.retrieve_database(notion_id)
+                    ensure_not_canceled()
+                    plain_text = ""
+                    headings = []
+                    if params["include_database_rows"]:
+                        record("item_stage", notion_id=notion_id, object_type=object_type, stage="fetch_database_rows")
+                        plain_text = _sync_database_rows(notion, notion_id, should_cancel=should_cancel, record=record)
 
-            ensure_not_canceled()
+                ensure_not_canceled()
 
-            title = notion.extract_title(metadata) or notion.extract_title(item)
-            parent_type, parent_notion_id = notion.extract_parent_info(metadata)
-            last_edited_time = _parse_notion_time(metadata.get("last_edited_time"))
-            url = metadata.get("url") or item.get("url") or ""
-            is_archived = bool(metadata.get("archived", False))
-
-            _, was_created = NotionContent.objects.update_or_create(
-                notion_id=notion_id,
-                defaults={
-                    "object_type": object_type,
-                    "title": title,
-                    "url": url,
-                    "parent_type": parent_type,
-                    "parent_notion_id": parent_notion_id,
-                    "last_edited_time": last_edited_time,
-                    "is_archived": is_archived,
-                    "plain_text": plain_text,
-                    "raw_metadata": metadata,
-                },
-            )
-            created += int(was_created)
-            updated += int(not was_created)
-            processed += 1
-            record(
-                "item_finished",
-                notion_id=notion_id,
+                row = _build_notion_content_row(
+                    notion, notion_id, object_type, metadata, plain_text, headings, fallback=item
+                )
+                pending_rows.append(row)
+                processed += 1
+                pending_finished.append(
+                    {
+                        "notion_id": notion_id,
+                        "object_type": object_type,
+                        "elapsed_seconds": round(time.monotonic() - item_started, 3),
+                        "text_chars": len(plain_text),
+                        "processed": processed,
+                    }
+                )
+            except (SyncCancelled, NotionSyncCancelled):
+                raise
+            except Exception as exc:
+                record("item_failed", notion_id=notion_id, object_type=object_type, error=str(exc))
+                errors.append({"id": notion_id, "object": object_type, "error": str(exc)})
+        else:
+            next_index = len(retry_items)
+            with discovery_lock:
+                fetch_position = {name: dict(value) for name, value in discovery_state.items()}
+    except (SyncCancelled, NotionSyncCancelled):
+        canceled = True
+        flush_pending()
+        cancel_fields = {"during_notion_id": current_notion_id} if current_notion_id else {}
+        record(
+            "sync_canceled",
+            processed=processed,
+            created=created,
+            updated=updated,
+            errors_count=len(errors),
+            **cancel_fields,
+        )
+    finally:
+        stop_discovery.set()
+
+    flush_pending()
+    write_checkpoint(next_index, force=True)
+    if discovery_error is not None:
+        raise discovery_error
+
+    # Only a complete, clean pass proves everything up to the newest edit is mirrored.
+    if not canceled and discovery_finished and params["max_items"] is None:
+        failed_types = {error["object"] for error in errors}
+        for object_type, newest in newest_seen.items():
+            if object_type in failed_types:
+                continue
+            previous = watermarks.get(object_type)
+            if previous is not None and previous >= newest:
+                continue
+            NotionSyncWatermark.objects.update_or_create(
                 object_type=object_type,
-                status="created" if was_created else "updated",
-                elapsed_seconds=round(time.monotonic() - item_started, 3),
-                text_chars=len(plain_text),
-                processed=processed,
-            )
-        except SyncCancelled:
-            canceled = True
-            record(
-                "sync_canceled",
-                processed=processed,
-                created=created,
-                updated=updated,
-                errors_count=len(errors),
-                during_notion_id=notion_id,
+                defaults={"last_edited_time": newest},
             )
-            break
-        except Exception as exc:
-            record("item_failed", notion_id=notion_id, object_type=object_type, error=str(exc))
-            errors.append({"id": notion_id, "object": object_type, "error": str(exc)})
 
     duration = round(time.monotonic() - started, 3)
     record(
@@ -315,6 +887,7 @@ def _run_notion_sync(params: dict, user_label: str, record) -> dict:
         processed=processed,
         created=created,
         updated=updated,
+        skipped_unchanged=skipped_unchanged,
         errors_count=len(errors),
     )
     return {
@@ -326,7 +899,9 @@ def _run_notion_sync(params: dict, user_label: str, record) -> dict:
         "updated": updated,
         "errors_count": len(errors),
         "errors": errors[:25],
-        "total_discovered": len(seen_ids),
+        "total_discovered": discovered_total,
+        "skipped_unchanged": skipped_unchanged,
+        "incremental": incremental,
         "include_database_rows": params["include_database_rows"],
         "recursive": params["recursive"],
         "max_blocks_per_page": params["max_blocks_per_page"],
@@ -351,118 +926,362 @@ def _build_user_acl(user) -> dict:
     return acl
 
 
-def _compute_notion_content_hash(row: NotionContent) -> str:
-    hash_input = "||".join(
-        [
-            row.notion_id or "",
-            row.object_type or "",
-            row.title or "",
-            row.url or "",
-            row.plain_text or "",
-        ]
+def _call_rag_with_retry(send, max_retries: int, idempotent: bool = True) -> tuple[requests.Response, int]:
+    """
+    Call `send()` until it returns a non-retryable response; returns (response, attempts).
+
+    Non-idempotent calls are retried only on connection errors and 429/503, where the
+    request cannot have been applied; timeouts and other 5xx responses are raised as-is.
+    """
+    retryable_errors = (
+        (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+        if idempotent
+        else (requests.exceptions.ConnectionError,)
     )
-    return hashlib.sha256(hash_input.encode("utf-8")).hexdigest()
+    retryable_status_codes = RAG_RETRYABLE_STATUS_CODES if idempotent else RAG_POST_RETRYABLE_STATUS_CODES
+    for attempt in range(max_retries + 1):
+        try:
+            response = send()
+        except retryable_errors:
+            if attempt >= max_retries:
+                raise
+            time.sleep(min(RAG_RETRY_BASE_DELAY_SECONDS * (2 ** attempt), RAG_RETRY_MAX_DELAY_SECONDS))
+            continue
 
+        if response.status_code in retryable_status_codes and attempt < max_retries:
+            retry_after = NotionService._parse_retry_after_seconds(response.headers.get("Retry-After"))
+            backoff_seconds = min(RAG_RETRY_BASE_DELAY_SECONDS * (2 ** attempt), RAG_RETRY_MAX_DELAY_SECONDS)
+            time.sleep(retry_after if retry_after is not None else backoff_seconds)
+            continue
+        return response, attempt + 1
 
-def _delete_rag_document(document_id: str) -> None:
-    response = requests.delete(
-        f"{settings.RAG_API_BASE_URL}/api/v1/ingest/document/{document_id}",
-        headers={"X-API-Key": settings.RAG_API_KEY},
-        timeout=RAG_API_TIMEOUT,
+    raise RuntimeError("RAG request failed after retries")
+
+
+def _delete_rag_document(document_id: str, max_retries: int = 0) -> int:
+    response, attempts = _call_rag_with_retry(
+        lambda: requests.delete(
+            f"{settings.RAG_API_BASE_URL}/api/v1/ingest/document/{document_id}",
+            headers={"X-API-Key": settings.RAG_API_KEY},
+            timeout=RAG_API_TIMEOUT,
+        ),
+        max_retries,
     )
     if response.status_code != 404:
         response.raise_for_status()
+    return attempts
+
+
+def _notion_rag_metadata(row: NotionContent) -> dict:
+    return {
+        "source": row.url or f"notion:{row.notion_id}",
+        "source_type": "notion",
+        "title": row.title or row.notion_id,
+        "file_type": "notion",
+        "notion_id": row.notion_id,
+        "notion_object_type": row.object_type,
+        "notion_parent_type": row.parent_type,
+        "notion_parent_id": row.parent_notion_id,
+    }
+
+
+def _post_rag_document(content: str, metadata: dict, acl: dict, max_retries: int) -> tuple[dict, int]:
+    payload = {
+        "content": content,
+        "metadata": metadata,
+    }
+    if acl:
+        payload["acl"] = acl
+
+    response, attempts = _call_rag_with_retry(
+        lambda: requests.post(
+            f"{settings.RAG_API_BASE_URL}/api/v1/ingest/document",
+            headers={
+                "X-API-Key": settings.RAG_API_KEY,
+                "Content-Type": "application/json",
+            },
+            json=payload,
+            timeout=RAG_API_TIMEOUT,
+        ),
+        max_retries,
+        idempotent=False,
+    )
+    response.raise_for_status()
+    return response.json(), attempts
+
 
+def _ingest_notion_row(row: NotionContent, acl: dict, max_retries: int, stale_document_ids=()) -> dict:
+    """
+    Replace a row's RAG document. Runs on ingest worker threads, so it only does HTTP.
 
-def _run_notion_rag_ingest(max_items: int | None, only_changed: bool, user, logger=None) -> dict:
+    `stale_document_ids` are section documents left from when the page was ingested in sections.
+    """
+    attempts = 0
+    calls = 1
+    for document_id in [row.rag_document_id, *stale_document_ids]:
+        if document_id:
+            attempts += _delete_rag_document(document_id, max_retries=max_retries)
+            calls += 1
+
+    result, post_attempts = _post_rag_document(row.plain_text, _notion_rag_metadata(row), acl, max_retries)
+    attempts += post_attempts
+    return {
+        "document_id": result.get("document_id", row.rag_document_id),
+        "attempts": attempts,
+        "retried": attempts > calls,
+    }
+
+
+def _row_sections(row: NotionContent) -> list[dict] | None:
+    """
+    Sections to ingest for a large page with headings, or None to ingest the page whole.
+    """
+    min_chars = getattr(settings, "RAG_SECTION_MIN_CHARS", 0)
+    if min_chars <= 0 or len(row.plain_text) < min_chars or not row.headings:
+        return None
+    sections = split_notion_sections(row.plain_text, row.headings)
+    return sections if len(sections) > 1 else None
+
+
+def _plan_section_ingest(row: NotionContent, sections: list[dict], existing: list[NotionContentSection]) -> dict:
+    existing_by_anchor = {section.anchor: section for section in existing}
+    anchors = {section["anchor"] for section in sections}
+    changed = []
+    for section in sections:
+        previous = existing_by_anchor.get(section["anchor"])
+        if previous is None or previous.content_hash != section["content_hash"] or not previous.rag_document_id:
+            changed.append({**section, "previous_document_id": previous.rag_document_id if previous else ""})
+    delete_ids = [section.rag_document_id for section in existing if section.anchor not in anchors and section.rag_document_id]
+    if row.rag_document_id:
+        # The page was previously ingested as a single document.
+        delete_ids.append(row.rag_document_id)
+    return {"sections": sections, "changed": changed, "delete_ids": delete_ids}
+
+
+def _ingest_notion_sections(row: NotionContent, plan: dict, acl: dict, max_retries: int) -> dict:
+    """
+    Re-ingest a page's changed sections and drop documents for removed ones. HTTP only.
+
+    Errors are returned rather than raised so sections that did succeed are still recorded.
+    """
+    attempts = 0
+    calls = 0
+    documents = {}
+    error = None
+    try:
+        for document_id in plan["delete_ids"]:
+            attempts += _delete_rag_document(document_id, max_retries=max_retries)
+            calls += 1
+        for section in plan["changed"]:
+            if section["previous_document_id"]:
+                attempts += _delete_rag_document(section["previous_document_id"], max_retries=max_retries)
+                calls += 1
+            metadata = _notion_rag_metadata(row)
+            metadata.update(
+                {
+                    "notion_section_anchor": section["anchor"],
+                    "notion_section_title": section["title"],
+                    "notion_section_position": section["position"],
+                }
+            )
+            result, post_attempts = _post_rag_document(section["text"], metadata, acl, max_retries)
+            attempts += post_attempts
+            calls += 1
+            documents[section["anchor"]] = result.get("document_id", "")
+    except Exception as exc:
+        error = str(exc)
+    return {"documents": documents, "error": error, "attempts": attempts, "retried": attempts > calls}
+
+
+def _record_section_ingest(row: NotionContent, plan: dict, existing: list[NotionContentSection], outcome: dict) -> None:
+    existing_by_anchor = {section.anchor: section for section in existing}
+    now = django_timezone.now()
+    section_rows = []
+    for section in plan["sections"]:
+        previous = existing_by_anchor.get(section["anchor"])
+        if section["anchor"] in outcome["documents"]:
+            document_id, content_hash, ingested_at = outcome["documents"][section["anchor"]], section["content_hash"], now
+        elif previous is not None:
+            document_id, content_hash, ingested_at = previous.rag_document_id, previous.content_hash, previous.last_ingested_at
+        else:
+            continue
+        section_rows.append(
+            NotionContentSection(
+                content=row,
+                anchor=section["anchor"],
+                position=section["position"],
+                title=section["title"][:512],
+                content_hash=content_hash,
+                rag_document_id=document_id,
+                last_ingested_at=ingested_at,
+            )
+        )
+    with transaction.atomic():
+        if section_rows:
+            NotionContentSection.objects.bulk_create(
+                section_rows,
+                update_conflicts=True,
+                unique_fields=["content", "anchor"],
+                update_fields=["position", "title", "content_hash", "rag_document_id", "last_ingested_at"],
+            )
+        if outcome["error"] is None:
+            NotionContentSection.objects.filter(content=row).exclude(
+                anchor__in=[section["anchor"] for section in plan["sections"]]
+            ).delete()
+
+
+RAG_INGEST_ROW_FIELDS = (
+    "id",
+    "notion_id",
+    "object_type",
+    "title",
+    "url",
+    "parent_type",
+    "parent_notion_id",
+    "last_edited_time",
+    "plain_text",
+    "headings",
+    "content_fingerprint",
+    "content_hash",
+    "rag_document_id",
+)
+
+
+def _run_notion_rag_ingest(
+    max_items: int | None,
+    only_changed: bool,
+    user,
+    logger=None,
+    concurrency: int | None = None,
+    heartbeat=None,
+) -> dict:
+    """
+    Push changed NotionContent rows to the RAG service.
+
+    `heartbeat`, when given, is called once per row so a sync job keeps its lease during a long ingest.
+    """
     if logger is None:
         logger = logging.getLogger(__name__)
+    if concurrency is None:
+        concurrency = getattr(settings, "RAG_INGEST_CONCURRENCY", 1)
+    concurrency = min(max(int(concurrency), 1), MAX_REQUEST_CONCURRENCY)
+    max_retries = getattr(settings, "RAG_INGEST_MAX_RETRIES", 0)
 
     run_id = str(uuid.uuid4())
     started = time.monotonic()
-    queryset = (
-        NotionContent.objects
-        .filter(is_archived=False)
-        .exclude(plain_text="")
-        .order_by("-last_edited_time", "id")
-    )
+    eligible = NotionContent.objects.filter(is_archived=False).exclude(plain_text="")
+    skipped_unchanged = 0
+    if only_changed:
+        # Compare stored fingerprints in SQL so unchanged rows are never loaded.
+        has_sections = Exists(NotionContentSection.objects.filter(content=OuterRef("pk")))
+        unchanged = Q(content_hash=F("content_fingerprint")) & (~Q(rag_document_id="") | Q(has_sections))
+        skipped_unchanged = eligible.filter(unchanged).count()
+        eligible = eligible.exclude(unchanged)
+    queryset = eligible.only(*RAG_INGEST_ROW_FIELDS).prefetch_related("sections").order_by("-last_edited_time", "id")
     if max_items is not None:
         queryset = queryset[:max_items]
 
-    processed = 0
+    processed = skipped_unchanged
     ingested = 0
-    skipped_unchanged = 0
     failed = 0
+    retried = 0
+    sections_ingested = 0
+    sections_unchanged = 0
     failures = []
+    row_results = []
     acl = _build_user_acl(user)
 
     logger.info(
-        "notion_rag_ingest run_id=%s started max_items=%s only_changed=%s user=%s",
+        "notion_rag_ingest run_id=%s started max_items=%s only_changed=%s concurrency=%s user=%s",
         run_id,
         max_items,
         only_changed,
+        concurrency,
         getattr(user, "email", getattr(user, "username", "unknown")),
     )
 
-    for row in queryset:
-        processed += 1
+    def finish(future, entry: tuple) -> None:
+        nonlocal ingested, failed, retried, sections_ingested, sections_unchanged
+        row, plan, existing_sections = entry
         try:
-            row_hash = _compute_notion_content_hash(row)
-            if only_changed and row.rag_document_id and row.content_hash == row_hash:
-                skipped_unchanged += 1
-                continue
-
-            if row.rag_document_id:
-                _delete_rag_document(row.rag_document_id)
-
-            payload = {
-                "content": row.plain_text,
-                "metadata": {
-                    "source": row.url or f"notion:{row.notion_id}",
-                    "source_type": "notion",
-                    "title": row.title or row.notion_id,
-                    "file_type": "notion",
-                    "notion_id": row.notion_id,
-                    "notion_object_type": row.object_type,
-                    "notion_parent_type": row.parent_type,
-                    "notion_parent_id": row.parent_notion_id,
-                },
-            }
-            if acl:
-                payload["acl"] = acl
-
-            response = requests.post(
-                f"{settings.RAG_API_BASE_URL}/api/v1/ingest/document",
-                headers={
-                    "X-API-Key": settings.RAG_API_KEY,
-                    "Content-Type": "application/json",
-                },
-                json=payload,
-                timeout=RAG_API_TIMEOUT,
-            )
-            response.raise_for_status()
-            result = response.json()
-
-            row.rag_document_id = result.get("document_id", row.rag_document_id)
-            row.content_hash = row_hash
+            outcome = future.result()
+            retried += int(outcome["retried"])
+            if plan is None:
+                row.rag_document_id = outcome["document_id"]
+                if existing_sections:
+                    NotionContentSection.objects.filter(content=row).delete()
+            else:
+                _record_section_ingest(row, plan, existing_sections, outcome)
+                sections_ingested += len(outcome["documents"])
+                if outcome["error"] is not None:
+                    raise RuntimeError(outcome["error"])
+                sections_unchanged += len(plan["sections"]) - len(plan["changed"])
+                row.rag_document_id = ""
+            row.content_hash = row.compute_content_hash()
             row.last_ingested_at = django_timezone.now()
-            row.save(update_fields=["rag_document_id", "content_hash", "last_ingested_at", "synced_at"])
+            row.save(update_fields=["rag_document_id", "content_hash", "last_ingested_at"])
             ingested += 1
+            row_result = {
+                "notion_id": row.notion_id,
+                "status": "ingested",
+                "document_id": row.rag_document_id,
+                "attempts": outcome["attempts"],
+            }
+            if plan is not None:
+                row_result["sections"] = len(plan["sections"])
+                row_result["sections_ingested"] = len(outcome["documents"])
+            row_results.append(row_result)
         except Exception as exc:
             failed += 1
             failures.append({"notion_id": row.notion_id, "error": str(exc)})
+            row_results.append({"notion_id": row.notion_id, "status": "failed", "error": str(exc)})
             logger.warning("notion_rag_ingest run_id=%s notion_id=%s error=%s", run_id, row.notion_id, str(exc))
 
+    in_flight = {}
+
+    def drain(return_when) -> None:
+        done, _ = wait(list(in_flight), return_when=return_when)
+        for future in done:
+            finish(future, in_flight.pop(future))
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="notion-rag-ingest") as executor:
+        for row in queryset.iterator(chunk_size=100):
+            processed += 1
+            if heartbeat is not None:
+                heartbeat()
+
+            # Keep a bounded number of rows in flight so memory does not grow with the backlog.
+            if len(in_flight) >= concurrency * 2:
+                drain(FIRST_COMPLETED)
+            existing_sections = list(row.sections.all())
+            sections = _row_sections(row)
+            if sections is None:
+                stale_ids = [section.rag_document_id for section in existing_sections if section.rag_document_id]
+                future = executor.submit(_ingest_notion_row, row, acl, max_retries, stale_ids)
+                in_flight[future] = (row, None, existing_sections)
+            else:
+                plan = _plan_section_ingest(row, sections, existing_sections)
+                future = executor.submit(_ingest_notion_sections, row, plan, acl, max_retries)
+                in_flight[future] = (row, plan, existing_sections)
+
+        if in_flight:
+            drain(ALL_COMPLETED)
+
     duration = round(time.monotonic() - started, 3)
     result = {
         "success": True,
         "run_id": run_id,
         "duration_seconds": duration,
+        "concurrency": concurrency,
         "processed": processed,
         "ingested": ingested,
         "skipped_unchanged": skipped_unchanged,
         "failed": failed,
+        "retried": retried,
+        "sections_ingested": sections_ingested,
+        "sections_unchanged": sections_unchanged,
         "failures": failures[:25],
+        "row_results": row_results[:100],
     }
     logger.info(
         "notion_rag_ingest run_id=%s finished duration=%s processed=%s ingested=%s failed=%s skipped_unchanged=%s",
@@ -476,27 +1295,42 @@ def _run_notion_rag_ingest(max_items: int | None, only_changed: bool, user, logg
     return result
 
 
+def _sync_job_progress_tail(job: NotionSyncJob, limit: int = SYNC_PROGRESS_TAIL) -> list[dict]:
+    events = list(job.events.order_by("-seq")[:limit])
+    if not events:
+        # Jobs that predate the event table kept their log inline.
+        return (job.progress_log or [])[-limit:]
+    return [event.as_entry() for event in reversed(events)]
+
+
+def _sync_job_is_resumable(job: NotionSyncJob) -> bool:
+    return job.status in [NotionSyncJob.STATUS_FAILED, NotionSyncJob.STATUS_CANCELED] and bool(job.checkpoint)
+
+
 def _serialize_sync_job(job: NotionSyncJob) -> dict:
     return {
         "id": job.id,
         "job_id": job.job_id,
         "status": job.status,
+        "executor": job.executor,
         "cancel_requested": job.cancel_requested,
         "cancel_requested_at": job.cancel_requested_at,
         "created_at": job.created_at,
         "started_at": job.started_at,
         "finished_at": job.finished_at,
         "parameters": job.parameters,
-        "progress_tail": (job.progress_log or [])[-50:],
+        "progress_tail": _sync_job_progress_tail(job),
         "result": job.result or {},
         "error": job.error_message or None,
+        "resumable": _sync_job_is_resumable(job),
+        "resume_url": f"/notion/api/sync/jobs/{job.job_id}/resume/" if _sync_job_is_resumable(job) else None,
         "admin_url": f"/admin/notion_integration/notionsyncjob/{job.id}/change/",
     }
 
 
 class NotionSearchAPIView(APIView):
     """
-    Search Notion pages and databases.
+    Search Notion pages and databases, live through the Notion API or locally over synced content.
     """
 
     permission_classes = [IsAuthenticated]
@@ -529,6 +1363,15 @@ class NotionSearchAPIView(APIView):
                 location=OpenApiParameter.QUERY,
                 description="Limit results to 'page' or 'database'",
             ),
+            OpenApiParameter(
+                name="mode",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "'notion' (default) queries the Notion API; 'local' runs a ranked full-text "
+                    "search over synced content and returns snippets"
+                ),
+            ),
         ],
         responses={200: dict, 400: dict, 500: dict},
         tags=["Notion"],
@@ -541,6 +1384,23 @@ class NotionSearchAPIView(APIView):
         page_size = int(request.query_params.get("page_size", 10))
         start_cursor = request.query_params.get("start_cursor")
         filter_type = request.query_params.get("filter")
+        mode = request.query_params.get("mode", "notion").lower()
+        if mode not in {"notion", "local"}:
+            return Response({"error": "mode must be 'notion' or 'local'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if mode == "local":
+            try:
+                results = search_notion_content(
+                    query,
+                    limit=min(max(page_size, 1), 100),
+                    object_type=filter_type if filter_type in {"page", "database"} else None,
+                )
+            except Exception as exc:
+                return Response({"error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return Response(
+                {"object": "list", "mode": "local", "results": results, "has_more": False, "next_cursor": None},
+                status=status.HTTP_200_OK,
+            )
 
         try:
             notion = NotionService()
@@ -552,6 +1412,135 @@ class NotionSearchAPIView(APIView):
             return Response({"error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class NotionRateLimitMetricsAPIView(APIView):
+    """
+    Report shared Notion rate-limit governor metrics for this worker process.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Get Notion rate-limit metrics",
+        responses={200: dict},
+        tags=["Notion"],
+    )
+    def get(self, request):
+        return Response({"limiters": get_rate_limit_metrics()}, status=status.HTTP_200_OK)
+
+
+def _mirror_max_age(request) -> timedelta:
+    raw = request.query_params.get("max_age")
+    seconds = settings.NOTION_MIRROR_MAX_AGE_SECONDS
+    if raw is not None:
+        try:
+            seconds = max(int(raw), 0)
+        except ValueError:
+            pass
+    return timedelta(seconds=seconds)
+
+
+def _mirror_source(request) -> str | None:
+    source = request.query_params.get("source", "live").lower()
+    return source if source in {"live", "mirror"} else None
+
+
+def _json_etag(payload) -> str:
+    return quote_etag(hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:32])
+
+
+def _conditional_response(request, payload, etag: str, headers: dict | None = None) -> Response:
+    """
+    200 with an ETag, or an empty 304 when the client's If-None-Match already names it.
+    """
+    client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+    weak_etag = f"W/{etag}"
+    if "*" in client_etags or etag in client_etags or weak_etag in client_etags:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(payload, status=status.HTTP_200_OK)
+    response["ETag"] = etag
+    for key, value in (headers or {}).items():
+        response[key] = value
+    return response
+
+
+def _mirror_is_fresh(row: NotionContent | None, max_age: timedelta) -> bool:
+    return (
+        row is not None
+        and row.mirror_validated_at is not None
+        and row.mirror_validated_at >= django_timezone.now() - max_age
+    )
+
+
+def _notion_client_error_response(exc: requests.HTTPError) -> Response | None:
+    """
+    Pass Notion's 400/404 (e.g. a database id on a page endpoint) through instead of a 500.
+    """
+    response = exc.response
+    if response is None or response.status_code not in (400, 404):
+        return None
+    try:
+        message = response.json().get("message") or str(exc)
+    except ValueError:
+        message = str(exc)
+    return Response({"error": message}, status=response.status_code)
+
+
+def _mirror_row_is_current(row: NotionContent, metadata: dict) -> bool:
+    return (
+        row.last_edited_time is not None
+        and _parse_notion_time(metadata.get("last_edited_time")) == row.last_edited_time
+        and bool(metadata.get("archived", False)) == row.is_archived
+    )
+
+
+def _read_through_page(page_id: str, max_age: timedelta) -> tuple[NotionContent, str]:
+    """
+    Return the mirrored page and how it was served: "hit" (inside the staleness
+    window, no Notion call), "validated" (one metadata call confirmed the stored
+    last_edited_time) or "miss" (refetched and written back to the mirror).
+    """
+    row = NotionContent.objects.filter(notion_id=page_id).first()
+    if row is not None and row.object_type != "page":
+        raise NotionMirrorNotAPage(f"{page_id} is a Notion {row.object_type}, not a page.")
+    if _mirror_is_fresh(row, max_age):
+        return row, "hit"
+
+    notion = NotionService()
+    if row is not None:
+        metadata = notion.retrieve_page(page_id)
+        if _mirror_row_is_current(row, metadata):
+            now = django_timezone.now()
+            NotionContent.objects.filter(pk=row.pk).update(
+                raw_metadata=metadata, synced_at=now, mirror_validated_at=now
+            )
+            row.raw_metadata = metadata
+            row.synced_at = now
+            row.mirror_validated_at = now
+            return row, "validated"
+
+    logger = logging.getLogger(__name__)
+    block_cache = NotionPageBlockCache.for_page(page_id)
+    page_payload = notion.get_page_content(page_id, recursive=True, block_cache=block_cache, include_blocks=False)
+    if block_cache is not None:
+        _save_block_cache(
+            block_cache,
+            complete=True,
+            record=lambda event, **fields: logger.info("notion_mirror event=%s details=%s", event, fields),
+        )
+    row = _build_notion_content_row(
+        notion,
+        page_id,
+        "page",
+        page_payload.get("metadata", {}),
+        page_payload.get("text_content", ""),
+        page_payload.get("headings") or [],
+    )
+    _bulk_upsert_notion_content([row])
+    logger.info("notion_mirror page_id=%s event=refreshed blocks=%s", page_id, page_payload.get("block_count", 0))
+    return NotionContent.objects.get(notion_id=page_id), "miss"
+
+
 class NotionPageDetailAPIView(APIView):
     """
     Retrieve Notion page metadata.
@@ -561,14 +1550,54 @@ class NotionPageDetailAPIView(APIView):
 
     @extend_schema(
         summary="Get Notion page",
-        responses={200: dict, 404: dict, 500: dict},
+        parameters=[
+            OpenApiParameter(
+                name="source",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="'live' (default) calls Notion; 'mirror' serves the synced copy while it is fresh",
+            ),
+            OpenApiParameter(
+                name="max_age",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Seconds a mirrored copy is served without asking Notion (mirror mode)",
+            ),
+        ],
+        responses={200: dict, 304: None, 400: dict, 404: dict, 500: dict},
         tags=["Notion"],
     )
     def get(self, request, page_id: str):
+        source = _mirror_source(request)
+        if source is None:
+            return Response({"error": "source must be 'live' or 'mirror'"}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
+            mirror_state = "live"
+            row = None
+            if source == "mirror":
+                row = NotionContent.objects.filter(notion_id=page_id, object_type="page").first()
+                if row is not None and row.raw_metadata and _mirror_is_fresh(row, _mirror_max_age(request)):
+                    return _conditional_response(
+                        request, row.raw_metadata, _json_etag(row.raw_metadata), {"X-Notion-Mirror": "hit"}
+                    )
+                mirror_state = "miss"
+
             notion = NotionService()
             page = notion.retrieve_page(page_id)
-            return Response(page, status=status.HTTP_200_OK)
+            if row is not None and _mirror_row_is_current(row, page):
+                # Only metadata was fetched, so the mirror is refreshed only while its text is still current.
+                now = django_timezone.now()
+                NotionContent.objects.filter(pk=row.pk).update(
+                    raw_metadata=page, synced_at=now, mirror_validated_at=now
+                )
+                mirror_state = "validated"
+            return _conditional_response(request, page, _json_etag(page), {"X-Notion-Mirror": mirror_state})
+        except requests.HTTPError as exc:
+            client_error = _notion_client_error_response(exc)
+            if client_error is not None:
+                return client_error
+            return Response({"error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         except ValueError as exc:
             return Response({"error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         except Exception as exc:
@@ -597,18 +1626,59 @@ class NotionPageContentAPIView(APIView):
                 location=OpenApiParameter.QUERY,
                 description="Cursor for pagination",
             ),
+            OpenApiParameter(
+                name="source",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "'live' (default) returns raw blocks from Notion; 'mirror' returns the page text "
+                    "from the local mirror, refreshing it when Notion reports a newer edit"
+                ),
+            ),
+            OpenApiParameter(
+                name="max_age",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Seconds a mirrored copy is served without asking Notion (mirror mode)",
+            ),
         ],
-        responses={200: dict, 404: dict, 500: dict},
+        responses={200: dict, 304: None, 400: dict, 404: dict, 500: dict},
         tags=["Notion"],
     )
     def get(self, request, page_id: str):
         page_size = int(request.query_params.get("page_size", 50))
         start_cursor = request.query_params.get("start_cursor")
+        source = _mirror_source(request)
+        if source is None:
+            return Response({"error": "source must be 'live' or 'mirror'"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
+            if source == "mirror":
+                row, mirror_state = _read_through_page(page_id, _mirror_max_age(request))
+                payload = {
+                    "id": row.notion_id,
+                    "object": row.object_type,
+                    "title": row.title,
+                    "url": row.url,
+                    "last_edited_time": row.last_edited_time.isoformat() if row.last_edited_time else None,
+                    "archived": row.is_archived,
+                    "text_content": row.plain_text,
+                    "headings": row.headings or [],
+                }
+                return _conditional_response(
+                    request, payload, quote_etag(row.content_fingerprint), {"X-Notion-Mirror": mirror_state}
+                )
+
             notion = NotionService()
             blocks = notion.list_block_children(page_id, page_size=page_size, start_cursor=start_cursor)
-            return Response(blocks, status=status.HTTP_200_OK)
+            return _conditional_response(request, blocks, _json_etag(blocks))
+        except NotionMirrorNotAPage as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except requests.HTTPError as exc:
+            client_error = _notion_client_error_response(exc)
+            if client_error is not None:
+                return client_error
+            return Response({"error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         except ValueError as exc:
             return Response({"error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         except Exception as exc:
@@ -655,6 +1725,18 @@ class NotionSyncAPIView(APIView):
                 location=OpenApiParameter.QUERY,
                 description="Safety cap for nested block depth when recursive=true (default 20)",
             ),
+            OpenApiParameter(
+                name="block_fetch_concurrency",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Parallel block-children fetches per page when recursive=true (default from NOTION_BLOCK_FETCH_CONCURRENCY)",
+            ),
+            OpenApiParameter(
+                name="incremental",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                description="Skip items whose last_edited_time is unchanged and stop discovery at the stored watermark (default false)",
+            ),
             OpenApiParameter(
                 name="debug",
                 type=OpenApiTypes.BOOL,
@@ -690,6 +1772,7 @@ class NotionSyncAPIView(APIView):
                 recursive=params["recursive"],
                 max_blocks_per_page=params["max_blocks_per_page"],
                 max_depth=params["max_depth"],
+                incremental=params["incremental"],
                 user=getattr(request.user, "email", request.user.username),
             )
             sync_result = _run_notion_sync(params, getattr(request.user, "email", request.user.username), record)
@@ -722,17 +1805,101 @@ class NotionSyncAPIView(APIView):
             )
 
 
+def _admit_sync_job_run(job_id: str, logger) -> NotionSyncJob | None:
+    """
+    Move a queued job to running under the sync lock, so two crawls can never both run.
+
+    Returns None when there is nothing to run: the job is missing or finished,
+    or another crawl is running and the job was parked as its follow-up.
+    Jobs with a pending cancel are returned unchanged for the caller to close.
+    """
+    with transaction.atomic():
+        _acquire_sync_lock()
+        try:
+            job = NotionSyncJob.objects.get(job_id=job_id)
+        except NotionSyncJob.DoesNotExist:
+            logger.warning("notion_sync_job missing job_id=%s", job_id)
+            return None
+
+        if job.status in [NotionSyncJob.STATUS_SUCCEEDED, NotionSyncJob.STATUS_FAILED, NotionSyncJob.STATUS_CANCELED]:
+            # Already finished (e.g. a redelivered Celery task); nothing to do.
+            return None
+        now = django_timezone.now()
+        if job.status == NotionSyncJob.STATUS_RUNNING:
+            if job.heartbeat_at is not None and now - job.heartbeat_at < _sync_job_lease():
+                # Redelivered while the worker that holds the lease is still crawling.
+                logger.info("notion_sync_job job_id=%s lease_held_by=%s", job_id, job.lease_owner)
+                return None
+            logger.warning(
+                "notion_sync_job job_id=%s lease_expired previous_owner=%s heartbeat_at=%s; taking over",
+                job_id,
+                job.lease_owner,
+                job.heartbeat_at,
+            )
+        if job.cancel_requested:
+            job.lease_owner = uuid.uuid4().hex
+            job.heartbeat_at = now
+            job.save(update_fields=["lease_owner", "heartbeat_at"])
+            return job
+
+        if not (job.parameters or {}).get("skip_sync_fetch"):
+            follow_up_of = (job.parameters or {}).get("follow_up_of")
+            blocking = next(
+                (
+                    other
+                    for other in _active_crawl_jobs(exclude_pk=job.pk)
+                    if other.status == NotionSyncJob.STATUS_RUNNING or other.job_id == follow_up_of
+                ),
+                None,
+            )
+            if blocking is not None:
+                # Dispatched while another crawl runs (redelivery, stale follow-up); wait behind it.
+                job.parameters = dict(job.parameters or {}, follow_up_of=blocking.job_id)
+                job.save(update_fields=["parameters"])
+                logger.info("notion_sync_job job_id=%s deferred_behind=%s", job_id, blocking.job_id)
+                return None
+
+        job.status = NotionSyncJob.STATUS_RUNNING
+        job.started_at = now
+        job.lease_owner = uuid.uuid4().hex
+        job.heartbeat_at = now
+        job.save(update_fields=["status", "started_at", "lease_owner", "heartbeat_at"])
+    return job
+
+
+def _sync_job_lease() -> timedelta:
+    return timedelta(seconds=getattr(settings, "NOTION_SYNC_JOB_LEASE_SECONDS", 600))
+
+
+def _renew_sync_job_lease(job_pk: int, lease_owner: str) -> bool:
+    """
+    Move the heartbeat forward; False when another worker has taken the job over.
+    """
+    return bool(
+        NotionSyncJob.objects.filter(pk=job_pk, lease_owner=lease_owner).update(heartbeat_at=django_timezone.now())
+    )
+
+
+def _save_leased_job(job: NotionSyncJob, update_fields: list[str], logger) -> bool:
+    """
+    Write `update_fields` only while `job.lease_owner` still holds the lease.
+
+    A worker whose job was taken over after its lease expired must not
+    overwrite the new owner's checkpoints or status.
+    """
+    values = {field: getattr(job, field) for field in update_fields}
+    if NotionSyncJob.objects.filter(pk=job.pk, lease_owner=job.lease_owner).update(**values):
+        return True
+    logger.warning("notion_sync_job job_id=%s lease_lost owner=%s", job.job_id, job.lease_owner)
+    return False
+
+
 def _run_sync_job_worker(job_id: str) -> None:
     close_old_connections()
     logger = logging.getLogger(__name__)
 
-    try:
-        job = NotionSyncJob.objects.get(job_id=job_id)
-    except NotionSyncJob.DoesNotExist:
-        logger.warning("notion_sync_job missing job_id=%s", job_id)
-        return
-
-    if job.status == NotionSyncJob.STATUS_CANCELED:
+    job = _admit_sync_job_run(job_id, logger)
+    if job is None:
         close_old_connections()
         return
 
@@ -740,29 +1907,17 @@ def _run_sync_job_worker(job_id: str) -> None:
         job.status = NotionSyncJob.STATUS_CANCELED
         job.finished_at = django_timezone.now()
         job.error_message = ""
-        job.save(update_fields=["status", "finished_at", "error_message"])
+        if _save_leased_job(job, ["status", "finished_at", "error_message"], logger):
+            _start_follow_up_sync_safely(job_id, logger)
         close_old_connections()
         return
 
-    job.status = NotionSyncJob.STATUS_RUNNING
-    job.started_at = django_timezone.now()
-    job.save(update_fields=["status", "started_at"])
+    record = SyncProgressRecorder(job, logger=logger)
+    cancel_token = SyncCancelToken(job.pk, lease_owner=job.lease_owner)
 
-    progress_log = list(job.progress_log or [])
-
-    def record(event: str, **fields):
-        entry = {
-            "ts": datetime.now(timezone.utc).isoformat(),
-            "event": event,
-            **fields,
-        }
-        progress_log.append(entry)
-        if len(progress_log) > 400:
-            del progress_log[: len(progress_log) - 400]
-
-        job.progress_log = progress_log
-        job.save(update_fields=["progress_log"])
-        logger.info("notion_sync_async job_id=%s event=%s details=%s", job_id, event, fields)
+    def save_job(update_fields: list[str]) -> None:
+        if not _save_leased_job(job, update_fields, logger):
+            cancel_token.lease_lost = True
 
     def is_hard_canceled() -> bool:
         latest = NotionSyncJob.objects.only("status", "cancel_requested").get(pk=job.pk)
@@ -770,12 +1925,15 @@ def _run_sync_job_worker(job_id: str) -> None:
 
     try:
         params = dict(job.parameters or {})
+        params["_should_cancel"] = cancel_token
+        # A redelivered or resumed job picks up from the last saved checkpoint.
+        params["_resume_checkpoint"] = job.checkpoint or {}
 
-        def should_cancel() -> bool:
-            latest = NotionSyncJob.objects.only("cancel_requested").get(pk=job.pk)
-            return bool(latest.cancel_requested)
+        def save_checkpoint(checkpoint: dict) -> None:
+            job.checkpoint = checkpoint
+            save_job(["checkpoint"])
 
-        params["_should_cancel"] = should_cancel
+        params["_save_checkpoint"] = save_checkpoint
         user_label = job.created_by.email if job.created_by and job.created_by.email else (
             job.created_by.username if job.created_by else "system"
         )
@@ -793,6 +1951,8 @@ def _run_sync_job_worker(job_id: str) -> None:
                 "errors_count": 0,
                 "errors": [],
                 "total_discovered": 0,
+                "skipped_unchanged": 0,
+                "incremental": params.get("incremental", False),
                 "include_database_rows": params.get("include_database_rows", True),
                 "recursive": params.get("recursive", True),
                 "max_blocks_per_page": params.get("max_blocks_per_page", 5000),
@@ -807,20 +1967,24 @@ def _run_sync_job_worker(job_id: str) -> None:
             job.result = result
             job.finished_at = django_timezone.now()
             job.error_message = ""
-            job.save(update_fields=["status", "result", "finished_at", "error_message"])
+            save_job(["status", "result", "finished_at", "error_message"])
             return
 
-        if params.get("auto_ingest", False) and job.created_by and not is_hard_canceled():
+        run_ingest = params.get("auto_ingest", False) and job.created_by and not cancel_token.lease_lost
+        if run_ingest and not is_hard_canceled():
             record(
                 "rag_ingest_started",
                 max_items=params.get("ingest_max_items"),
                 only_changed=params.get("ingest_only_changed", True),
+                concurrency=params.get("ingest_concurrency"),
             )
             ingest_result = _run_notion_rag_ingest(
                 max_items=params.get("ingest_max_items"),
                 only_changed=params.get("ingest_only_changed", True),
                 user=job.created_by,
                 logger=logger,
+                concurrency=params.get("ingest_concurrency"),
+                heartbeat=cancel_token,
             )
             result["ingest_result"] = ingest_result
             record(
@@ -837,23 +2001,204 @@ def _run_sync_job_worker(job_id: str) -> None:
         job.result = result
         job.finished_at = django_timezone.now()
         job.error_message = ""
-        job.save(update_fields=["status", "result", "finished_at", "error_message"])
+        save_job(["status", "result", "finished_at", "error_message"])
     except Exception as exc:
         if is_hard_canceled():
             job.status = NotionSyncJob.STATUS_CANCELED
             job.finished_at = django_timezone.now()
             job.error_message = ""
-            job.save(update_fields=["status", "finished_at", "error_message"])
+            save_job(["status", "finished_at", "error_message"])
             return
         record("sync_failed", error=str(exc))
         job.status = NotionSyncJob.STATUS_FAILED
         job.error_message = str(exc)
         job.finished_at = django_timezone.now()
-        job.save(update_fields=["status", "error_message", "finished_at"])
+        save_job(["status", "error_message", "finished_at"])
     finally:
+        try:
+            record.prune()
+        except Exception:
+            logger.exception("notion_sync_async job_id=%s progress_flush_failed", job_id)
+        if not cancel_token.lease_lost:
+            # The worker that took the job over dispatches the follow-up when it finishes.
+            _start_follow_up_sync_safely(job_id, logger)
         close_old_connections()
 
 
+def _start_follow_up_sync_safely(job_id: str, logger) -> None:
+    try:
+        follow_up = _start_follow_up_sync(job_id)
+    except Exception:
+        logger.exception("notion_sync_async job_id=%s follow_up_dispatch_failed", job_id)
+        return
+    if follow_up is not None:
+        logger.info("notion_sync_async job_id=%s follow_up_started=%s", job_id, follow_up.job_id)
+
+
+def _acquire_sync_lock() -> None:
+    """
+    Block until the current transaction holds the sync admission lock.
+    """
+    NotionSyncLock.objects.get_or_create(name=SYNC_LOCK_NAME)
+    NotionSyncLock.objects.select_for_update().get(name=SYNC_LOCK_NAME)
+
+
+def _fail_expired_sync_jobs(exclude_pk: int | None = None) -> int:
+    """
+    Mark running jobs whose lease expired as failed: their worker stopped heartbeating
+    (e.g. killed on redeploy), and they stay resumable from their checkpoint.
+    """
+    now = django_timezone.now()
+    expired = NotionSyncJob.objects.filter(
+        status=NotionSyncJob.STATUS_RUNNING,
+        heartbeat_at__lt=now - _sync_job_lease(),
+    )
+    if exclude_pk is not None:
+        expired = expired.exclude(pk=exclude_pk)
+    job_ids = list(expired.values_list("job_id", flat=True))
+    if not job_ids:
+        return 0
+    updated = NotionSyncJob.objects.filter(job_id__in=job_ids, status=NotionSyncJob.STATUS_RUNNING).update(
+        status=NotionSyncJob.STATUS_FAILED,
+        finished_at=now,
+        error_message="Job lease expired; the worker running it stopped.",
+    )
+    logging.getLogger(__name__).warning("notion_sync_job lease_expired failed_jobs=%s", ",".join(job_ids))
+    return updated
+
+
+def _active_crawl_jobs(exclude_pk: int | None = None) -> list[NotionSyncJob]:
+    # Running jobs whose worker died are failed first, so they no longer hold up new crawls.
+    _fail_expired_sync_jobs(exclude_pk=exclude_pk)
+    # Ingest-only jobs (skip_sync_fetch) never call Notion, so they do not take part in coalescing.
+    queryset = NotionSyncJob.objects.filter(status__in=SYNC_ACTIVE_STATUSES).order_by("created_at")
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    return [job for job in queryset if not (job.parameters or {}).get("skip_sync_fetch")]
+
+
+def _can_view_sync_job(user, job: NotionSyncJob) -> bool:
+    # Staff see every job; others see jobs they started or were coalesced onto.
+    if user.is_staff or job.created_by_id == user.id:
+        return True
+    return job.attached_users.filter(pk=user.pk).exists()
+
+
+def _new_sync_job(user, params: dict, checkpoint: dict | None = None):
+    return NotionSyncJob.objects.create(
+        job_id=str(uuid.uuid4()),
+        status=NotionSyncJob.STATUS_QUEUED,
+        executor=(
+            NotionSyncJob.EXECUTOR_CELERY if getattr(settings, "CELERY_BROKER_URL", "") else NotionSyncJob.EXECUTOR_THREAD
+        ),
+        created_by=user,
+        parameters=params,
+        progress_log=[],
+        result={},
+        error_message="",
+        checkpoint=checkpoint or {},
+    )
+
+
+def _submit_sync_job(
+    user,
+    params: dict,
+    on_conflict: str = "follow_up",
+    checkpoint: dict | None = None,
+) -> tuple[NotionSyncJob, str]:
+    """
+    Admit a sync request so at most one crawl of the workspace runs at a time.
+
+    Returns the job the caller should watch and how the request was handled:
+    "started" (new job dispatched), "attached" (joined a queued crawl that has
+    not started discovery, or with on_conflict="attach" the running one) or
+    "queued_follow_up" (an incremental run that starts when the running crawl
+    finishes, shared by every request that arrives meanwhile).
+    """
+    to_dispatch = []
+    with transaction.atomic():
+        _acquire_sync_lock()
+        active = [] if params.get("skip_sync_fetch") else _active_crawl_jobs()
+        active_ids = {job.job_id for job in active}
+        # Self-heal follow-ups whose predecessor finished without dispatching them (e.g. worker killed).
+        for job in active:
+            follow_up_of = (job.parameters or {}).get("follow_up_of")
+            if job.status == NotionSyncJob.STATUS_QUEUED and follow_up_of and follow_up_of not in active_ids:
+                job.parameters = {key: value for key, value in job.parameters.items() if key != "follow_up_of"}
+                job.save(update_fields=["parameters"])
+                to_dispatch.append(job)
+
+        running = next((job for job in active if job.status == NotionSyncJob.STATUS_RUNNING), None)
+        queued = [job for job in active if job.status == NotionSyncJob.STATUS_QUEUED]
+        if not active:
+            job = _new_sync_job(user, params, checkpoint)
+            to_dispatch.append(job)
+            outcome = "started"
+        elif checkpoint is None and (queued or on_conflict == "attach"):
+            job = queued[-1] if queued else running
+            outcome = "attached"
+        else:
+            predecessor = queued[-1] if queued else running
+            follow_up_params = dict(params, follow_up_of=predecessor.job_id)
+            if checkpoint is None:
+                follow_up_params["incremental"] = True
+            job = _new_sync_job(user, follow_up_params, checkpoint)
+            outcome = "queued_follow_up"
+
+        if outcome == "attached" and user is not None and job.created_by_id != user.id:
+            job.attached_users.add(user)
+
+    for pending in to_dispatch:
+        _dispatch_sync_job(pending)
+    logging.getLogger(__name__).info(
+        "notion_sync_admission job_id=%s outcome=%s active=%s", job.job_id, outcome, len(active)
+    )
+    return job, outcome
+
+
+def _start_follow_up_sync(finished_job_id: str) -> NotionSyncJob | None:
+    """
+    Dispatch the follow-up queued behind a finished crawl; later follow-ups chain behind it.
+    """
+    with transaction.atomic():
+        _acquire_sync_lock()
+        follow_ups = list(
+            NotionSyncJob.objects.filter(
+                status=NotionSyncJob.STATUS_QUEUED, parameters__follow_up_of=finished_job_id
+            ).order_by("created_at")
+        )
+        if not follow_ups:
+            return None
+        next_job, rest = follow_ups[0], follow_ups[1:]
+        next_job.parameters = {key: value for key, value in next_job.parameters.items() if key != "follow_up_of"}
+        next_job.save(update_fields=["parameters"])
+        for job in rest:
+            job.parameters = dict(job.parameters, follow_up_of=next_job.job_id)
+            job.save(update_fields=["parameters"])
+    _dispatch_sync_job(next_job)
+    return next_job
+
+
+def _dispatch_sync_job(job: NotionSyncJob) -> None:
+    """
+    Hand a queued job to Celery when a broker is configured, else to a daemon thread.
+    """
+    logger = logging.getLogger(__name__)
+    if job.executor == NotionSyncJob.EXECUTOR_CELERY:
+        from .tasks import run_notion_sync_job
+
+        try:
+            run_notion_sync_job.delay(job.job_id)
+            return
+        except Exception:
+            logger.exception("notion_sync_async job_id=%s celery_dispatch_failed; falling back to thread", job.job_id)
+            job.executor = NotionSyncJob.EXECUTOR_THREAD
+            job.save(update_fields=["executor"])
+
+    worker = threading.Thread(target=_run_sync_job_worker, args=(job.job_id,), daemon=True)
+    worker.start()
+
+
 class NotionSyncAsyncAPIView(APIView):
     """
     Kick off a background Notion sync job.
@@ -894,6 +2239,18 @@ class NotionSyncAsyncAPIView(APIView):
                 location=OpenApiParameter.QUERY,
                 description="Safety cap for nested block depth when recursive=true (default 20)",
             ),
+            OpenApiParameter(
+                name="block_fetch_concurrency",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Parallel block-children fetches per page when recursive=true (default from NOTION_BLOCK_FETCH_CONCURRENCY)",
+            ),
+            OpenApiParameter(
+                name="incremental",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                description="Skip items whose last_edited_time is unchanged and stop discovery at the stored watermark (default false)",
+            ),
             OpenApiParameter(
                 name="auto_ingest",
                 type=OpenApiTypes.BOOL,
@@ -912,14 +2269,29 @@ class NotionSyncAsyncAPIView(APIView):
                 location=OpenApiParameter.QUERY,
                 description="When auto_ingest=true, optional cap for ingestion items",
             ),
+            OpenApiParameter(
+                name="ingest_concurrency",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="When auto_ingest=true, parallel RAG ingest requests (default RAG_INGEST_CONCURRENCY)",
+            ),
             OpenApiParameter(
                 name="skip_sync_fetch",
                 type=OpenApiTypes.BOOL,
                 location=OpenApiParameter.QUERY,
                 description="Skip Notion crawl/fetch and run only DB->RAG ingestion (default false)",
             ),
+            OpenApiParameter(
+                name="on_conflict",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "When a crawl is already running: 'follow_up' (default) queues one shared incremental "
+                    "run after it; 'attach' returns the running job. A queued crawl is always joined."
+                ),
+            ),
         ],
-        responses={202: dict, 500: dict},
+        responses={202: dict, 400: dict, 500: dict},
         tags=["Notion"],
     )
     def post(self, request):
@@ -930,28 +2302,26 @@ class NotionSyncAsyncAPIView(APIView):
         params["skip_sync_fetch"] = request.query_params.get("skip_sync_fetch", "false").lower() == "true"
         ingest_max_items_raw = request.query_params.get("ingest_max_items")
         params["ingest_max_items"] = int(ingest_max_items_raw) if ingest_max_items_raw else None
-        job_id = str(uuid.uuid4())
-
-        job = NotionSyncJob.objects.create(
-            job_id=job_id,
-            status=NotionSyncJob.STATUS_QUEUED,
-            created_by=request.user,
-            parameters=params,
-            progress_log=[],
-            result={},
-            error_message="",
-        )
+        ingest_concurrency_raw = request.query_params.get("ingest_concurrency")
+        params["ingest_concurrency"] = _concurrency_param(ingest_concurrency_raw)
+        on_conflict = request.query_params.get("on_conflict", "follow_up").lower()
+        if on_conflict not in {"follow_up", "attach"}:
+            return Response(
+                {"error": "on_conflict must be 'follow_up' or 'attach'"}, status=status.HTTP_400_BAD_REQUEST
+            )
 
-        worker = threading.Thread(target=_run_sync_job_worker, args=(job_id,), daemon=True)
-        worker.start()
+        job, outcome = _submit_sync_job(request.user, params, on_conflict=on_conflict)
 
         return Response(
             {
                 "success": True,
-                "job_id": job_id,
+                "job_id": job.job_id,
                 "status": job.status,
-                "poll_url": f"/notion/api/sync/jobs/{job_id}/",
-                "parameters": params,
+                "outcome": outcome,
+                "coalesced": outcome != "started",
+                "follow_up_of": (job.parameters or {}).get("follow_up_of"),
+                "poll_url": f"/notion/api/sync/jobs/{job.job_id}/",
+                "parameters": job.parameters,
             },
             status=status.HTTP_202_ACCEPTED,
         )
@@ -975,8 +2345,7 @@ class NotionSyncJobStatusAPIView(APIView):
         except NotionSyncJob.DoesNotExist:
             return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        # Allow staff to view all jobs; non-staff can view only their own.
-        if not request.user.is_staff and job.created_by_id != request.user.id:
+        if not _can_view_sync_job(request.user, job):
             return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
 
         return Response(
@@ -985,6 +2354,191 @@ class NotionSyncJobStatusAPIView(APIView):
         )
 
 
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets DRF negotiate `Accept: text/event-stream`; the stream itself is a StreamingHttpResponse.
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, str)):
+            return data
+        return f"event: error\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+def _sse_message(event: str, data, event_id: int | None = None) -> str:
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, cls=DjangoJSONEncoder)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _sync_job_events_after(job: NotionSyncJob, since: int, limit: int = SYNC_EVENT_BATCH_SIZE) -> list[dict]:
+    return [event.as_entry() for event in job.events.filter(seq__gt=since).order_by("seq")[:limit]]
+
+
+def _sync_job_state(job: NotionSyncJob) -> dict:
+    return (
+        NotionSyncJob.objects.filter(pk=job.pk)
+        .values("status", "cancel_requested", "started_at", "finished_at")
+        .first()
+        or {}
+    )
+
+
+def _sync_job_final_state(job: NotionSyncJob) -> dict:
+    job.refresh_from_db(fields=["status", "cancel_requested", "finished_at", "result", "error_message", "checkpoint"])
+    return {
+        "status": job.status,
+        "cancel_requested": job.cancel_requested,
+        "finished_at": job.finished_at,
+        "result": job.result or {},
+        "error": job.error_message or None,
+        "resumable": _sync_job_is_resumable(job),
+    }
+
+
+def _sync_job_event_stream(job: NotionSyncJob, since: int | None):
+    """
+    SSE generator: a snapshot on first connect, then only new progress events
+    (with their seq as the SSE id) and status transitions until the job ends.
+    """
+    yield "retry: 3000\n\n"
+    if since is None:
+        snapshot = _serialize_sync_job(job)
+        tail = snapshot["progress_tail"]
+        since = max((entry.get("seq", 0) for entry in tail), default=0)
+        # Carry the cursor so a reconnect resumes after the snapshot instead of asking for another.
+        yield _sse_message("snapshot", snapshot, event_id=since)
+    else:
+        oldest = job.events.order_by("seq").values_list("seq", flat=True).first()
+        if oldest is not None and oldest > since + 1:
+            # Events the client missed were pruned; resync it from a snapshot.
+            yield _sse_message("snapshot", _serialize_sync_job(job))
+            since = oldest - 1
+
+    started = time.monotonic()
+    last_sent = started
+    last_state = None
+    while True:
+        events = _sync_job_events_after(job, since)
+        for entry in events:
+            since = entry["seq"]
+            yield _sse_message("progress", entry, event_id=since)
+        state = _sync_job_state(job)
+        if state != last_state:
+            last_state = state
+            if state.get("status") in SYNC_TERMINAL_STATUSES:
+                # The worker flushes its last events before the final status, so drain once more.
+                for entry in _sync_job_events_after(job, since, limit=SYNC_PROGRESS_RETENTION):
+                    since = entry["seq"]
+                    yield _sse_message("progress", entry, event_id=since)
+                yield _sse_message("status", _sync_job_final_state(job), event_id=since)
+                yield _sse_message("end", {"status": state["status"]}, event_id=since)
+                return
+            yield _sse_message("status", state, event_id=since)
+            last_sent = time.monotonic()
+        if events:
+            last_sent = time.monotonic()
+            if len(events) == SYNC_EVENT_BATCH_SIZE:
+                continue
+
+        now = time.monotonic()
+        if now - started >= SYNC_EVENT_STREAM_MAX_SECONDS:
+            return
+        if now - last_sent >= SYNC_EVENT_STREAM_HEARTBEAT_SECONDS:
+            last_sent = now
+            yield ": keep-alive\n\n"
+        time.sleep(SYNC_EVENT_STREAM_POLL_SECONDS)
+
+
+class NotionSyncJobEventsAPIView(APIView):
+    """
+    Push progress deltas for an async Notion sync job, as Server-Sent Events or by long-poll.
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    @extend_schema(
+        summary="Stream async Notion sync job progress",
+        description=(
+            "With `Accept: text/event-stream`, streams `snapshot`, `progress` (SSE id = event seq), "
+            "`status` and `end` events; reconnects resume from the Last-Event-ID header or `since`. "
+            "Otherwise long-polls: waits up to `timeout` seconds for events after `since`."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="since",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Return only events with a higher seq (default: Last-Event-ID, else 0)",
+            ),
+            OpenApiParameter(
+                name="timeout",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Long-poll wait in seconds (0-30, default 25)",
+            ),
+        ],
+        responses={200: dict, 404: dict},
+        tags=["Notion"],
+    )
+    def get(self, request, job_id: str):
+        try:
+            job = NotionSyncJob.objects.get(job_id=job_id)
+        except NotionSyncJob.DoesNotExist:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        if not _can_view_sync_job(request.user, job):
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        raw_since = request.query_params.get("since") or request.headers.get("Last-Event-ID")
+        try:
+            since = max(int(raw_since), 0) if raw_since not in (None, "") else None
+        except ValueError:
+            return Response({"error": "since must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.accepted_renderer.format == EventStreamRenderer.format:
+            response = StreamingHttpResponse(_sync_job_event_stream(job, since), content_type="text/event-stream")
+            response["Cache-Control"] = "no-cache"
+            response["X-Accel-Buffering"] = "no"
+            return response
+
+        try:
+            timeout = float(request.query_params.get("timeout", 25))
+        except ValueError:
+            timeout = 25.0
+        timeout = min(max(timeout, 0.0), SYNC_EVENT_LONG_POLL_MAX_SECONDS)
+        since = since or 0
+        deadline = time.monotonic() + timeout
+        initial_state = _sync_job_state(job)
+        while True:
+            events = _sync_job_events_after(job, since)
+            state = _sync_job_state(job)
+            if events or state != initial_state or state.get("status") in SYNC_TERMINAL_STATUSES:
+                break
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(SYNC_EVENT_STREAM_POLL_SECONDS)
+
+        # A finished job with a full batch still has events to page through.
+        done = state.get("status") in SYNC_TERMINAL_STATUSES and len(events) < SYNC_EVENT_BATCH_SIZE
+        return Response(
+            {
+                "job_id": job.job_id,
+                "events": events,
+                "last_seq": events[-1]["seq"] if events else since,
+                "state": _sync_job_final_state(job) if done else state,
+                "done": done,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class NotionSyncJobCancelAPIView(APIView):
     """
     Request cancellation for an async Notion sync job.
@@ -1045,6 +2599,62 @@ class NotionSyncJobCancelAPIView(APIView):
         )
 
 
+class NotionSyncJobResumeAPIView(APIView):
+    """
+    Start a new sync job that continues a failed or canceled job from its checkpoint.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Resume async Notion sync job",
+        responses={202: dict, 404: dict, 409: dict},
+        tags=["Notion"],
+    )
+    def post(self, request, job_id: str):
+        try:
+            job = NotionSyncJob.objects.select_related("created_by").get(job_id=job_id)
+        except NotionSyncJob.DoesNotExist:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        if not request.user.is_staff and job.created_by_id != request.user.id:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        if not _sync_job_is_resumable(job):
+            return Response(
+                {
+                    "success": False,
+                    "job_id": job.job_id,
+                    "status": job.status,
+                    "message": f"Cannot resume a {job.status} job without a checkpoint.",
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        params = {key: value for key, value in (job.parameters or {}).items() if key != "follow_up_of"}
+        params["resume_from_job_id"] = job.job_id
+        # A resume carries its own checkpoint, so it never attaches; it waits behind any running crawl.
+        resumed, outcome = _submit_sync_job(
+            job.created_by or request.user,
+            params,
+            checkpoint=job.checkpoint,
+        )
+
+        return Response(
+            {
+                "success": True,
+                "job_id": resumed.job_id,
+                "resumed_from_job_id": job.job_id,
+                "status": resumed.status,
+                "outcome": outcome,
+                "follow_up_of": (resumed.parameters or {}).get("follow_up_of"),
+                "poll_url": f"/notion/api/sync/jobs/{resumed.job_id}/",
+                "parameters": resumed.parameters,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
 class NotionSyncActiveJobAPIView(APIView):
     """
     Return newest active sync job for current user.
@@ -1058,9 +2668,9 @@ class NotionSyncActiveJobAPIView(APIView):
         tags=["Notion"],
     )
     def get(self, request):
-        queryset = NotionSyncJob.objects.filter(status__in=[NotionSyncJob.STATUS_QUEUED, NotionSyncJob.STATUS_RUNNING])
+        queryset = NotionSyncJob.objects.filter(status__in=SYNC_ACTIVE_STATUSES)
         if not request.user.is_staff:
-            queryset = queryset.filter(created_by=request.user)
+            queryset = queryset.filter(Q(created_by=request.user) | Q(attached_users=request.user)).distinct()
         job = queryset.order_by("-created_at").first()
 
         if not job:
@@ -1113,6 +2723,12 @@ class NotionIngestToRAGAPIView(APIView):
                 location=OpenApiParameter.QUERY,
                 description="Only ingest rows with changed content hash (default true)",
             ),
+            OpenApiParameter(
+                name="concurrency",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Parallel RAG ingest requests (default RAG_INGEST_CONCURRENCY)",
+            ),
         ],
         responses={200: dict, 500: dict},
         tags=["Notion"],
@@ -1121,10 +2737,13 @@ class NotionIngestToRAGAPIView(APIView):
         max_items_raw = request.query_params.get("max_items")
         max_items = int(max_items_raw) if max_items_raw else None
         only_changed = request.query_params.get("only_changed", "true").lower() != "false"
+        concurrency_raw = request.query_params.get("concurrency")
+        concurrency = _concurrency_param(concurrency_raw)
         result = _run_notion_rag_ingest(
             max_items=max_items,
             only_changed=only_changed,
             user=request.user,
             logger=logging.getLogger(__name__),
+            concurrency=concurrency,
         )
         return Response(result, status=status.HTTP_200_OK)
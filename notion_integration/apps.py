@@ -12,12 +12,17 @@ logger = logging.getLogger(__name__)
 def reconcile_stale_sync_jobs() -> int:
     """
     Mark orphaned queued/running sync jobs as failed on process startup.
+
+    Only jobs that ran on web worker threads die with the process; Celery jobs
+    are redelivered by the broker and are only failed once their lease expired.
     """
+    from .api_views import _fail_expired_sync_jobs
     from .models import NotionSyncJob
 
     now = timezone.now()
     stale = NotionSyncJob.objects.filter(
         status__in=[NotionSyncJob.STATUS_QUEUED, NotionSyncJob.STATUS_RUNNING],
+        executor=NotionSyncJob.EXECUTOR_THREAD,
         finished_at__isnull=True,
     )
     updated = stale.update(
@@ -25,7 +30,7 @@ def reconcile_stale_sync_jobs() -> int:
         finished_at=now,
         error_message="Job interrupted by app restart/redeploy.",
     )
-    return updated
+    return updated + _fail_expired_sync_jobs()
 
 
 class NotionIntegrationConfig(AppConfig):
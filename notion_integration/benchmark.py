@@ -0,0 +1,524 @@
+"""
+Sync/ingest benchmark against a local fake Notion API.
+
+`FakeNotionServer` serves the Notion endpoints NotionService uses (`/search`,
+`/pages/{id}`, `/databases/{id}`, `/databases/{id}/query`,
+`/blocks/{id}/children`) plus the RAG ingest endpoints, over a generated
+workspace with configurable size, tree depth, latency and 429 injection.
+`run_benchmark` points NotionService and the RAG client at it, runs
+`_run_notion_sync` and `_run_notion_rag_ingest` inside a transaction that is
+always rolled back, and reports throughput, requests per item, per-item
+latency percentiles, DB writes and peak traced memory.
+
+Run it with `python manage.py benchmark_notion_sync --help`.
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+
+@dataclass
+class BenchmarkConfig:
+    pages: int = 50
+    blocks_per_page: int = 20
+    depth: int = 2
+    fanout: int = 3
+    databases: int = 2
+    rows_per_database: int = 50
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after_seconds: float = 0.05
+    rate_limit_per_second: float = 1000.0
+    block_fetch_concurrency: int = 1
+    ingest_concurrency: int = 4
+    runs: int = 1
+    touch_fraction: float = 0.1
+    include_database_rows: bool = True
+    ingest: bool = True
+    seed: int = 1
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat().replace("+00:00", ".000Z")
+
+
+def percentile(samples: list[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile; None for no samples.
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(int(round(pct / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+class FakeWorkspace:
+    """
+    Deterministic generated workspace. Block trees are derived from block ids on
+    demand, so large workspaces cost no memory up front.
+    """
+
+    def __init__(self, config: BenchmarkConfig):
+        self.config = config
+        self.base_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.page_edited = {
+            f"page-{index:05d}": self.base_time - timedelta(minutes=index) for index in range(config.pages)
+        }
+        self.database_edited = {
+            f"db-{index:03d}": self.base_time - timedelta(minutes=index) for index in range(config.databases)
+        }
+        self.row_edited = {
+            f"{database_id}-row-{row:05d}": self.base_time - timedelta(minutes=row)
+            for database_id in self.database_edited
+            for row in range(config.rows_per_database)
+        }
+        # Edit count per page or row; it is part of the generated text, so a touched object's content changes.
+        self.versions: Dict[str, int] = {}
+        self._random = random.Random(config.seed)
+
+    def touch(self, fraction: float) -> int:
+        """
+        Edit a fraction of pages and rows, as edits between syncs would: bump their
+        last_edited_time and version, which changes their block and row text.
+        """
+        now = self.base_time + timedelta(days=1, minutes=self._random.randint(0, 10_000))
+        touched = 0
+        for edited in (self.page_edited, self.row_edited):
+            for key in self._random.sample(sorted(edited), int(len(edited) * fraction)):
+                edited[key] = now
+                self.versions[key] = self.versions.get(key, 0) + 1
+                touched += 1
+        return touched
+
+    def search_item(self, object_id: str) -> Dict[str, Any]:
+        if object_id in self.database_edited:
+            return self.database(object_id)
+        return self.page(object_id)
+
+    def page(self, page_id: str) -> Dict[str, Any]:
+        return {
+            "object": "page",
+            "id": page_id,
+            "url": f"https://notion.so/{page_id}",
+            "created_time": _iso(self.base_time - timedelta(days=30)),
+            "last_edited_time": _iso(self.page_edited[page_id]),
+            "archived": False,
+            "parent": {"type": "workspace", "workspace": True},
+            "properties": {"Name": {"type": "title", "title": [{"plain_text": f"Benchmark {page_id}"}]}},
+        }
+
+    def database(self, database_id: str) -> Dict[str, Any]:
+        return {
+            "object": "database",
+            "id": database_id,
+            "url": f"https://notion.so/{database_id}",
+            "last_edited_time": _iso(self.database_edited[database_id]),
+            "archived": False,
+            "parent": {"type": "workspace", "workspace": True},
+            "title": [{"plain_text": f"Benchmark {database_id}"}],
+        }
+
+    def row(self, row_id: str) -> Dict[str, Any]:
+        return {
+            "object": "page",
+            "id": row_id,
+            "created_time": _iso(self.base_time - timedelta(days=30)),
+            "last_edited_time": _iso(self.row_edited[row_id]),
+            "properties": {
+                "Name": {"type": "title", "title": [{"plain_text": f"Row {row_id}"}]},
+                "Status": {"type": "select", "select": {"name": f"Revision {self.versions.get(row_id, 0)}"}},
+                "Amount": {"type": "number", "number": len(row_id)},
+            },
+        }
+
+    def block_children(self, block_id: str) -> list[Dict[str, Any]]:
+        page_id = block_id.split("~", 1)[0]
+        if page_id not in self.page_edited:
+            return []
+        level = block_id.count("~")
+        count = self.config.blocks_per_page if level == 0 else self.config.fanout
+        edited = _iso(self.page_edited[page_id])
+        version = self.versions.get(page_id, 0)
+        children = []
+        for index in range(count):
+            child_id = f"{block_id}~{index}"
+            # Every fourth block nests, down to the configured depth.
+            has_children = level + 1 < self.config.depth and index % 4 == 0
+            block_type = "heading_2" if level == 0 and index % 10 == 0 else "paragraph"
+            children.append(
+                {
+                    "object": "block",
+                    "id": child_id,
+                    "type": block_type,
+                    "has_children": has_children,
+                    "last_edited_time": edited,
+                    block_type: {
+                        "rich_text": [
+                            {
+                                "plain_text": (
+                                    f"Block {child_id} of the benchmark workspace, revision {version}, "
+                                    "with some filler text."
+                                )
+                            }
+                        ]
+                    },
+                }
+            )
+        return children
+
+
+def _paginate(items: list, start_cursor: Optional[str], page_size: int) -> Dict[str, Any]:
+    offset = int(start_cursor or 0)
+    page_size = min(max(page_size, 1), 100)
+    chunk = items[offset : offset + page_size]
+    next_offset = offset + len(chunk)
+    has_more = next_offset < len(items)
+    return {
+        "object": "list",
+        "results": chunk,
+        "has_more": has_more,
+        "next_cursor": str(next_offset) if has_more else None,
+    }
+
+
+class FakeNotionServer:
+    """
+    Threaded HTTP stand-in for the Notion REST API and the RAG ingest API.
+    """
+
+    def __init__(self, workspace: FakeWorkspace, config: BenchmarkConfig):
+        self.workspace = workspace
+        self.config = config
+        self._lock = threading.Lock()
+        self._random = random.Random(config.seed)
+        self.reset_metrics()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+            def do_DELETE(self):
+                server._handle(self, "DELETE")
+
+            def log_message(self, format, *args):
+                return
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-notion", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeNotionServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self.requests: Dict[str, int] = {}
+            self.throttled = 0
+            self.rag_latencies: list[float] = []
+
+    def _count(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def _should_throttle(self) -> bool:
+        if self.config.throttle_rate <= 0:
+            return False
+        with self._lock:
+            throttle = self._random.random() < self.config.throttle_rate
+            if throttle:
+                self.throttled += 1
+            return throttle
+
+    def _sleep_latency(self) -> None:
+        latency = self.config.latency_ms
+        if self.config.jitter_ms:
+            with self._lock:
+                latency += self._random.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        if latency > 0:
+            time.sleep(latency / 1000.0)
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        started = time.monotonic()
+        parsed = urlparse(handler.path)
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length) or b"{}") if length else {}
+        parts = [part for part in parsed.path.split("/") if part]
+
+        if parts[:3] == ["api", "v1", "ingest"]:
+            self._count(f"rag {method}")
+            self._sleep_latency()
+            payload = {"document_id": str(uuid.uuid4())} if method == "POST" else {}
+            self._respond(handler, 200, payload)
+            if method == "POST":
+                with self._lock:
+                    self.rag_latencies.append(time.monotonic() - started)
+            return
+
+        route, payload = self._notion_route(method, parts[1:] if parts[:1] == ["v1"] else parts, body, parsed.query)
+        self._count(route)
+        self._sleep_latency()
+        if self._should_throttle():
+            self._respond(
+                handler,
+                429,
+                {"object": "error", "status": 429, "code": "rate_limited"},
+                {"Retry-After": str(self.config.retry_after_seconds)},
+            )
+            return
+        if payload is None:
+            self._respond(handler, 404, {"object": "error", "status": 404, "code": "object_not_found"})
+            return
+        self._respond(handler, 200, payload)
+
+    def _notion_route(self, method: str, parts: list[str], body: dict, query: str):
+        workspace = self.workspace
+        params = {key: values[0] for key, values in parse_qs(query).items()}
+        if method == "POST" and parts == ["search"]:
+            wanted = (body.get("filter") or {}).get("value")
+            ids = []
+            if wanted in (None, "page"):
+                ids += list(workspace.page_edited)
+            if wanted in (None, "database"):
+                ids += list(workspace.database_edited)
+            edited = {**workspace.page_edited, **workspace.database_edited}
+            ids.sort(key=lambda object_id: edited[object_id], reverse=True)
+            result = _paginate(ids, body.get("start_cursor"), int(body.get("page_size", 100)))
+            result["results"] = [workspace.search_item(object_id) for object_id in result["results"]]
+            return "search", result
+        if method == "GET" and len(parts) == 2 and parts[0] == "pages":
+            return "pages", workspace.page(parts[1]) if parts[1] in workspace.page_edited else None
+        if method == "GET" and len(parts) == 2 and parts[0] == "databases":
+            return "databases", workspace.database(parts[1]) if parts[1] in workspace.database_edited else None
+        if method == "POST" and len(parts) == 3 and parts[0] == "databases" and parts[2] == "query":
+            database_id = parts[1]
+            row_ids = [row_id for row_id in workspace.row_edited if row_id.startswith(f"{database_id}-row-")]
+            on_or_after = ((body.get("filter") or {}).get("last_edited_time") or {}).get("on_or_after")
+            if on_or_after:
+                cutoff = datetime.fromisoformat(on_or_after.replace("Z", "+00:00"))
+                row_ids = [row_id for row_id in row_ids if workspace.row_edited[row_id] >= cutoff]
+            row_ids.sort(key=lambda row_id: (workspace.row_edited[row_id], row_id))
+            result = _paginate(row_ids, body.get("start_cursor"), int(body.get("page_size", 100)))
+            result["results"] = [workspace.row(row_id) for row_id in result["results"]]
+            return "databases.query", result
+        if method == "GET" and len(parts) == 3 and parts[0] == "blocks" and parts[2] == "children":
+            children = workspace.block_children(parts[1])
+            return "blocks.children", _paginate(children, params.get("start_cursor"), int(params.get("page_size", 100)))
+        return f"{method} {'/'.join(parts)}", None
+
+    @staticmethod
+    def _respond(handler: BaseHTTPRequestHandler, status_code: int, payload: dict, headers: Optional[dict] = None):
+        data = json.dumps(payload).encode("utf-8")
+        handler.send_response(status_code)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+@contextmanager
+def _patched_environ(values: Dict[str, str]):
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+class _StageProbe:
+    """
+    Counts DB writes on this thread's connection and traces peak memory for one stage.
+    """
+
+    WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE")
+
+    def __init__(self):
+        self.db_writes = 0
+
+    def _wrapper(self, execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith(self.WRITE_PREFIXES):
+            self.db_writes += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def measure(self):
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.started = time.monotonic()
+        try:
+            with connection.execute_wrapper(self._wrapper):
+                yield self
+        finally:
+            self.duration = time.monotonic() - self.started
+            self.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+
+def _latency_summary(samples: list[float]) -> Dict[str, Optional[float]]:
+    def ms(value):
+        return None if value is None else round(value * 1000.0, 2)
+
+    return {"p50_ms": ms(percentile(samples, 50)), "p95_ms": ms(percentile(samples, 95))}
+
+
+def _run_sync_stage(config: BenchmarkConfig, server: FakeNotionServer, incremental: bool) -> Dict[str, Any]:
+    from .api_views import _run_notion_sync
+
+    # Items are processed one at a time on the coordinating thread, so an item's
+    # latency is the gap between its item_started event and the next one.
+    starts: list[float] = []
+
+    def record(event: str, **fields) -> None:
+        if event == "item_started":
+            starts.append(time.monotonic())
+
+    params = {
+        "include_database_rows": config.include_database_rows,
+        "max_items": None,
+        "recursive": True,
+        "max_blocks_per_page": 5000,
+        "max_depth": max(config.depth, 1) + 1,
+        "block_fetch_concurrency": config.block_fetch_concurrency,
+        "incremental": incremental,
+    }
+    server.reset_metrics()
+    probe = _StageProbe()
+    with probe.measure():
+        result = _run_notion_sync(params, "benchmark", record)
+    ends = starts[1:] + [probe.started + probe.duration]
+    latencies = [end - start for start, end in zip(starts, ends)]
+    processed = result.get("processed", 0)
+    notion_requests = sum(count for route, count in server.requests.items() if not route.startswith("rag "))
+    return {
+        "incremental": incremental,
+        "duration_seconds": round(probe.duration, 3),
+        "processed": processed,
+        "skipped_unchanged": result.get("skipped_unchanged", 0),
+        "errors": result.get("errors_count", 0),
+        "items_per_second": round(processed / probe.duration, 2) if probe.duration else None,
+        "notion_requests": notion_requests,
+        "requests_per_item": round(notion_requests / processed, 2) if processed else None,
+        "requests_by_route": dict(sorted(server.requests.items())),
+        "throttled_429": server.throttled,
+        **_latency_summary(latencies),
+        "db_writes": probe.db_writes,
+        "peak_memory_mb": round(probe.peak_memory_bytes / (1024 * 1024), 2),
+    }
+
+
+def _run_ingest_stage(config: BenchmarkConfig, server: FakeNotionServer) -> Dict[str, Any]:
+    from .api_views import _run_notion_rag_ingest
+
+    server.reset_metrics()
+    probe = _StageProbe()
+    with probe.measure():
+        result = _run_notion_rag_ingest(
+            max_items=None,
+            only_changed=True,
+            user=None,
+            logger=logging.getLogger("notion_integration.benchmark"),
+            concurrency=config.ingest_concurrency,
+        )
+    ingested = result.get("ingested", 0)
+    rag_requests = sum(count for route, count in server.requests.items() if route.startswith("rag "))
+    return {
+        "duration_seconds": round(probe.duration, 3),
+        "ingested": ingested,
+        "skipped_unchanged": result.get("skipped_unchanged", 0),
+        "failed": result.get("failed", 0),
+        "items_per_second": round(ingested / probe.duration, 2) if probe.duration else None,
+        "rag_requests": rag_requests,
+        "requests_per_item": round(rag_requests / ingested, 2) if ingested else None,
+        # Per-document latency as seen by the fake RAG server (includes injected latency).
+        **_latency_summary(list(server.rag_latencies)),
+        "db_writes": probe.db_writes,
+        "peak_memory_mb": round(probe.peak_memory_bytes / (1024 * 1024), 2),
+    }
+
+
+def run_benchmark(config: BenchmarkConfig) -> Dict[str, Any]:
+    """
+    Run `config.runs` sync (+ ingest) rounds against a fresh fake workspace.
+
+    The first round starts from empty Notion tables; later rounds touch
+    `touch_fraction` of the workspace first and sync incrementally, which is
+    what exercises the block cache, watermarks and row mirror. All DB changes
+    are rolled back at the end.
+    """
+    from .models import (
+        NotionBlockChildren,
+        NotionContent,
+        NotionContentSection,
+        NotionDatabaseMirror,
+        NotionDatabaseRow,
+        NotionSyncWatermark,
+    )
+
+    workspace = FakeWorkspace(config)
+    rounds = []
+    with FakeNotionServer(workspace, config) as server, _patched_environ(
+        {
+            "NOTION_API_BASE_URL": f"{server.base_url}/v1",
+            # A fresh token gets its own rate limiter, so earlier runs do not leak budget.
+            "NOTION_INTERNAL_TOKEN": f"benchmark-{uuid.uuid4()}",
+            "NOTION_RATE_LIMIT_PER_SECOND": str(config.rate_limit_per_second),
+            "NOTION_RATE_LIMIT_BURST": str(max(config.rate_limit_per_second, 1.0)),
+            "NOTION_RATE_LIMIT_REDIS_URL": "",
+        }
+    ), override_settings(RAG_API_BASE_URL=server.base_url, RAG_API_KEY="benchmark"):
+        with transaction.atomic():
+            for model in (
+                NotionContentSection,
+                NotionContent,
+                NotionBlockChildren,
+                NotionDatabaseRow,
+                NotionDatabaseMirror,
+                NotionSyncWatermark,
+            ):
+                model.objects.all().delete()
+            for index in range(max(config.runs, 1)):
+                touched = workspace.touch(config.touch_fraction) if index else 0
+                sync_stats = _run_sync_stage(config, server, incremental=index > 0)
+                ingest_stats = _run_ingest_stage(config, server) if config.ingest else None
+                rounds.append({"round": index + 1, "touched": touched, "sync": sync_stats, "ingest": ingest_stats})
+            transaction.set_rollback(True)
+
+    return {"config": asdict(config), "rounds": rounds}
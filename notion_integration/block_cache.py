@@ -0,0 +1,114 @@
+"""
+Persistent cache of Notion block children for the sync crawler.
+
+A block's children listing is reused while that block's last_edited_time is
+unchanged, so resyncing a large page only refetches the subtrees that moved.
+Notion does not bump an ancestor block's last_edited_time for every nested
+edit, so entries also expire after NOTION_BLOCK_CACHE_MAX_AGE_HOURS
+(default 24; 0 disables the cache).
+"""
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import NotionBlockChildren
+from .services import _env_number
+
+
+def get_block_cache_max_age() -> Optional[timedelta]:
+    hours = _env_number("NOTION_BLOCK_CACHE_MAX_AGE_HOURS", 24.0, cast=float)
+    if hours <= 0:
+        return None
+    return timedelta(hours=hours)
+
+
+def _strip_children(block: Dict[str, Any]) -> Dict[str, Any]:
+    # Traversal attaches `children` to blocks in place; the cache stores one level only.
+    return {key: value for key, value in block.items() if key != "children"}
+
+
+class NotionPageBlockCache:
+    """
+    Block children cached for one page.
+
+    Only block ids and edit times are loaded up front; a hit reads that one
+    listing, and new listings are written back in batches of `flush_every`, so
+    the cache never holds a whole page's blocks in memory. Use it from the
+    thread that owns the DB connection and call `save()` when the page is done.
+    """
+
+    def __init__(self, page_id: str, max_age: timedelta, flush_every: int = 50):
+        self.page_id = page_id
+        self.max_age = max_age
+        self.flush_every = flush_every
+        fresh_after = timezone.now() - max_age
+        self._edited = dict(
+            NotionBlockChildren.objects.filter(page_id=page_id, fetched_at__gte=fresh_after).values_list(
+                "block_id", "last_edited_time"
+            )
+        )
+        self._dirty: Dict[str, NotionBlockChildren] = {}
+        self._used: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_page(cls, page_id: str) -> Optional["NotionPageBlockCache"]:
+        max_age = get_block_cache_max_age()
+        if max_age is None:
+            return None
+        return cls(page_id, max_age)
+
+    def get(self, block_id: str, last_edited_time: Optional[str]) -> Optional[list[Dict[str, Any]]]:
+        edited = parse_datetime(last_edited_time) if last_edited_time else None
+        if edited is None or self._edited.get(block_id) != edited:
+            self.misses += 1
+            return None
+        if block_id in self._dirty:
+            children = self._dirty[block_id].children
+        else:
+            children = NotionBlockChildren.objects.filter(block_id=block_id).values_list("children", flat=True).first()
+            if children is None:
+                self.misses += 1
+                return None
+        self.hits += 1
+        self._used.add(block_id)
+        return [dict(block) for block in children or []]
+
+    def put(self, block_id: str, last_edited_time: Optional[str], children: list[Dict[str, Any]]) -> None:
+        edited = parse_datetime(last_edited_time) if last_edited_time else None
+        if edited is None:
+            return
+        self._used.add(block_id)
+        self._dirty[block_id] = NotionBlockChildren(
+            block_id=block_id,
+            page_id=self.page_id,
+            last_edited_time=edited,
+            children=[_strip_children(block) for block in children],
+            fetched_at=timezone.now(),
+        )
+        self._edited[block_id] = edited
+        if len(self._dirty) >= self.flush_every:
+            self._write_dirty()
+
+    def _write_dirty(self) -> None:
+        if not self._dirty:
+            return
+        NotionBlockChildren.objects.bulk_create(
+            list(self._dirty.values()),
+            batch_size=200,
+            update_conflicts=True,
+            unique_fields=["block_id"],
+            update_fields=["page_id", "last_edited_time", "children", "fetched_at"],
+        )
+        self._dirty = {}
+
+    def save(self, prune: bool = False) -> None:
+        """
+        Persist new listings; with `prune`, drop this page's entries the traversal no longer reached.
+        """
+        self._write_dirty()
+        if prune:
+            NotionBlockChildren.objects.filter(page_id=self.page_id).exclude(block_id__in=self._used).delete()
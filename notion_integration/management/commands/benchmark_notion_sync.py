@@ -0,0 +1,89 @@
+"""
+Management command to benchmark Notion sync and RAG ingest against a local fake Notion API.
+All database changes are rolled back, so it is safe to run against a dev database.
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+from notion_integration.benchmark import BenchmarkConfig, run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks _run_notion_sync and _run_notion_rag_ingest against a fake Notion workspace'
+
+    def add_arguments(self, parser):
+        defaults = BenchmarkConfig()
+        parser.add_argument('--pages', type=int, default=defaults.pages)
+        parser.add_argument('--blocks-per-page', type=int, default=defaults.blocks_per_page)
+        parser.add_argument('--depth', type=int, default=defaults.depth, help='Block tree depth (1 = flat pages)')
+        parser.add_argument('--fanout', type=int, default=defaults.fanout, help='Children per nested block')
+        parser.add_argument('--databases', type=int, default=defaults.databases)
+        parser.add_argument('--rows-per-database', type=int, default=defaults.rows_per_database)
+        parser.add_argument('--latency-ms', type=float, default=defaults.latency_ms)
+        parser.add_argument('--jitter-ms', type=float, default=defaults.jitter_ms)
+        parser.add_argument(
+            '--throttle-rate', type=float, default=defaults.throttle_rate,
+            help='Fraction of Notion requests answered with 429',
+        )
+        parser.add_argument('--retry-after', type=float, default=defaults.retry_after_seconds)
+        parser.add_argument(
+            '--rate-limit', type=float, default=defaults.rate_limit_per_second,
+            help='Client-side requests/sec (Notion allows about 3)',
+        )
+        parser.add_argument('--block-fetch-concurrency', type=int, default=defaults.block_fetch_concurrency)
+        parser.add_argument('--ingest-concurrency', type=int, default=defaults.ingest_concurrency)
+        parser.add_argument('--runs', type=int, default=defaults.runs, help='Rounds; rounds after the first are incremental')
+        parser.add_argument('--touch-fraction', type=float, default=defaults.touch_fraction)
+        parser.add_argument('--no-database-rows', action='store_true')
+        parser.add_argument('--no-ingest', action='store_true')
+        parser.add_argument('--seed', type=int, default=defaults.seed)
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+
+    def handle(self, *args, **options):
+        config = BenchmarkConfig(
+            pages=options['pages'],
+            blocks_per_page=options['blocks_per_page'],
+            depth=options['depth'],
+            fanout=options['fanout'],
+            databases=options['databases'],
+            rows_per_database=options['rows_per_database'],
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            throttle_rate=options['throttle_rate'],
+            retry_after_seconds=options['retry_after'],
+            rate_limit_per_second=options['rate_limit'],
+            block_fetch_concurrency=options['block_fetch_concurrency'],
+            ingest_concurrency=options['ingest_concurrency'],
+            runs=options['runs'],
+            touch_fraction=options['touch_fraction'],
+            include_database_rows=not options['no_database_rows'],
+            ingest=not options['no_ingest'],
+            seed=options['seed'],
+        )
+        report = run_benchmark(config)
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2, default=str))
+            return
+
+        for entry in report['rounds']:
+            sync = entry['sync']
+            self.stdout.write(self.style.SUCCESS(
+                f"Round {entry['round']} ({'incremental' if sync['incremental'] else 'full'}, "
+                f"touched={entry['touched']})"
+            ))
+            self.stdout.write(
+                f"  sync:   {sync['processed']} items in {sync['duration_seconds']}s "
+                f"({sync['items_per_second']} items/s), {sync['requests_per_item']} requests/item, "
+                f"p50={sync['p50_ms']}ms p95={sync['p95_ms']}ms, 429s={sync['throttled_429']}, "
+                f"db_writes={sync['db_writes']}, peak_mem={sync['peak_memory_mb']}MB"
+            )
+            ingest = entry['ingest']
+            if ingest:
+                self.stdout.write(
+                    f"  ingest: {ingest['ingested']} docs in {ingest['duration_seconds']}s "
+                    f"({ingest['items_per_second']} docs/s), {ingest['requests_per_item']} requests/doc, "
+                    f"p50={ingest['p50_ms']}ms p95={ingest['p95_ms']}ms, "
+                    f"db_writes={ingest['db_writes']}, peak_mem={ingest['peak_memory_mb']}MB"
+                )
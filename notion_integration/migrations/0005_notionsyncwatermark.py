@@ -0,0 +1,28 @@
+# Generated by Django 5.2.10 on 2026-10-16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0004_notionsyncjob_cancel_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotionSyncWatermark",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "object_type",
+                    models.CharField(
+                        choices=[("page", "Page"), ("database", "Database")],
+                        max_length=16,
+                        unique=True,
+                    ),
+                ),
+                ("last_edited_time", models.DateTimeField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
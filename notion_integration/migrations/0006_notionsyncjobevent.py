@@ -0,0 +1,37 @@
+# Generated by Django 5.2.10 on 2026-10-16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0005_notionsyncwatermark"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotionSyncJobEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("seq", models.PositiveIntegerField()),
+                ("ts", models.DateTimeField()),
+                ("event", models.CharField(max_length=64)),
+                ("details", models.JSONField(blank=True, default=dict)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events",
+                        to="notion_integration.notionsyncjob",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["job", "seq"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("job", "seq"), name="notion_sync_job_event_seq_unique"),
+                ],
+            },
+        ),
+    ]
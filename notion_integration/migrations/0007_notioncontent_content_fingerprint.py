@@ -0,0 +1,37 @@
+# Generated by Django 5.2.10 on 2026-10-16
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_content_fingerprint(apps, schema_editor):
+    NotionContent = apps.get_model("notion_integration", "NotionContent")
+    batch = []
+    queryset = NotionContent.objects.only("id", "notion_id", "object_type", "title", "url", "plain_text")
+    for row in queryset.iterator(chunk_size=500):
+        hash_input = "||".join(
+            [row.notion_id or "", row.object_type or "", row.title or "", row.url or "", row.plain_text or ""]
+        )
+        row.content_fingerprint = hashlib.sha256(hash_input.encode("utf-8")).hexdigest()
+        batch.append(row)
+        if len(batch) >= 500:
+            NotionContent.objects.bulk_update(batch, ["content_fingerprint"])
+            batch = []
+    if batch:
+        NotionContent.objects.bulk_update(batch, ["content_fingerprint"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0006_notionsyncjobevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notioncontent",
+            name="content_fingerprint",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.RunPython(backfill_content_fingerprint, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.10 on 2026-10-16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0007_notioncontent_content_fingerprint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notionsyncjob",
+            name="executor",
+            field=models.CharField(
+                choices=[("thread", "Web worker thread"), ("celery", "Celery worker")],
+                default="thread",
+                max_length=16,
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.10 on 2026-10-16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0008_notionsyncjob_executor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notionsyncjob",
+            name="checkpoint",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="notionsyncjob",
+            name="checkpoint_items",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
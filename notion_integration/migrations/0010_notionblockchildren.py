@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0009_notionsyncjob_checkpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotionBlockChildren",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("block_id", models.CharField(max_length=64, unique=True)),
+                ("page_id", models.CharField(db_index=True, max_length=64)),
+                ("last_edited_time", models.DateTimeField()),
+                ("children", models.JSONField(blank=True, default=list)),
+                ("fetched_at", models.DateTimeField()),
+            ],
+        ),
+    ]
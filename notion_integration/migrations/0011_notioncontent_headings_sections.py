@@ -0,0 +1,44 @@
+# Generated by Django 5.2.10 on 2026-10-16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0010_notionblockchildren"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notioncontent",
+            name="headings",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.CreateModel(
+            name="NotionContentSection",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("anchor", models.CharField(max_length=128)),
+                ("position", models.PositiveIntegerField(default=0)),
+                ("title", models.CharField(blank=True, default="", max_length=512)),
+                ("content_hash", models.CharField(blank=True, default="", max_length=64)),
+                ("rag_document_id", models.CharField(blank=True, default="", max_length=64)),
+                ("last_ingested_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "content",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sections",
+                        to="notion_integration.notioncontent",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["content", "position"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("content", "anchor"), name="notion_content_section_anchor_unique"),
+                ],
+            },
+        ),
+    ]
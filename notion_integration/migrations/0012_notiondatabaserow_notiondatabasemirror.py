@@ -0,0 +1,38 @@
+# Generated by Django 5.2.10 on 2026-10-16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0011_notioncontent_headings_sections"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotionDatabaseRow",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("database_id", models.CharField(db_index=True, max_length=64)),
+                ("row_id", models.CharField(max_length=64, unique=True)),
+                ("title", models.CharField(blank=True, max_length=512)),
+                ("text", models.TextField(blank=True)),
+                ("created_time", models.DateTimeField(blank=True, null=True)),
+                ("last_edited_time", models.DateTimeField(blank=True, null=True)),
+                ("synced_at", models.DateTimeField()),
+            ],
+            options={
+                "ordering": ["database_id", "created_time", "row_id"],
+            },
+        ),
+        migrations.CreateModel(
+            name="NotionDatabaseMirror",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("database_id", models.CharField(max_length=64, unique=True)),
+                ("rows_last_edited_time", models.DateTimeField(blank=True, null=True)),
+                ("reconciled_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
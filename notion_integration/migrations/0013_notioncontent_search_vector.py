@@ -0,0 +1,48 @@
+# Generated by Django 5.2.10 on 2026-10-16
+
+import django.contrib.postgres.search
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# The GIN indexes use PostgreSQL-only access methods, so they are created here
+# instead of Meta.indexes and skipped on the SQLite dev database.
+SEARCH_INDEXES = (
+    GinIndex(fields=["search_vector"], name="notion_content_search_gin"),
+    GinIndex(fields=["title"], name="notion_content_title_trgm", opclasses=["gin_trgm_ops"]),
+)
+
+
+def add_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    from notion_integration.search import notion_search_vector
+
+    NotionContent = apps.get_model("notion_integration", "NotionContent")
+    for index in SEARCH_INDEXES:
+        schema_editor.add_index(NotionContent, index)
+    NotionContent.objects.using(schema_editor.connection.alias).update(search_vector=notion_search_vector())
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    NotionContent = apps.get_model("notion_integration", "NotionContent")
+    for index in SEARCH_INDEXES:
+        schema_editor.remove_index(NotionContent, index)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0012_notiondatabaserow_notiondatabasemirror"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="notioncontent",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
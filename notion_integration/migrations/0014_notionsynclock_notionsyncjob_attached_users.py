@@ -0,0 +1,34 @@
+# Generated by Django 5.2.10 on 2026-10-17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_sync_lock(apps, schema_editor):
+    NotionSyncLock = apps.get_model("notion_integration", "NotionSyncLock")
+    NotionSyncLock.objects.using(schema_editor.connection.alias).get_or_create(name="notion_sync")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0013_notioncontent_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotionSyncLock",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=64, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="notionsyncjob",
+            name="attached_users",
+            field=models.ManyToManyField(
+                blank=True, related_name="attached_notion_sync_jobs", to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.RunPython(create_sync_lock, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.10 on 2026-10-17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0014_notionsynclock_notionsyncjob_attached_users"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notionsyncjob",
+            name="lease_owner",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="notionsyncjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
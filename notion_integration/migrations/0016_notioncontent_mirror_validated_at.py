@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0015_notionsyncjob_lease"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notioncontent",
+            name="mirror_validated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
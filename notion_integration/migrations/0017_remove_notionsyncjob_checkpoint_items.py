@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-17
+
+from django.db import migrations
+
+
+def drop_item_list_checkpoints(apps, schema_editor):
+    # Checkpoints that indexed the stored item list cannot be resumed by cursor position.
+    NotionSyncJob = apps.get_model("notion_integration", "NotionSyncJob")
+    NotionSyncJob.objects.filter(checkpoint__has_key="position").update(checkpoint={})
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notion_integration", "0016_notioncontent_mirror_validated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_item_list_checkpoints, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="notionsyncjob",
+            name="checkpoint_items",
+        ),
+    ]
@@ -1,6 +1,11 @@
+import hashlib
+
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 
+# Fields that make up a row's RAG document, hashed into content_fingerprint/content_hash.
+CONTENT_HASH_FIELDS = ("notion_id", "object_type", "title", "url", "plain_text")
 
 class NotionContent(models.Model):
     OBJECT_TYPE_CHOICES = (
@@ -17,11 +22,19 @@ class NotionContent(models.Model):
     last_edited_time = models.DateTimeField(null=True, blank=True)
     is_archived = models.BooleanField(default=False)
     plain_text = models.TextField(blank=True, default="")
+    # Heading offsets within plain_text ({"offset", "level", "title"}), used to split large pages into sections.
+    headings = models.JSONField(default=list, blank=True)
     raw_metadata = models.JSONField(default=dict, blank=True)
+    content_fingerprint = models.CharField(max_length=64, blank=True, default="")
     content_hash = models.CharField(max_length=64, blank=True, default="")
     rag_document_id = models.CharField(max_length=64, blank=True, default="")
     last_ingested_at = models.DateTimeField(null=True, blank=True)
     synced_at = models.DateTimeField(auto_now=True)
+    # Last fetch from (or confirmation against) Notion. Unlike synced_at, local
+    # writes such as the RAG ingest or admin edits leave it alone.
+    mirror_validated_at = models.DateTimeField(null=True, blank=True)
+    # Weighted title + plain_text vector, maintained on PostgreSQL only (see search.py).
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["-last_edited_time", "-synced_at"]
@@ -29,6 +42,65 @@ class NotionContent(models.Model):
     def __str__(self) -> str:
         return f"{self.object_type}:{self.title or self.notion_id}"
 
+    def compute_content_hash(self) -> str:
+        """
+        SHA-256 over the fields that make up the RAG document.
+
+        `content_fingerprint` holds this for the current row contents and
+        `content_hash` holds it as of the last RAG ingest.
+        """
+        hash_input = "||".join(getattr(self, field) or "" for field in CONTENT_HASH_FIELDS)
+        return hashlib.sha256(hash_input.encode("utf-8")).hexdigest()
+
+    def save(self, *args, **kwargs):
+        # Partial saves that do not write content (e.g. the RAG ingest recording its
+        # result) must leave the stored fingerprint alone, or they would overwrite
+        # one a concurrent sync just wrote for newer content.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.content_fingerprint = self.compute_content_hash()
+        elif set(update_fields) & set(CONTENT_HASH_FIELDS):
+            self.content_fingerprint = self.compute_content_hash()
+            if "content_fingerprint" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "content_fingerprint"]
+        super().save(*args, **kwargs)
+
+
+class NotionContentSection(models.Model):
+    """
+    Heading-anchored section of a large page, ingested into RAG as its own document.
+    """
+
+    content = models.ForeignKey(NotionContent, on_delete=models.CASCADE, related_name="sections")
+    anchor = models.CharField(max_length=128)
+    position = models.PositiveIntegerField(default=0)
+    title = models.CharField(max_length=512, blank=True, default="")
+    content_hash = models.CharField(max_length=64, blank=True, default="")
+    rag_document_id = models.CharField(max_length=64, blank=True, default="")
+    last_ingested_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["content", "position"]
+        constraints = [
+            models.UniqueConstraint(fields=["content", "anchor"], name="notion_content_section_anchor_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.content_id}#{self.anchor}"
+
+
+class NotionSyncWatermark(models.Model):
+    """
+    Newest Notion last_edited_time fully mirrored by a completed sync, per object type.
+    """
+
+    object_type = models.CharField(max_length=16, choices=NotionContent.OBJECT_TYPE_CHOICES, unique=True)
+    last_edited_time = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.object_type}@{self.last_edited_time.isoformat()}"
+
 
 class NotionSyncJob(models.Model):
     STATUS_QUEUED = "queued"
@@ -43,16 +115,33 @@ class NotionSyncJob(models.Model):
         (STATUS_FAILED, "Failed"),
         (STATUS_CANCELED, "Canceled"),
     )
+    EXECUTOR_THREAD = "thread"
+    EXECUTOR_CELERY = "celery"
+    EXECUTOR_CHOICES = (
+        (EXECUTOR_THREAD, "Web worker thread"),
+        (EXECUTOR_CELERY, "Celery worker"),
+    )
 
     job_id = models.CharField(max_length=64, unique=True)
     status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    executor = models.CharField(max_length=16, choices=EXECUTOR_CHOICES, default=EXECUTOR_THREAD)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    # Users whose overlapping sync requests were coalesced onto this job.
+    attached_users = models.ManyToManyField(
+        settings.AUTH_USER_MODEL, blank=True, related_name="attached_notion_sync_jobs"
+    )
     parameters = models.JSONField(default=dict, blank=True)
     progress_log = models.JSONField(default=list, blank=True)
     result = models.JSONField(default=dict, blank=True)
     error_message = models.TextField(blank=True, default="")
     cancel_requested = models.BooleanField(default=False)
     cancel_requested_at = models.DateTimeField(null=True, blank=True)
+    # Resume state: the search cursor and offset the fetch stopped at per stream, plus failed items.
+    checkpoint = models.JSONField(default=dict, blank=True)
+    # Lease held by the worker running the job, renewed while it runs; a redelivered
+    # task only takes over a running job once the heartbeat is older than the lease.
+    lease_owner = models.CharField(max_length=64, blank=True, default="")
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     started_at = models.DateTimeField(null=True, blank=True)
     finished_at = models.DateTimeField(null=True, blank=True)
@@ -62,3 +151,87 @@ class NotionSyncJob(models.Model):
 
     def __str__(self) -> str:
         return f"{self.job_id} ({self.status})"
+
+
+class NotionSyncLock(models.Model):
+    """
+    Row locked with SELECT ... FOR UPDATE to admit sync jobs one at a time across workers.
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class NotionSyncJobEvent(models.Model):
+    """
+    Append-only progress event emitted by a sync job.
+    """
+
+    job = models.ForeignKey(NotionSyncJob, on_delete=models.CASCADE, related_name="events")
+    seq = models.PositiveIntegerField()
+    ts = models.DateTimeField()
+    event = models.CharField(max_length=64)
+    details = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ["job", "seq"]
+        constraints = [
+            models.UniqueConstraint(fields=["job", "seq"], name="notion_sync_job_event_seq_unique"),
+        ]
+
+    def as_entry(self) -> dict:
+        return {"seq": self.seq, "ts": self.ts.isoformat(), "event": self.event, **(self.details or {})}
+
+    def __str__(self) -> str:
+        return f"{self.job_id}#{self.seq} {self.event}"
+
+
+class NotionBlockChildren(models.Model):
+    """
+    Cached children listing of a Notion block, valid while the block's last_edited_time is unchanged.
+    """
+
+    block_id = models.CharField(max_length=64, unique=True)
+    page_id = models.CharField(max_length=64, db_index=True)
+    last_edited_time = models.DateTimeField()
+    children = models.JSONField(default=list, blank=True)
+    fetched_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.block_id} ({len(self.children or [])} children)"
+
+
+class NotionDatabaseRow(models.Model):
+    """
+    Local mirror of one Notion database row, refreshed only when its last_edited_time moves.
+    """
+
+    database_id = models.CharField(max_length=64, db_index=True)
+    row_id = models.CharField(max_length=64, unique=True)
+    title = models.CharField(max_length=512, blank=True)
+    text = models.TextField(blank=True)
+    created_time = models.DateTimeField(null=True, blank=True)
+    last_edited_time = models.DateTimeField(null=True, blank=True)
+    synced_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["database_id", "created_time", "row_id"]
+
+    def __str__(self) -> str:
+        return self.title or self.row_id
+
+
+class NotionDatabaseMirror(models.Model):
+    """
+    Incremental sync state for one database's row mirror.
+    """
+
+    database_id = models.CharField(max_length=64, unique=True)
+    rows_last_edited_time = models.DateTimeField(null=True, blank=True)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return self.database_id
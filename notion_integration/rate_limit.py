@@ -0,0 +1,245 @@
+"""
+Shared rate-limit governor for Notion API calls.
+
+Every NotionService built for the same integration token draws from one token
+bucket, so sync jobs, search and page views share Notion's ~3 req/s budget
+instead of each discovering the limit through 429s. The bucket lives in process
+memory by default; set NOTION_RATE_LIMIT_REDIS_URL to share it across gunicorn
+workers.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class LocalTokenBucket:
+    """
+    Thread-safe token bucket that hands out reservations.
+
+    Tokens may go negative: each caller reserves a slot immediately and is told
+    how long to wait for it, which keeps callers in arrival order without polling.
+    """
+
+    backend_name = "local"
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= 1
+            wait_seconds = self._updated - now
+            if self._tokens < 0:
+                wait_seconds += -self._tokens / self.rate
+            return max(wait_seconds, 0.0)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            resume_at = time.monotonic() + seconds
+            if resume_at > self._updated:
+                self._updated = resume_at
+            self._tokens = min(self._tokens, 0.0)
+
+
+class RedisTokenBucket:
+    """
+    Token bucket stored in Redis so every worker process shares one budget.
+    """
+
+    backend_name = "redis"
+
+    # Same reservation scheme as LocalTokenBucket, evaluated atomically on the
+    # Redis clock so worker clock skew does not matter.
+    RESERVE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+if now > updated then
+    tokens = math.min(capacity, tokens + (now - updated) * rate)
+    updated = now
+end
+tokens = tokens - 1
+local wait = updated - now
+if tokens < 0 then
+    wait = wait + (-tokens / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(updated))
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(math.max(wait, 0))
+"""
+
+    PAUSE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local resume_at = now + tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or 0
+local updated = tonumber(state[2]) or now
+if resume_at > updated then
+    updated = resume_at
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(math.min(tokens, 0)), 'updated', tostring(updated))
+redis.call('EXPIRE', KEYS[1], 3600)
+return 1
+"""
+
+    def __init__(self, rate: float, capacity: float, redis_url: str, key: str):
+        import redis
+
+        self.rate = rate
+        self.capacity = capacity
+        self.key = key
+        self._client = redis.Redis.from_url(redis_url)
+        self._reserve = self._client.register_script(self.RESERVE_SCRIPT)
+        self._pause = self._client.register_script(self.PAUSE_SCRIPT)
+
+    def reserve(self) -> float:
+        return float(self._reserve(keys=[self.key], args=[self.rate, self.capacity]))
+
+    def pause(self, seconds: float) -> None:
+        self._pause(keys=[self.key], args=[seconds])
+
+
+class NotionRateLimiter:
+    """
+    Blocking governor in front of a token bucket, with per-process metrics.
+    """
+
+    def __init__(self, bucket, fallback_bucket: Optional[LocalTokenBucket] = None):
+        self.bucket = bucket
+        self.fallback_bucket = fallback_bucket
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "acquired": 0,
+            "queued": 0,
+            "waiting": 0,
+            "wait_seconds_total": 0.0,
+            "max_wait_seconds": 0.0,
+            "throttled": 0,
+            "backend_errors": 0,
+        }
+
+    def _reserve(self) -> float:
+        try:
+            return self.bucket.reserve()
+        except Exception as exc:
+            if self.fallback_bucket is None:
+                raise
+            with self._metrics_lock:
+                self._metrics["backend_errors"] += 1
+            logger.warning("notion_rate_limit_backend_error backend=%s error=%s", self.bucket.backend_name, exc)
+            return self.fallback_bucket.reserve()
+
+    def acquire(self) -> float:
+        """
+        Block until a request slot is available; returns seconds spent waiting.
+        """
+        wait_seconds = self._reserve()
+        if wait_seconds > 0:
+            with self._metrics_lock:
+                self._metrics["queued"] += 1
+                self._metrics["waiting"] += 1
+            try:
+                time.sleep(wait_seconds)
+            finally:
+                with self._metrics_lock:
+                    self._metrics["waiting"] -= 1
+
+        with self._metrics_lock:
+            self._metrics["acquired"] += 1
+            self._metrics["wait_seconds_total"] += wait_seconds
+            self._metrics["max_wait_seconds"] = max(self._metrics["max_wait_seconds"], wait_seconds)
+        return wait_seconds
+
+    def record_throttled(self, retry_after_seconds: float) -> None:
+        """
+        Pause the shared bucket after Notion returned 429 so every caller backs off together.
+        """
+        with self._metrics_lock:
+            self._metrics["throttled"] += 1
+        if retry_after_seconds <= 0:
+            return
+        try:
+            self.bucket.pause(retry_after_seconds)
+        except Exception as exc:
+            logger.warning("notion_rate_limit_backend_error backend=%s error=%s", self.bucket.backend_name, exc)
+            if self.fallback_bucket is not None:
+                self.fallback_bucket.pause(retry_after_seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics["wait_seconds_total"] = round(metrics["wait_seconds_total"], 3)
+        metrics["max_wait_seconds"] = round(metrics["max_wait_seconds"], 3)
+        metrics.update(
+            {
+                "backend": self.bucket.backend_name,
+                "rate_per_second": self.bucket.rate,
+                "burst": self.bucket.capacity,
+            }
+        )
+        return metrics
+
+
+# Governors are keyed by token hash, least recently used first. The bound keeps
+# per-user tokens from growing the registry forever; an evicted token simply
+# starts a fresh bucket the next time it is used.
+RATE_LIMITER_MAX_TOKENS = 64
+_limiters: "OrderedDict[str, NotionRateLimiter]" = OrderedDict()
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(auth_token: str) -> NotionRateLimiter:
+    """
+    Return the process-wide governor for a Notion integration token.
+    """
+    token_key = hashlib.sha256(auth_token.encode("utf-8")).hexdigest()[:16]
+    with _limiters_lock:
+        limiter = _limiters.get(token_key)
+        if limiter is not None:
+            _limiters.move_to_end(token_key)
+            return limiter
+
+        rate = float(os.getenv("NOTION_RATE_LIMIT_PER_SECOND", "3"))
+        capacity = float(os.getenv("NOTION_RATE_LIMIT_BURST", "3"))
+        local_bucket = LocalTokenBucket(rate, capacity)
+        redis_url = os.getenv("NOTION_RATE_LIMIT_REDIS_URL")
+        if redis_url:
+            try:
+                bucket = RedisTokenBucket(rate, capacity, redis_url, key=f"notion:rate_limit:{token_key}")
+                limiter = NotionRateLimiter(bucket, fallback_bucket=local_bucket)
+            except Exception as exc:
+                logger.warning("notion_rate_limit_redis_unavailable error=%s; using local bucket", exc)
+        if limiter is None:
+            limiter = NotionRateLimiter(local_bucket)
+        _limiters[token_key] = limiter
+        while len(_limiters) > RATE_LIMITER_MAX_TOKENS:
+            _limiters.popitem(last=False)
+        return limiter
+
+
+def get_rate_limit_metrics() -> list[Dict[str, Any]]:
+    """
+    Metrics for every governor created in this process.
+    """
+    with _limiters_lock:
+        return [{"token_key": key, **limiter.snapshot()} for key, limiter in _limiters.items()]
@@ -0,0 +1,145 @@
+"""
+Local full-text search over synced NotionContent.
+
+On PostgreSQL the `search_vector` column (title weighted above body, GIN
+indexed) answers ranked queries with highlighted snippets, and a trigram GIN
+index on `title` covers partial-word title matches through the `%>` word
+similarity operator (ILIKE compiles to UPPER(title) and cannot use it). Other databases (the
+SQLite dev setup) fall back to case-insensitive substring matching.
+"""
+import re
+from typing import Any, Dict, Optional
+
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import F, FloatField, Q, QuerySet, Value
+from django.db.models.functions import Coalesce, Greatest, Left
+from django.utils.html import escape
+
+from .models import NotionContent
+
+SEARCH_CONFIG = "english"
+# to_tsvector rejects documents whose vector exceeds 1MB; very long pages are indexed by their head.
+SEARCH_VECTOR_MAX_CHARS = 500_000
+SEARCH_SNIPPET_CHARS = 240
+SEARCH_HIGHLIGHT_START = "<mark>"
+SEARCH_HIGHLIGHT_STOP = "</mark>"
+# Private-use characters mark matches until the page text has been HTML-escaped.
+_HIGHLIGHT_START_SENTINEL = "\ue000"
+_HIGHLIGHT_STOP_SENTINEL = "\ue001"
+
+
+def supports_full_text(queryset: QuerySet) -> bool:
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def notion_search_vector() -> SearchVector:
+    return SearchVector("title", weight="A", config=SEARCH_CONFIG) + SearchVector(
+        Left("plain_text", SEARCH_VECTOR_MAX_CHARS), weight="B", config=SEARCH_CONFIG
+    )
+
+
+def refresh_search_vectors(queryset: QuerySet) -> int:
+    """
+    Recompute `search_vector` for the given rows; a no-op outside PostgreSQL.
+    """
+    if not supports_full_text(queryset):
+        return 0
+    return queryset.update(search_vector=notion_search_vector())
+
+
+def filter_search_matches(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Rows matching `query` through the indexed paths only (tsvector, title trigram, exact id).
+    """
+    if not supports_full_text(queryset):
+        return queryset.filter(Q(notion_id=query) | Q(title__icontains=query) | Q(plain_text__icontains=query))
+    search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+    return queryset.filter(
+        Q(search_vector=search_query) | Q(TrigramWordSimilar(F("title"), query)) | Q(notion_id=query)
+    )
+
+
+def _highlight_snippet(marked: str) -> str:
+    """
+    HTML-escape snippet text, then turn the sentinel-delimited matches into <mark> tags.
+    """
+    return (
+        escape(marked or "")
+        .replace(_HIGHLIGHT_START_SENTINEL, SEARCH_HIGHLIGHT_START)
+        .replace(_HIGHLIGHT_STOP_SENTINEL, SEARCH_HIGHLIGHT_STOP)
+    )
+
+
+def _plain_snippet(text: str, query: str) -> str:
+    # Fallback snippet: a window around the first query term, highlighted like ts_headline.
+    text = (text or "").replace(_HIGHLIGHT_START_SENTINEL, "").replace(_HIGHLIGHT_STOP_SENTINEL, "")
+    terms = [re.escape(term) for term in query.split() if term]
+    if not text or not terms:
+        return escape(text[:SEARCH_SNIPPET_CHARS])
+    pattern = re.compile("|".join(terms), re.IGNORECASE)
+    match = pattern.search(text)
+    start = max((match.start() if match else 0) - SEARCH_SNIPPET_CHARS // 3, 0)
+    window = text[start : start + SEARCH_SNIPPET_CHARS]
+    return _highlight_snippet(
+        pattern.sub(lambda m: f"{_HIGHLIGHT_START_SENTINEL}{m.group(0)}{_HIGHLIGHT_STOP_SENTINEL}", window)
+    )
+
+
+def search_notion_content(
+    query: str,
+    limit: int = 10,
+    object_type: Optional[str] = None,
+    include_archived: bool = False,
+) -> list[Dict[str, Any]]:
+    """
+    Ranked local search across synced Notion pages and databases.
+    """
+    queryset = NotionContent.objects.all()
+    if object_type:
+        queryset = queryset.filter(object_type=object_type)
+    if not include_archived:
+        queryset = queryset.filter(is_archived=False)
+    queryset = filter_search_matches(queryset, query)
+
+    if supports_full_text(queryset):
+        search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+        rows = (
+            queryset.annotate(
+                rank=Greatest(
+                    Coalesce(SearchRank(F("search_vector"), search_query), Value(0.0), output_field=FloatField()),
+                    TrigramWordSimilarity(query, "title"),
+                ),
+                snippet=SearchHeadline(
+                    Left("plain_text", SEARCH_VECTOR_MAX_CHARS),
+                    search_query,
+                    config=SEARCH_CONFIG,
+                    start_sel=_HIGHLIGHT_START_SENTINEL,
+                    stop_sel=_HIGHLIGHT_STOP_SENTINEL,
+                    max_words=35,
+                    min_words=15,
+                    max_fragments=2,
+                ),
+            )
+            .order_by("-rank", "-last_edited_time")
+            .values("notion_id", "object_type", "title", "url", "last_edited_time", "rank", "snippet")[:limit]
+        )
+        return [dict(row, snippet=_highlight_snippet(row["snippet"])) for row in rows]
+
+    results = []
+    rows = queryset.order_by("-last_edited_time").values(
+        "notion_id", "object_type", "title", "url", "last_edited_time", "plain_text"
+    )[:limit]
+    for row in rows:
+        plain_text = row.pop("plain_text")
+        row["rank"] = None
+        row["snippet"] = _plain_snippet(plain_text, query)
+        results.append(row)
+    return results
@@ -0,0 +1,59 @@
+"""
+Split large Notion pages into heading-anchored sections for RAG ingestion.
+
+Anchors come from heading text (plus an occurrence counter for repeated
+headings), so editing one section leaves every other section's anchor and
+content hash untouched and only the edited section is re-ingested.
+"""
+import hashlib
+import re
+from typing import Any, Dict
+
+
+INTRO_ANCHOR = "intro"
+
+
+def _slugify(title: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+    return slug[:80] or "section"
+
+
+def split_notion_sections(text: str, headings: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+    """
+    Cut `text` at each heading offset recorded during sync.
+
+    Returns sections in page order as dicts with anchor, position, title, text
+    and content_hash. Text before the first heading becomes the "intro" section.
+    """
+    starts = []
+    for heading in headings or []:
+        offset = heading.get("offset")
+        if isinstance(offset, int) and 0 <= offset < len(text) and (not starts or offset > starts[-1][0]):
+            starts.append((offset, heading.get("title") or ""))
+
+    spans = []
+    if not starts or starts[0][0] > 0:
+        spans.append((0, starts[0][0] if starts else len(text), ""))
+    for index, (offset, title) in enumerate(starts):
+        end = starts[index + 1][0] if index + 1 < len(starts) else len(text)
+        spans.append((offset, end, title))
+
+    sections = []
+    anchor_counts: Dict[str, int] = {}
+    for start, end, title in spans:
+        section_text = text[start:end].strip()
+        if not section_text:
+            continue
+        base = _slugify(title) if title else INTRO_ANCHOR
+        anchor_counts[base] = anchor_counts.get(base, 0) + 1
+        anchor = base if anchor_counts[base] == 1 else f"{base}-{anchor_counts[base]}"
+        sections.append(
+            {
+                "anchor": anchor,
+                "position": len(sections),
+                "title": title,
+                "text": section_text,
+                "content_hash": hashlib.sha256(f"{anchor}||{title}||{section_text}".encode("utf-8")).hexdigest(),
+            }
+        )
+    return sections
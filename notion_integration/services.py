@@ -3,16 +3,63 @@ Notion API service helpers.
 """
 import os
 import logging
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Any, Dict, Generator, Optional
 
 import requests
 
+from .rate_limit import get_rate_limiter
+
 
 class NotionSyncCancelled(Exception):
     """Raised when cooperative cancellation is requested for Notion sync work."""
 
 
+HEADING_LEVELS = {"heading_1": 1, "heading_2": 2, "heading_3": 3}
+
+
+def _env_number(name: str, default, cast=int):
+    """
+    Read a numeric setting from the environment, falling back to `default` when it is malformed.
+    """
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        logging.getLogger(__name__).warning("notion_invalid_setting name=%s value=%r default=%s", name, raw, default)
+        return default
+
+
+class PageTextCollector:
+    """
+    Page text assembled block by block in traversal order.
+
+    `text` equals `"\n".join(parts)`; `headings` records the character offset,
+    level and title of every heading block so the text can be split into sections.
+    """
+
+    def __init__(self):
+        self.parts: list[str] = []
+        self.headings: list[Dict[str, Any]] = []
+        self._offset = 0
+
+    def add(self, parts: list[str], heading_level: int = 0) -> None:
+        if heading_level and parts:
+            title = "".join(part for part in parts if not part.startswith("[Link] ")).strip()
+            self.headings.append({"offset": self._offset, "level": heading_level, "title": title})
+        for part in parts:
+            self.parts.append(part)
+            self._offset += len(part) + 1
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.parts)
+
+
 class NotionService:
     """
     Thin wrapper around the Notion REST API.
@@ -26,6 +73,7 @@ class NotionService:
         self.auth_token = token
         self.base_url = os.getenv("NOTION_API_BASE_URL", "https://api.notion.com/v1")
         self.notion_version = os.getenv("NOTION_VERSION", "2022-06-28")
+        self.rate_limiter = get_rate_limiter(token)
 
     @property
     def _headers(self) -> Dict[str, str]:
@@ -44,14 +92,15 @@ class NotionService:
     ) -> Dict[str, Any]:
         url = f"{self.base_url}{path}"
         logger = logging.getLogger(__name__)
-        max_retries = int(os.getenv("NOTION_API_MAX_RETRIES", "4"))
-        base_delay_seconds = float(os.getenv("NOTION_API_RETRY_BASE_DELAY_SECONDS", "1"))
-        max_delay_seconds = float(os.getenv("NOTION_API_RETRY_MAX_DELAY_SECONDS", "20"))
+        max_retries = _env_number("NOTION_API_MAX_RETRIES", 4)
+        base_delay_seconds = _env_number("NOTION_API_RETRY_BASE_DELAY_SECONDS", 1.0, float)
+        max_delay_seconds = _env_number("NOTION_API_RETRY_MAX_DELAY_SECONDS", 20.0, float)
         retryable_status_codes = {429, 500, 502, 503, 504}
 
         last_response = None
 
         for attempt in range(max_retries + 1):
+            self.rate_limiter.acquire()
             try:
                 response = requests.request(method, url, headers=self._headers, params=params, json=json, timeout=15)
             except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as exc:
@@ -76,6 +125,9 @@ class NotionService:
                 retry_after = self._parse_retry_after_seconds(response.headers.get("Retry-After"))
                 backoff_seconds = min(base_delay_seconds * (2 ** attempt), max_delay_seconds)
                 sleep_seconds = retry_after if retry_after is not None else backoff_seconds
+                if response.status_code == 429:
+                    # Pause the shared bucket so concurrent callers back off with us.
+                    self.rate_limiter.record_throttled(sleep_seconds)
 
                 logger.warning(
                     "notion_api_retry method=%s path=%s status=%s attempt=%s/%s sleep_seconds=%s",
@@ -150,13 +202,19 @@ class NotionService:
         database_id: str,
         page_size: int = 100,
         start_cursor: Optional[str] = None,
+        query_filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[list[Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
         """
-        Query rows in a database.
+        Query rows in a database, optionally narrowed by a Notion filter object and sorted.
         """
         payload: Dict[str, Any] = {"page_size": min(max(page_size, 1), 100)}
         if start_cursor:
             payload["start_cursor"] = start_cursor
+        if query_filter:
+            payload["filter"] = query_filter
+        if sorts:
+            payload["sorts"] = sorts
         return self._request("POST", f"/databases/{database_id}/query", json=payload)
 
     def list_block_children(
@@ -180,6 +238,9 @@ class NotionService:
         max_blocks: int = 5000,
         max_depth: int = 20,
         should_cancel=None,
+        concurrency: Optional[int] = None,
+        block_cache=None,
+        include_blocks: bool = True,
     ) -> Dict[str, Any]:
         """
         Get full page content including metadata and all blocks.
@@ -189,12 +250,19 @@ class NotionService:
             recursive: If True, fetches nested blocks recursively
             max_blocks: Maximum total blocks to traverse for this page
             max_depth: Maximum child nesting depth when traversing blocks
+            concurrency: Parallel block-children fetches (defaults to NOTION_BLOCK_FETCH_CONCURRENCY, 1 = serial)
+            block_cache: Optional cache with get(block_id, last_edited_time) / put(block_id,
+                last_edited_time, children); unchanged subtrees are read from it instead of the API
+            include_blocks: If False, text is extracted as children arrive and the raw
+                block JSON is dropped (same text_content, `blocks` is empty)
             
         Returns:
             Dict containing:
                 - metadata: Page properties and metadata
                 - blocks: List of all blocks with their content
                 - text_content: Plain text extracted from all blocks
+                - headings: Offsets of heading blocks within text_content
+                - block_count: Number of blocks traversed
         """
         if callable(should_cancel) and should_cancel():
             raise NotionSyncCancelled("Cancellation requested before page fetch.")
@@ -212,29 +280,56 @@ class NotionService:
             "max_depth": max_depth,
             "visited_block_ids": set(),
         }
-        all_blocks = self._get_all_blocks_recursive(
-            page_id,
-            recursive=recursive,
-            depth=0,
-            state=state,
-            should_cancel=should_cancel,
-        )
+        if concurrency is None:
+            concurrency = max(_env_number("NOTION_BLOCK_FETCH_CONCURRENCY", 1), 1)
+        page_edited_time = page_metadata.get("last_edited_time")
+        collector: Optional[PageTextCollector] = None if include_blocks else PageTextCollector()
+        if recursive and concurrency > 1:
+            all_blocks = self._get_all_blocks_concurrent(
+                page_id,
+                state=state,
+                concurrency=concurrency,
+                should_cancel=should_cancel,
+                block_cache=block_cache,
+                last_edited_time=page_edited_time,
+                text_collector=collector,
+            )
+        else:
+            all_blocks = self._get_all_blocks_recursive(
+                page_id,
+                recursive=recursive,
+                depth=0,
+                state=state,
+                should_cancel=should_cancel,
+                block_cache=block_cache,
+                last_edited_time=page_edited_time,
+                text_collector=collector,
+            )
         logger.info(
-            "notion_page_fetch page_id=%s recursive=%s blocks=%s max_blocks=%s max_depth=%s",
+            "notion_page_fetch page_id=%s recursive=%s blocks=%s max_blocks=%s max_depth=%s concurrency=%s "
+            "cache_hits=%s cache_misses=%s",
             page_id,
             recursive,
             state["count"],
             max_blocks,
             max_depth,
+            concurrency,
+            getattr(block_cache, "hits", 0),
+            getattr(block_cache, "misses", 0),
         )
         
         # Extract plain text from blocks
-        text_content = self._extract_text_from_blocks(all_blocks)
+        if collector is None:
+            collector = PageTextCollector()
+            for block in all_blocks:
+                self._collect_block_text(collector, block)
         
         return {
             "metadata": page_metadata,
             "blocks": all_blocks,
-            "text_content": text_content
+            "text_content": collector.text,
+            "headings": collector.headings,
+            "block_count": state["count"],
         }
     
     def _get_all_blocks_recursive(
@@ -244,9 +339,15 @@ class NotionService:
         depth: int = 0,
         state: Optional[Dict[str, Any]] = None,
         should_cancel=None,
+        block_cache=None,
+        last_edited_time: Optional[str] = None,
+        text_collector: Optional[PageTextCollector] = None,
     ) -> list[Dict[str, Any]]:
         """
         Recursively fetch all blocks and their children.
+
+        With `text_collector`, each block's text is added there in traversal order
+        and the block is dropped instead of being collected.
         """
         all_blocks = []
         if state is None:
@@ -262,25 +363,26 @@ class NotionService:
         if depth > state["max_depth"]:
             return all_blocks
 
-        has_more = True
-        start_cursor = None
-        
-        while has_more:
-            if callable(should_cancel) and should_cancel():
-                raise NotionSyncCancelled("Cancellation requested while paginating blocks.")
-            response = self.list_block_children(
-                block_id=block_id,
-                page_size=100,
-                start_cursor=start_cursor
-            )
-            
-            blocks = response.get("results", [])
-            
+        for blocks in self._iter_block_children_pages(block_id, last_edited_time, block_cache, should_cancel):
             for block in blocks:
                 if state["count"] >= state["max_blocks"]:
                     return all_blocks
-                all_blocks.append(block)
                 state["count"] += 1
+                if text_collector is not None:
+                    self._collect_block_text(text_collector, block)
+                    if recursive and block.get("has_children", False):
+                        self._get_all_blocks_recursive(
+                            block["id"],
+                            recursive=True,
+                            depth=depth + 1,
+                            state=state,
+                            should_cancel=should_cancel,
+                            block_cache=block_cache,
+                            last_edited_time=block.get("last_edited_time"),
+                            text_collector=text_collector,
+                        )
+                    continue
+                all_blocks.append(block)
                 
                 # If block has children and recursive is enabled, fetch them
                 if recursive and block.get("has_children", False):
@@ -290,74 +392,278 @@ class NotionService:
                         depth=depth + 1,
                         state=state,
                         should_cancel=should_cancel,
+                        block_cache=block_cache,
+                        last_edited_time=block.get("last_edited_time"),
                     )
                     # Add children to the block
                     block["children"] = child_blocks
                     all_blocks.extend(child_blocks)
-            
-            has_more = response.get("has_more", False)
-            start_cursor = response.get("next_cursor")
         
         return all_blocks
+
+    def _iter_block_children_pages(
+        self,
+        block_id: str,
+        last_edited_time: Optional[str] = None,
+        block_cache=None,
+        should_cancel=None,
+    ) -> Generator[list[Dict[str, Any]], None, None]:
+        """
+        Yield pages of a block's children, from `block_cache` while its entry is current.
+
+        A fully consumed API listing is written back to the cache; a traversal that
+        stops early (max_blocks) leaves the entry untouched.
+        """
+        if block_cache is not None:
+            cached = block_cache.get(block_id, last_edited_time)
+            if cached is not None:
+                yield cached
+                return
+
+        # Pages are only accumulated when the listing will be cached (the cache needs an edit time).
+        fetched = [] if block_cache is not None and last_edited_time else None
+        has_more = True
+        start_cursor = None
+        while has_more:
+            if callable(should_cancel) and should_cancel():
+                raise NotionSyncCancelled("Cancellation requested while paginating blocks.")
+            response = self.list_block_children(
+                block_id=block_id,
+                page_size=100,
+                start_cursor=start_cursor
+            )
+            blocks = response.get("results", [])
+            if fetched is not None:
+                fetched.extend(blocks)
+            yield blocks
+            has_more = response.get("has_more", False)
+            start_cursor = response.get("next_cursor")
+
+        if fetched is not None:
+            block_cache.put(block_id, last_edited_time, fetched)
     
+    def _list_all_block_children(self, block_id: str, cancel_event: threading.Event) -> list[Dict[str, Any]]:
+        """
+        Fetch every page of children for a single block.
+        """
+        children = []
+        start_cursor = None
+        while True:
+            if cancel_event.is_set():
+                raise NotionSyncCancelled("Cancellation requested while paginating blocks.")
+            response = self.list_block_children(block_id=block_id, page_size=100, start_cursor=start_cursor)
+            children.extend(response.get("results", []))
+            start_cursor = response.get("next_cursor")
+            if not response.get("has_more", False) or not start_cursor:
+                return children
+
+    def _get_all_blocks_concurrent(
+        self,
+        page_id: str,
+        state: Dict[str, Any],
+        concurrency: int,
+        should_cancel=None,
+        block_cache=None,
+        last_edited_time: Optional[str] = None,
+        text_collector: Optional[PageTextCollector] = None,
+    ) -> list[Dict[str, Any]]:
+        """
+        Fetch the block tree in parallel waves and assemble it in depth-first order.
+
+        Each wave lays the tree out in the same order as `_get_all_blocks_recursive`
+        using the children fetched so far, then concurrently fetches the first
+        still-unknown subtrees (at most `concurrency`, and only those that can still
+        start inside the `max_blocks` window). Output (order, truncation, duplicate and
+        depth handling) matches the serial traversal.
+        Subtrees still current in `block_cache` are not fetched. With `text_collector`,
+        fetched children are reduced to their text right away and the text is
+        added there in traversal order instead of returning blocks.
+        """
+        children_by_id: Dict[str, list[Dict[str, Any]]] = {}
+        edited_by_id: Dict[str, Optional[str]] = {page_id: last_edited_time}
+        cache_checked: set[str] = set()
+        cancel_event = threading.Event()
+
+        def remember(block_id: str, children: list[Dict[str, Any]]) -> None:
+            for child in children:
+                edited_by_id.setdefault(child.get("id"), child.get("last_edited_time"))
+            if text_collector is not None:
+                children = [
+                    {
+                        "id": child.get("id"),
+                        "has_children": child.get("has_children", False),
+                        "text_parts": self._extract_block_text_parts(child),
+                        "heading_level": HEADING_LEVELS.get(child.get("type"), 0),
+                    }
+                    for child in children
+                ]
+            children_by_id[block_id] = children
+
+        def layout(pending: Optional[list[str]]) -> list[Dict[str, Any]]:
+            # With `pending` set this is a planning pass: missing subtrees are collected
+            # and treated as empty; otherwise the final tree is built in place.
+            visited = set(state["visited_block_ids"])
+            counter = {"count": 0}
+
+            def expand(block_id: str, depth: int) -> list[Dict[str, Any]]:
+                if block_id in visited:
+                    return []
+                visited.add(block_id)
+                if depth > state["max_depth"]:
+                    return []
+                if block_id not in children_by_id:
+                    if pending is not None:
+                        pending.append((block_id, counter["count"]))
+                    return []
+
+                blocks = []
+                for block in children_by_id[block_id]:
+                    if counter["count"] >= state["max_blocks"]:
+                        return blocks
+                    blocks.append(block)
+                    counter["count"] += 1
+                    if block.get("has_children", False):
+                        child_blocks = expand(block["id"], depth + 1)
+                        if pending is None:
+                            block["children"] = child_blocks
+                        blocks.extend(child_blocks)
+                return blocks
+
+            blocks = expand(page_id, 0)
+            if pending is None:
+                state["visited_block_ids"] = visited
+                state["count"] = counter["count"]
+            return blocks
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="notion-blocks") as executor:
+            while True:
+                if callable(should_cancel) and should_cancel():
+                    raise NotionSyncCancelled("Cancellation requested while traversing blocks.")
+                pending: list[tuple[str, int]] = []
+                layout(pending)
+                if block_cache is not None:
+                    cache_hit = False
+                    for block_id, _ in pending:
+                        if block_id in cache_checked:
+                            continue
+                        cache_checked.add(block_id)
+                        cached = block_cache.get(block_id, edited_by_id.get(block_id))
+                        if cached is not None:
+                            remember(block_id, cached)
+                            cache_hit = True
+                    if cache_hit:
+                        # Cached subtrees can open up new blocks in the window; re-plan first.
+                        continue
+                if not pending:
+                    break
+
+                # `slot` is how many blocks precede the subtree in the window. Every subtree
+                # fetched earlier in the wave adds at least one block ahead of it, so stop
+                # once a subtree could no longer start inside `max_blocks`; the rest are
+                # re-planned after this wave.
+                wave = [
+                    block_id
+                    for position, (block_id, slot) in enumerate(pending[:concurrency])
+                    if position == 0 or slot + position < state["max_blocks"]
+                ]
+
+                futures = {
+                    executor.submit(self._list_all_block_children, block_id, cancel_event): block_id
+                    for block_id in wave
+                }
+                try:
+                    not_done = set(futures)
+                    while not_done:
+                        done, not_done = wait(not_done, timeout=1, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            block_id = futures[future]
+                            children = future.result()
+                            remember(block_id, children)
+                            if block_cache is not None:
+                                block_cache.put(block_id, edited_by_id.get(block_id), children)
+                        if not_done and callable(should_cancel) and should_cancel():
+                            raise NotionSyncCancelled("Cancellation requested while traversing blocks.")
+                except BaseException:
+                    cancel_event.set()
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        blocks = layout(None)
+        if text_collector is None:
+            return blocks
+        for block in blocks:
+            text_collector.add(block["text_parts"], block["heading_level"])
+        return []
+
     def _extract_text_from_blocks(self, blocks: list[Dict[str, Any]]) -> str:
         """
         Extract plain text and linkable resource references from Notion blocks.
         """
         text_parts = []
-        
         for block in blocks:
-            block_type = block.get("type")
-            if not block_type:
-                continue
-            
-            block_content = block.get(block_type) or {}
-            if not isinstance(block_content, dict):
-                block_content = {}
-            
-            # Extract text from rich text arrays
-            if "rich_text" in block_content:
-                for text_obj in block_content["rich_text"]:
-                    if not isinstance(text_obj, dict):
-                        continue
-
-                    text_payload = text_obj.get("text") or {}
-                    if not isinstance(text_payload, dict):
-                        text_payload = {}
-
-                    plain_text = text_obj.get("plain_text") or text_payload.get("content", "")
-                    if plain_text:
-                        text_parts.append(plain_text)
-
-                    # Preserve inline links so downstream retrieval can cite external URLs.
-                    link_payload = text_payload.get("link") or {}
-                    if not isinstance(link_payload, dict):
-                        link_payload = {}
-                    href = text_obj.get("href") or link_payload.get("url")
-                    if href:
-                        text_parts.append(f"[Link] {href}")
-            
-            # Handle special block types
-            elif block_type == "child_page":
-                text_parts.append(f"[Child Page: {block_content.get('title', '')}]")
-            
-            elif block_type == "child_database":
-                text_parts.append(f"[Child Database: {block_content.get('title', '')}]")
-
-            # Preserve URLs from external resources (images/files/embeds/bookmarks/etc).
-            resource_url = self._extract_block_url(block_type, block_content)
-            if resource_url:
-                text_parts.append(f"[{block_type} URL] {resource_url}")
-
-            # Include captions where available (common on image/file/media blocks).
-            caption_parts = block_content.get("caption", [])
-            if caption_parts:
-                caption_text = " ".join(part.get("plain_text", "") for part in caption_parts).strip()
-                if caption_text:
-                    text_parts.append(f"[{block_type} Caption] {caption_text}")
-        
+            text_parts.extend(self._extract_block_text_parts(block))
         return "\n".join(text_parts)
 
+    def _collect_block_text(self, collector: PageTextCollector, block: Dict[str, Any]) -> None:
+        collector.add(self._extract_block_text_parts(block), HEADING_LEVELS.get(block.get("type"), 0))
+
+    def _extract_block_text_parts(self, block: Dict[str, Any]) -> list[str]:
+        """
+        Text lines contributed by a single block (its children are extracted separately).
+        """
+        text_parts = []
+        block_type = block.get("type")
+        if not block_type:
+            return text_parts
+
+        block_content = block.get(block_type) or {}
+        if not isinstance(block_content, dict):
+            block_content = {}
+
+        # Extract text from rich text arrays
+        if "rich_text" in block_content:
+            for text_obj in block_content["rich_text"]:
+                if not isinstance(text_obj, dict):
+                    continue
+
+                text_payload = text_obj.get("text") or {}
+                if not isinstance(text_payload, dict):
+                    text_payload = {}
+
+                plain_text = text_obj.get("plain_text") or text_payload.get("content", "")
+                if plain_text:
+                    text_parts.append(plain_text)
+
+                # Preserve inline links so downstream retrieval can cite external URLs.
+                link_payload = text_payload.get("link") or {}
+                if not isinstance(link_payload, dict):
+                    link_payload = {}
+                href = text_obj.get("href") or link_payload.get("url")
+                if href:
+                    text_parts.append(f"[Link] {href}")
+
+        # Handle special block types
+        elif block_type == "child_page":
+            text_parts.append(f"[Child Page: {block_content.get('title', '')}]")
+
+        elif block_type == "child_database":
+            text_parts.append(f"[Child Database: {block_content.get('title', '')}]")
+
+        # Preserve URLs from external resources (images/files/embeds/bookmarks/etc).
+        resource_url = self._extract_block_url(block_type, block_content)
+        if resource_url:
+            text_parts.append(f"[{block_type} URL] {resource_url}")
+
+        # Include captions where available (common on image/file/media blocks).
+        caption_parts = block_content.get("caption", [])
+        if caption_parts:
+            caption_text = " ".join(part.get("plain_text", "") for part in caption_parts).strip()
+            if caption_text:
+                text_parts.append(f"[{block_type} Caption] {caption_text}")
+
+        return text_parts
+
     @staticmethod
     def _extract_block_url(block_type: str, block_content: Dict[str, Any]) -> str:
         """
@@ -489,12 +795,16 @@ class NotionService:
         filter_type: Optional[str] = None,
         page_size: int = 100,
         should_cancel=None,
+        start_cursor: Optional[str] = None,
+        on_page=None,
     ) -> Generator[Dict[str, Any], None, None]:
         """
         Iterate all Notion search results using cursor pagination.
+
+        `start_cursor` resumes a previous iteration. `on_page(next_cursor)` is called
+        once every result of a page has been consumed, with None after the last page.
         """
         logger = logging.getLogger(__name__)
-        start_cursor: Optional[str] = None
         seen_cursors: set[str] = set()
 
         while True:
@@ -509,9 +819,9 @@ class NotionService:
             for result in response.get("results", []):
                 yield result
 
-            if not response.get("has_more"):
-                break
-            next_cursor = response.get("next_cursor")
+            next_cursor = response.get("next_cursor") if response.get("has_more") else None
+            if callable(on_page):
+                on_page(next_cursor)
             if not next_cursor:
                 break
             if next_cursor in seen_cursors:
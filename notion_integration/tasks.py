@@ -0,0 +1,14 @@
+"""
+Celery tasks for Notion background jobs.
+"""
+from celery import shared_task
+
+from .api_views import _run_sync_job_worker
+
+
+@shared_task(ignore_result=True)
+def run_notion_sync_job(job_id: str) -> None:
+    """
+    Run a queued NotionSyncJob (sync and optional RAG ingest) on a Celery worker.
+    """
+    _run_sync_job_worker(job_id)
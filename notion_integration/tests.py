@@ -1,15 +1,40 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+import threading
 from unittest import mock
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase, SimpleTestCase
+from django.db import connection
+from django.db.utils import ConnectionHandler
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from django.urls import reverse
 import requests
 from django.utils import timezone
 
-from .models import NotionContent, NotionSyncJob
-from .services import NotionService
-from .api_views import _run_sync_job_worker
+from .benchmark import BenchmarkConfig, run_benchmark
+from .block_cache import NotionPageBlockCache
+from .models import (
+    NotionBlockChildren,
+    NotionContent,
+    NotionDatabaseMirror,
+    NotionDatabaseRow,
+    NotionSyncJob,
+    NotionSyncJobEvent,
+    NotionSyncWatermark,
+)
+from .search import filter_search_matches
+from .sections import split_notion_sections
+from .services import NotionService, PageTextCollector
+from . import rate_limit
+from .api_views import (
+    SyncCancelToken,
+    SyncProgressRecorder,
+    _run_notion_rag_ingest,
+    _run_notion_sync,
+    _run_sync_job_worker,
+    _sync_database_rows,
+)
 from .apps import reconcile_stale_sync_jobs
 
 
@@ -37,6 +62,61 @@ class NotionAPITestCase(TestCase):
         self.assertEqual(response.json()["results"][0]["id"], "page-123")
         search_mock.assert_called_once()
 
+    @mock.patch("notion_integration.api_views.NotionService.search")
+    def test_local_search_serves_synced_content_with_snippets(self, search_mock):
+        NotionContent.objects.create(
+            notion_id="page-1",
+            object_type="page",
+            title="Water heater install",
+            plain_text="Checklist before the plumbing inspection: shut off gas and water.",
+        )
+        NotionContent.objects.create(notion_id="page-2", object_type="page", title="Roofing", plain_text="Shingles")
+        NotionContent.objects.create(
+            notion_id="page-3", object_type="page", title="Old plumbing notes", plain_text="", is_archived=True
+        )
+
+        self.client.force_authenticate(self.user)
+        url = reverse("notion:api-search")
+        response = self.client.get(url, {"q": "plumbing", "mode": "local"})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["mode"], "local")
+        self.assertEqual([result["notion_id"] for result in payload["results"]], ["page-1"])
+        self.assertIn("<mark>plumbing</mark>", payload["results"][0]["snippet"])
+        search_mock.assert_not_called()
+
+    def test_local_search_escapes_page_text_in_snippets(self):
+        NotionContent.objects.create(
+            notion_id="page-xss",
+            object_type="page",
+            title="Plumbing",
+            plain_text='See <img src=x onerror="alert(1)"> before plumbing & heating.',
+        )
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("notion:api-search"), {"q": "plumbing", "mode": "local"})
+
+        snippet = response.json()["results"][0]["snippet"]
+        self.assertNotIn("<img", snippet)
+        self.assertIn("&lt;img src=x onerror=&quot;alert(1)&quot;&gt;", snippet)
+        self.assertIn("<mark>plumbing</mark> &amp; heating", snippet)
+
+    def test_postgres_title_match_uses_trigram_indexable_operator(self):
+        # ILIKE compiles to UPPER("title"::text), which the gin_trgm_ops index on title cannot serve.
+        postgres = ConnectionHandler({"default": {"ENGINE": "django.db.backends.postgresql", "NAME": "notion"}})
+        with mock.patch("notion_integration.search.supports_full_text", return_value=True):
+            queryset = filter_search_matches(NotionContent.objects.all(), "hand")
+        sql, _ = queryset.query.get_compiler(connection=postgres["default"]).as_sql()
+
+        self.assertIn('"notion_integration_notioncontent"."title" %%> %s', sql)
+        self.assertNotIn("UPPER", sql)
+
+    def test_search_rejects_unknown_mode(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("notion:api-search"), {"q": "x", "mode": "fuzzy"})
+        self.assertEqual(response.status_code, 400)
+
     @mock.patch("notion_integration.api_views.NotionService.retrieve_page")
     def test_page_detail(self, retrieve_mock):
         retrieve_mock.return_value = {"id": "page-123", "object": "page"}
@@ -59,6 +139,102 @@ class NotionAPITestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()["results"][0]["id"], "block-1")
 
+    @mock.patch("notion_integration.api_views.NotionService")
+    def test_page_content_mirror_serves_fresh_copy_with_etag(self, notion_service_cls):
+        NotionContent.objects.create(
+            notion_id="page-123",
+            object_type="page",
+            title="Mirrored",
+            plain_text="stored text",
+            last_edited_time=datetime(2026, 3, 2, 12, 0, tzinfo=dt_timezone.utc),
+            mirror_validated_at=timezone.now(),
+        )
+
+        self.client.force_authenticate(self.user)
+        url = reverse("notion:api-page-content", args=["page-123"])
+        response = self.client.get(url, {"source": "mirror"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["text_content"], "stored text")
+        self.assertEqual(response["X-Notion-Mirror"], "hit")
+        notion_service_cls.assert_not_called()
+
+        response = self.client.get(url, {"source": "mirror"}, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    @mock.patch("notion_integration.api_views.NotionService")
+    def test_page_content_mirror_validates_then_refetches_changed_page(self, notion_service_cls):
+        edited = "2026-03-02T12:00:00.000Z"
+        NotionContent.objects.create(
+            notion_id="page-123",
+            object_type="page",
+            title="Mirrored",
+            plain_text="stored text",
+            last_edited_time=datetime(2026, 3, 2, 12, 0, tzinfo=dt_timezone.utc),
+        )
+        notion = notion_service_cls.return_value
+        notion.retrieve_page.return_value = {"id": "page-123", "last_edited_time": edited, "archived": False}
+
+        self.client.force_authenticate(self.user)
+        url = reverse("notion:api-page-content", args=["page-123"])
+        response = self.client.get(url, {"source": "mirror", "max_age": 0})
+
+        self.assertEqual(response["X-Notion-Mirror"], "validated")
+        notion.get_page_content.assert_not_called()
+
+        notion.retrieve_page.return_value = {"id": "page-123", "last_edited_time": "2026-03-03T08:00:00.000Z"}
+        notion.get_page_content.return_value = {
+            "metadata": {"id": "page-123", "last_edited_time": "2026-03-03T08:00:00.000Z", "archived": False},
+            "text_content": "fresh text",
+            "headings": [],
+        }
+        notion.extract_title.return_value = "Mirrored"
+        notion.extract_parent_info.return_value = ("workspace", "workspace")
+        response = self.client.get(url, {"source": "mirror", "max_age": 0})
+
+        self.assertEqual(response["X-Notion-Mirror"], "miss")
+        self.assertEqual(response.json()["text_content"], "fresh text")
+        self.assertEqual(NotionContent.objects.get(notion_id="page-123").plain_text, "fresh text")
+
+    @mock.patch("notion_integration.api_views.NotionService")
+    def test_page_content_mirror_ignores_local_writes_when_judging_freshness(self, notion_service_cls):
+        row = NotionContent.objects.create(
+            notion_id="page-123",
+            object_type="page",
+            title="Mirrored",
+            plain_text="stored text",
+            last_edited_time=datetime(2026, 3, 2, 12, 0, tzinfo=dt_timezone.utc),
+            mirror_validated_at=timezone.now() - timedelta(hours=1),
+        )
+        # The RAG ingest records its result without re-validating the mirror.
+        row.rag_document_id = "doc-1"
+        row.save(update_fields=["rag_document_id", "synced_at"])
+        notion = notion_service_cls.return_value
+        notion.retrieve_page.return_value = {"id": "page-123", "last_edited_time": "2026-03-02T12:00:00.000Z"}
+
+        self.client.force_authenticate(self.user)
+        url = reverse("notion:api-page-content", args=["page-123"])
+        response = self.client.get(url, {"source": "mirror"})
+
+        self.assertEqual(response["X-Notion-Mirror"], "validated")
+        notion.retrieve_page.assert_called_once_with("page-123")
+
+    @mock.patch("notion_integration.api_views.NotionService")
+    def test_page_mirror_rejects_database_ids(self, notion_service_cls):
+        NotionContent.objects.create(notion_id="db-1", object_type="database", title="Tasks")
+        not_a_page = mock.Mock(status_code=400)
+        not_a_page.json.return_value = {"message": "Provided ID db-2 is a database, not a page."}
+        notion_service_cls.return_value.get_page_content.side_effect = requests.HTTPError(response=not_a_page)
+
+        self.client.force_authenticate(self.user)
+        mirrored = self.client.get(reverse("notion:api-page-content", args=["db-1"]), {"source": "mirror"})
+        unknown = self.client.get(reverse("notion:api-page-content", args=["db-2"]), {"source": "mirror"})
+
+        self.assertEqual(mirrored.status_code, 400)
+        self.assertIn("database", mirrored.json()["error"])
+        self.assertEqual(unknown.status_code, 400)
+        self.assertEqual(unknown.json()["error"], "Provided ID db-2 is a database, not a page.")
+
     def test_sync_requires_authentication(self):
         url = reverse("notion:api-sync")
         response = self.client.post(url)
@@ -91,6 +267,11 @@ class NotionAPITestCase(TestCase):
         response = self.client.post(url)
         self.assertEqual(response.status_code, 403)
 
+    def test_rate_limit_metrics_requires_authentication(self):
+        url = reverse("notion:api-rate-limit")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 403)
+
     def test_ingest_rag_requires_authentication(self):
         url = reverse("notion:api-ingest-rag")
         response = self.client.post(url)
@@ -146,6 +327,130 @@ class NotionAPITestCase(TestCase):
         self.assertEqual(payload["processed"], 2)
         self.assertEqual(NotionContent.objects.count(), 2)
 
+    @mock.patch("notion_integration.api_views.SYNC_UPSERT_BATCH_SIZE", 2)
+    @mock.patch("notion_integration.api_views.NotionService")
+    def test_sync_bulk_upserts_and_counts_created_and_updated(self, notion_service_cls):
+        NotionContent.objects.create(notion_id="page-2", object_type="page", title="Old title", plain_text="old")
+        notion = notion_service_cls.return_value
+        notion.iterate_search_results.side_effect = [
+            [{"id": f"page-{index}", "object": "page"} for index in range(1, 4)],
+            [],
+        ]
+        notion.get_page_content.side_effect = lambda notion_id, **kwargs: {
+            "metadata": {"id": notion_id, "url": f"https://notion.so/{notion_id}"},
+            "text_content": f"text for {notion_id}",
+        }
+        notion.extract_title.side_effect = lambda obj: f"Title {obj.get('id')}"
+        notion.extract_parent_info.return_value = ("workspace", "workspace")
+
+        self.client.force_authenticate(self.user)
+        url = reverse("notion:api-sync")
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["processed"], 3)
+        self.assertEqual(payload["created"], 2)
+        self.assertEqual(payload["updated"], 1)
+        self.assertEqual(NotionContent.objects.count(), 3)
+        row = NotionContent.objects.get(notion_id="page-2")
+        self.assertEqual(row.title, "Title page-2")
+        self.assertEqual(row.plain_text, "text for page-2")
+        self.assertEqual(row.content_fingerprint, row.compute_content_hash())
+
+    @mock.patch("notion_integration.api_views.NotionService")
+    def test_sync_fetches_while_discovery_is_running_and_dedups(self, notion_service_cls):
+        first_fetched = threading.Event()
+        notion = notion_service_cls.return_value
+
+        def iterate(query, filter_type, should_cancel, start_cursor, on_page):
+            if filter_type != "page":
+                return
+            yield {"id": "page-1", "object": "page"}
+            # The consumer must fetch page-1 before discovery moves on.
+            self.assertTrue(first_fetched.wait(timeout=5))
+            yield {"id": "page-1", "object": "page"}
+            yield {"id": "page-2", "object": "page"}
+
+        def get_page_content(page_id, **kwargs):
+            first_fetched.set()
+            return {"metadata": {"id": page_id}, "text_content": f"text for {page_id}"}
+
+        notion.iterate_search_results.side_effect = iterate
+        notion.get_page_content.side_effect = get_page_content
+        notion.extract_title.return_value = "Page"
+        notion.extract_parent_info.return_value = ("workspace", "workspace")
+
+        self.client.force_authenticate(self.user)
+        response = self.client.post(reverse("notion:api-sync"))
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["processed"], 2)
+        self.assertEqual(payload["total_discovered"], 2)
+        fetched = [call.args[0] for call in notion.get_page_content.call_args_list]
+        self.assertEqual(fetched, ["page-1", "page-2"])
+
+    @mock.patch("notion_integration.api_views.NotionService")
+    def test_incremental_sync_skips_unchanged_and_stops_at_watermark(self, notion_service_cls):
+        NotionContent.objects.create(
+            notion_id="page-same",
+            object_type="page",
+            title="Same",
+            last_edited_time=datetime(2026, 3, 2, 12, 0, tzinfo=dt_timezone.utc),
+        )
+        NotionSyncWatermark.objects.create(
+            object_type="page",
+            last_edited_time=datetime(2026, 3, 2, 12, 0, tzinfo=dt_timezone.utc),
+        )
+        notion = notion_service_cls.return_value
+        notion.iterate_search_results.side_effect = [
+            [
+                {"id": "page-new", "object": "page", "last_edited_time": "2026-03-05T09:00:00.000Z"},
+                {"id": "page-same", "object": "page", "last_edited_time": "2026-03-02T12:00:00.000Z"},
+                {"id": "page-old", "object": "page", "last_edited_time": "2026-02-01T00:00:00.000Z"},
+            ],
+            [],
+        ]
+        notion.get_page_content.return_value = {
+            "metadata": {"id": "page-new", "last_edited_time": "2026-03-05T09:00:00.000Z"},
+            "text_content": "new text",
+        }
+        notion.extract_title.return_value = "New"
+        notion.extract_parent_info.return_value = ("workspace", "workspace")
+
+        self.client.force_authenticate(self.user)
+        url = reverse("notion:api-sync")
+        response = self.client.post(f"{url}?incremental=true")
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["processed"], 1)
+        self.assertEqual(payload["skipped_unchanged"], 1)
+        self.assertEqual(payload["total_discovered"], 2)
+        notion.get_page_content.assert_called_once()
+        self.assertEqual(notion.get_page_content.call_args.args[0], "page-new")
+        watermark = NotionSyncWatermark.objects.get(object_type="page")
+        self.assertEqual(watermark.last_edited_time, datetime(2026, 3, 5, 9, 0, tzinfo=dt_timezone.utc))
+
+    @mock.patch("notion_integration.api_views.NotionService")
+    def test_sync_with_max_items_does_not_advance_watermark(self, notion_service_cls):
+        notion = notion_service_cls.return_value
+        notion.iterate_search_results.side_effect = [
+            [{"id": "page-1", "object": "page", "last_edited_time": "2026-03-05T09:00:00.000Z"}],
+            [],
+        ]
+        notion.get_page_content.return_value = {"metadata": {"id": "page-1"}, "text_content": "text"}
+        notion.extract_title.return_value = "Page"
+        notion.extract_parent_info.return_value = ("workspace", "workspace")
+
+        self.client.force_authenticate(self.user)
+        url = reverse("notion:api-sync")
+        response = self.client.post(f"{url}?max_items=1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(NotionSyncWatermark.objects.exists())
+
     @mock.patch("notion_integration.api_views.threading.Thread")
     def test_sync_async_creates_job(self, thread_mock):
         self.client.force_authenticate(self.user)
@@ -174,6 +479,164 @@ class NotionAPITestCase(TestCase):
         self.assertTrue(job.parameters.get("skip_sync_fetch"))
         thread_mock.assert_called_once()
 
+    @override_settings(CELERY_BROKER_URL="redis://localhost:6379/0")
+    @mock.patch("notion_integration.tasks.run_notion_sync_job.delay")
+    @mock.patch("notion_integration.api_views.threading.Thread")
+    def test_sync_async_dispatches_to_celery_when_broker_configured(self, thread_mock, delay_mock):
+        self.client.force_authenticate(self.user)
+        url = reverse("notion:api-sync-async")
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, 202)
+        job = NotionSyncJob.objects.get(job_id=response.json()["job_id"])
+        self.assertEqual(job.executor, NotionSyncJob.EXECUTOR_CELERY)
+        delay_mock.assert_called_once_with(job.job_id)
+        thread_mock.assert_not_called()
+
+    @override_settings(CELERY_BROKER_URL="redis://localhost:6379/0")
+    @mock.patch("notion_integration.tasks.run_notion_sync_job.delay", side_effect=ConnectionError("broker down"))
+    @mock.patch("notion_integration.api_views.threading.Thread")
+    def test_sync_async_falls_back_to_thread_when_broker_unavailable(self, thread_mock, delay_mock):
+        self.client.force_authenticate(self.user)
+        url = reverse("notion:api-sync-async")
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, 202)
+        job = NotionSyncJob.objects.get(job_id=response.json()["job_id"])
+        self.assertEqual(job.executor, NotionSyncJob.EXECUTOR_THREAD)
+        thread_mock.assert_called_once()
+
+    @mock.patch("notion_integration.api_views.threading.Thread")
+    def test_sync_async_coalesces_requests_behind_running_crawl(self, thread_mock):
+        running = NotionSyncJob.objects.create(
+            job_id="job-running", created_by=self.user, status=NotionSyncJob.STATUS_RUNNING
+        )
+        other = get_user_model().objects.create_user(username="other-admin", password="password")
+        url = reverse("notion:api-sync-async")
+
+        self.client.force_authenticate(self.user)
+        first = self.client.post(url).json()
+        self.client.force_authenticate(other)
+        second = self.client.post(url).json()
+
+        self.assertEqual(first["outcome"], "queued_follow_up")
+        self.assertEqual(first["follow_up_of"], running.job_id)
+        follow_up = NotionSyncJob.objects.get(job_id=first["job_id"])
+        self.assertTrue(follow_up.parameters["incremental"])
+        self.assertEqual(second["outcome"], "attached")
+        self.assertEqual(second["job_id"], follow_up.job_id)
+        self.assertEqual(NotionSyncJob.objects.count(), 2)
+        thread_mock.assert_not_called()
+
+        status_url = reverse("notion:api-sync-job-status", args=[follow_up.job_id])
+        self.assertEqual(self.client.get(status_url).status_code, 200)
+
+        attach = self.client.post(f"{url}?on_conflict=attach").json()
+        self.assertEqual(attach["outcome"], "attached")
+        self.assertEqual(attach["job_id"], follow_up.job_id)
+
+    @mock.patch("notion_integration.api_views.threading.Thread")
+    def test_sync_async_fails_crawl_whose_lease_expired(self, thread_mock):
+        killed = NotionSyncJob.objects.create(
+            job_id="job-killed",
+            created_by=self.user,
+            status=NotionSyncJob.STATUS_RUNNING,
+            executor=NotionSyncJob.EXECUTOR_CELERY,
+            lease_owner="dead-worker",
+            heartbeat_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.client.force_authenticate(self.user)
+        response = self.client.post(reverse("notion:api-sync-async")).json()
+
+        self.assertEqual(response["outcome"], "started")
+        self.assertNotEqual(response["job_id"], killed.job_id)
+        killed.refresh_from_db()
+        self.assertEqual(killed.status, NotionSyncJob.STATUS_FAILED)
+        self.assertIsNotNone(killed.finished_at)
+        self.assertIn("lease expired", killed.error_message)
+        thread_mock.assert_called_once()
+
+    @mock.patch("notion_integration.api_views.threading.Thread")
+    @mock.patch("notion_integration.api_views._run_notion_sync")
+    def test_worker_dispatches_follow_up_when_crawl_finishes(self, sync_mock, thread_mock):
+        sync_mock.return_value = {"success": True, "canceled": False}
+        running = NotionSyncJob.objects.create(
+            job_id="job-crawl", created_by=self.user, status=NotionSyncJob.STATUS_QUEUED, parameters={}
+        )
+        follow_up = NotionSyncJob.objects.create(
+            job_id="job-follow-up",
+            created_by=self.user,
+            status=NotionSyncJob.STATUS_QUEUED,
+            parameters={"incremental": True, "follow_up_of": running.job_id},
+        )
+
+        _run_sync_job_worker(follow_up.job_id)
+        follow_up.refresh_from_db()
+        self.assertEqual(follow_up.status, NotionSyncJob.STATUS_QUEUED)
+
+        _run_sync_job_worker(running.job_id)
+
+        running.refresh_from_db()
+        follow_up.refresh_from_db()
+        self.assertEqual(running.status, NotionSyncJob.STATUS_SUCCEEDED)
+        self.assertNotIn("follow_up_of", follow_up.parameters)
+        self.assertEqual(thread_mock.call_args.kwargs["args"], (follow_up.job_id,))
+
+    @mock.patch("notion_integration.api_views._run_notion_sync")
+    def test_worker_ignores_already_finished_job(self, sync_mock):
+        job = NotionSyncJob.objects.create(
+            job_id="job-redelivered",
+            created_by=self.user,
+            status=NotionSyncJob.STATUS_SUCCEEDED,
+            finished_at=timezone.now(),
+        )
+
+        _run_sync_job_worker(job.job_id)
+
+        sync_mock.assert_not_called()
+        job.refresh_from_db()
+        self.assertEqual(job.status, NotionSyncJob.STATUS_SUCCEEDED)
+
+    @mock.patch("notion_integration.api_views._run_notion_sync")
+    def test_redelivered_job_waits_for_live_lease_and_takes_over_expired_one(self, sync_mock):
+        sync_mock.return_value = {"success": True, "canceled": False}
+        job = NotionSyncJob.objects.create(
+            job_id="job-leased",
+            created_by=self.user,
+            status=NotionSyncJob.STATUS_RUNNING,
+            lease_owner="first-worker",
+            heartbeat_at=timezone.now(),
+        )
+
+        _run_sync_job_worker(job.job_id)
+        sync_mock.assert_not_called()
+
+        NotionSyncJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        _run_sync_job_worker(job.job_id)
+
+        sync_mock.assert_called_once()
+        job.refresh_from_db()
+        self.assertEqual(job.status, NotionSyncJob.STATUS_SUCCEEDED)
+        self.assertNotEqual(job.lease_owner, "first-worker")
+
+    @mock.patch("notion_integration.api_views._run_notion_sync")
+    def test_worker_that_lost_its_lease_does_not_write_the_job(self, sync_mock):
+        job = NotionSyncJob.objects.create(job_id="job-lost-lease", created_by=self.user)
+
+        def taken_over(params, user_label, record):
+            NotionSyncJob.objects.filter(pk=job.pk).update(lease_owner="second-worker", checkpoint={"stage": "fetch"})
+            params["_save_checkpoint"]({"stage": "discovery"})
+            return {"success": True, "canceled": False}
+
+        sync_mock.side_effect = taken_over
+        _run_sync_job_worker(job.job_id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, NotionSyncJob.STATUS_RUNNING)
+        self.assertEqual(job.checkpoint, {"stage": "fetch"})
+        self.assertIsNone(job.finished_at)
+
     def test_sync_job_status_owner_can_view(self):
         self.client.force_authenticate(self.user)
         job = NotionSyncJob.objects.create(
@@ -265,6 +728,170 @@ class NotionAPITestCase(TestCase):
         response = self.client.post(url)
         self.assertEqual(response.status_code, 409)
 
+    @mock.patch("notion_integration.api_views.NotionService")
+    def test_worker_resumes_from_checkpoint_and_retries_failed_items(self, notion_service_cls):
+        job = NotionSyncJob.objects.create(
+            job_id="job-worker-resume-1",
+            created_by=self.user,
+            status=NotionSyncJob.STATUS_QUEUED,
+            parameters={
+                "include_database_rows": False,
+                "max_items": None,
+                "recursive": True,
+                "max_blocks_per_page": 5000,
+                "max_depth": 20,
+                "auto_ingest": False,
+            },
+            checkpoint={
+                "stage": "discovery",
+                "discovery": {
+                    "page": {"cursor": "cursor-2", "offset": 1, "done": False},
+                    "database": {"cursor": None, "offset": 0, "done": False},
+                },
+                "failed": [{"id": "page-1", "object": "page"}],
+            },
+        )
+        notion = notion_service_cls.return_value
+        search_calls = []
+
+        def iterate(query, filter_type, should_cancel, start_cursor, on_page):
+            search_calls.append((filter_type, start_cursor))
+            if filter_type == "page":
+                # page-2 was fetched before the interruption; page-1 is rediscovered but retried first.
+                yield {"id": "page-2", "object": "page"}
+                yield {"id": "page-1", "object": "page"}
+                yield {"id": "page-3", "object": "page"}
+            on_page(None)
+
+        notion.iterate_search_results.side_effect = iterate
+        notion.get_page_content.side_effect = lambda page_id, **kwargs: {
+            "metadata": {"id": page_id},
+            "text_content": f"text for {page_id}",
+        }
+        notion.extract_title.return_value = "Page"
+        notion.extract_parent_info.return_value = ("workspace", "workspace")
+
+        _run_sync_job_worker(job.job_id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, NotionSyncJob.STATUS_SUCCEEDED)
+        self.assertEqual(search_calls, [("page", "cursor-2"), ("database", None)])
+        fetched = [call.args[0] for call in notion.get_page_content.call_args_list]
+        self.assertEqual(fetched, ["page-1", "page-3"])
+        self.assertEqual(job.result["processed"], 2)
+        self.assertEqual(job.checkpoint["stage"], "fetch")
+        self.assertTrue(all(state["done"] for state in job.checkpoint["discovery"].values()))
+        self.assertEqual(job.checkpoint["failed"], [])
+
+    @mock.patch("notion_integration.api_views.NotionService")
+    def test_sync_checkpoint_records_discovery_cursor(self, notion_service_cls):
+        notion = notion_service_cls.return_value
+
+        def iterate(query, filter_type, should_cancel, start_cursor, on_page):
+            if filter_type == "page":
+                yield {"id": "page-0", "object": "page"}
+                on_page("cursor-2")
+                yield {"id": "page-1", "object": "page"}
+                raise RuntimeError("boom")
+            return
+
+        notion.iterate_search_results.side_effect = iterate
+        notion.get_page_content.return_value = {"metadata": {"id": "page-1"}, "text_content": "text"}
+        notion.extract_title.return_value = "Page"
+        notion.extract_parent_info.return_value = ("workspace", "workspace")
+        saved = []
+        params = {
+            "include_database_rows": False,
+            "max_items": None,
+            "recursive": True,
+            "max_blocks_per_page": 5000,
+            "max_depth": 20,
+            "_save_checkpoint": saved.append,
+        }
+
+        with self.assertRaises(RuntimeError):
+            _run_notion_sync(params, "tester", lambda event, **fields: None)
+
+        checkpoint = saved[-1]
+        self.assertEqual(checkpoint["stage"], "discovery")
+        # Both items were fetched, so a resume continues after page-1 in the page that starts at cursor-2.
+        self.assertEqual(checkpoint["discovery"]["page"], {"cursor": "cursor-2", "offset": 1, "done": False})
+        self.assertEqual(checkpoint["discovery"]["database"], {"cursor": None, "offset": 0, "done": False})
+        self.assertEqual(checkpoint["failed"], [])
+        self.assertTrue(NotionContent.objects.filter(notion_id="page-1").exists())
+
+    @mock.patch("notion_integration.api_views.SYNC_DISCOVERY_BATCH_SIZE", 2)
+    @mock.patch("notion_integration.api_views.NotionService")
+    def test_incremental_sync_reads_stored_edit_times_per_batch(self, notion_service_cls):
+        edited = datetime(2026, 3, 2, 12, 0, tzinfo=dt_timezone.utc)
+        items = []
+        for index in range(5):
+            NotionContent.objects.create(notion_id=f"page-{index}", object_type="page", last_edited_time=edited)
+            items.append(
+                {"id": f"page-{index}", "object": "page", "url": "", "last_edited_time": "2026-03-02T12:00:00.000Z"}
+            )
+        NotionContent.objects.create(notion_id="page-elsewhere", object_type="page", last_edited_time=edited)
+        all_queued = threading.Event()
+
+        def iterate(query, filter_type, should_cancel, start_cursor, on_page):
+            if filter_type == "page":
+                yield from items
+            all_queued.set()
+
+        notion_service_cls.return_value.iterate_search_results.side_effect = iterate
+        params = {
+            "include_database_rows": False,
+            "max_items": None,
+            "recursive": True,
+            "max_blocks_per_page": 5000,
+            "max_depth": 20,
+            "incremental": True,
+            # Hold the coordinator until discovery has queued every item, so batches are deterministic.
+            "_should_cancel": lambda: not all_queued.wait(5),
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            result = _run_notion_sync(params, "tester", lambda event, **fields: None)
+
+        self.assertEqual(result["skipped_unchanged"], 5)
+        self.assertEqual(result["total_discovered"], 5)
+        lookups = [query["sql"] for query in queries if 'FROM "notion_integration_notioncontent"' in query["sql"]]
+        self.assertEqual(len(lookups), 3)
+        self.assertTrue(all(" IN (" in sql and "page-elsewhere" not in sql for sql in lookups))
+        notion_service_cls.return_value.get_page_content.assert_not_called()
+
+    @mock.patch("notion_integration.api_views.threading.Thread")
+    def test_sync_job_resume_creates_job_from_checkpoint(self, thread_mock):
+        self.client.force_authenticate(self.user)
+        job = NotionSyncJob.objects.create(
+            job_id="job-resume-1",
+            created_by=self.user,
+            status=NotionSyncJob.STATUS_FAILED,
+            parameters={"max_items": None},
+            checkpoint={"stage": "fetch", "discovery": {"page": {"cursor": "cursor-5", "offset": 3, "done": False}}},
+        )
+        url = reverse("notion:api-sync-job-resume", args=[job.job_id])
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, 202)
+        payload = response.json()
+        resumed = NotionSyncJob.objects.get(job_id=payload["job_id"])
+        self.assertEqual(resumed.parameters["resume_from_job_id"], job.job_id)
+        self.assertEqual(resumed.checkpoint, job.checkpoint)
+        thread_mock.assert_called_once()
+
+    def test_sync_job_resume_requires_failed_job_with_checkpoint(self):
+        self.client.force_authenticate(self.user)
+        job = NotionSyncJob.objects.create(
+            job_id="job-resume-succeeded-1",
+            created_by=self.user,
+            status=NotionSyncJob.STATUS_SUCCEEDED,
+            checkpoint={"stage": "fetch", "failed": []},
+        )
+        url = reverse("notion:api-sync-job-resume", args=[job.job_id])
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 409)
+
     @mock.patch("notion_integration.api_views._run_notion_sync")
     def test_worker_marks_canceled_when_sync_result_canceled(self, sync_mock):
         job = NotionSyncJob.objects.create(
@@ -331,6 +958,135 @@ class NotionAPITestCase(TestCase):
         self.assertIn("ingest_result", job.result)
         self.assertIsNotNone(job.finished_at)
 
+    @mock.patch("notion_integration.api_views.time.monotonic")
+    def test_cancel_token_polls_db_at_most_once_per_interval(self, monotonic_mock):
+        job = NotionSyncJob.objects.create(job_id="job-cancel-token", status=NotionSyncJob.STATUS_RUNNING)
+        monotonic_mock.return_value = 100.0
+        should_cancel = SyncCancelToken(job.pk, poll_seconds=1.0)
+
+        with self.assertNumQueries(1):
+            for _ in range(50):
+                self.assertFalse(should_cancel())
+
+        NotionSyncJob.objects.filter(pk=job.pk).update(cancel_requested=True)
+        self.assertFalse(should_cancel())
+
+        monotonic_mock.return_value = 101.5
+        self.assertTrue(should_cancel())
+        with self.assertNumQueries(0):
+            self.assertTrue(should_cancel())
+
+    def test_progress_recorder_buffers_item_events(self):
+        job = NotionSyncJob.objects.create(job_id="job-progress-buffer", created_by=self.user)
+        record = SyncProgressRecorder(job, flush_every=3, flush_seconds=3600)
+
+        record("item_started", notion_id="p1")
+        record("item_finished", notion_id="p1")
+        self.assertEqual(NotionSyncJobEvent.objects.filter(job=job).count(), 0)
+
+        record("item_started", notion_id="p2")
+        self.assertEqual(NotionSyncJobEvent.objects.filter(job=job).count(), 3)
+
+        record("item_started", notion_id="p3")
+        record("sync_finished", processed=3)
+        events = list(NotionSyncJobEvent.objects.filter(job=job).values_list("seq", "event"))
+        self.assertEqual([seq for seq, _ in events], [1, 2, 3, 4, 5])
+        self.assertEqual(events[-1][1], "sync_finished")
+
+    def test_progress_recorder_prune_keeps_newest_events(self):
+        job = NotionSyncJob.objects.create(job_id="job-progress-prune", created_by=self.user)
+        record = SyncProgressRecorder(job, flush_every=100, flush_seconds=3600)
+        for index in range(10):
+            record("item_finished", processed=index)
+
+        record.prune(keep=4)
+
+        self.assertEqual(list(job.events.values_list("seq", flat=True)), [7, 8, 9, 10])
+
+    def test_sync_job_status_reads_progress_tail_from_events(self):
+        self.client.force_authenticate(self.user)
+        job = NotionSyncJob.objects.create(job_id="job-progress-tail", created_by=self.user)
+        record = SyncProgressRecorder(job)
+        record("sync_started")
+        record("item_started", notion_id="p1")
+        record.flush()
+
+        url = reverse("notion:api-sync-job-status", args=[job.job_id])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        tail = response.json()["progress_tail"]
+        self.assertEqual([entry["event"] for entry in tail], ["sync_started", "item_started"])
+        self.assertEqual(tail[1]["notion_id"], "p1")
+
+    def test_sync_job_events_long_poll_returns_only_new_events(self):
+        self.client.force_authenticate(self.user)
+        job = NotionSyncJob.objects.create(
+            job_id="job-events-poll", created_by=self.user, status=NotionSyncJob.STATUS_RUNNING
+        )
+        record = SyncProgressRecorder(job)
+        record("sync_started")
+        record("item_started", notion_id="p1")
+        record("item_finished", notion_id="p1")
+        record.flush()
+
+        url = reverse("notion:api-sync-job-events", args=[job.job_id])
+        response = self.client.get(url, {"since": 1, "timeout": 0})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual([entry["seq"] for entry in payload["events"]], [2, 3])
+        self.assertEqual(payload["last_seq"], 3)
+        self.assertFalse(payload["done"])
+
+    def test_sync_job_events_stream_resumes_from_last_event_id(self):
+        self.client.force_authenticate(self.user)
+        job = NotionSyncJob.objects.create(
+            job_id="job-events-sse", created_by=self.user, status=NotionSyncJob.STATUS_SUCCEEDED
+        )
+        record = SyncProgressRecorder(job)
+        record("sync_started")
+        record("item_started", notion_id="p1")
+        record("sync_finished")
+        record.flush()
+
+        url = reverse("notion:api-sync-job-events", args=[job.job_id])
+        response = self.client.get(url, HTTP_ACCEPT="text/event-stream", HTTP_LAST_EVENT_ID="1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join(response.streaming_content).decode("utf-8")
+        self.assertNotIn("event: snapshot", body)
+        self.assertNotIn("id: 1\n", body)
+        self.assertIn('id: 2\nevent: progress\ndata: {"seq": 2', body)
+        self.assertIn("event: status", body)
+        self.assertTrue(body.rstrip().endswith('data: {"status": "succeeded"}'))
+
+    @mock.patch("notion_integration.api_views.SYNC_EVENT_STREAM_MAX_SECONDS", 0)
+    def test_sync_job_events_stream_closes_early_with_a_resumable_snapshot(self):
+        self.client.force_authenticate(self.user)
+        job = NotionSyncJob.objects.create(
+            job_id="job-events-short", created_by=self.user, status=NotionSyncJob.STATUS_RUNNING
+        )
+        record = SyncProgressRecorder(job)
+        record("sync_started")
+        record("item_started", notion_id="p1")
+        record.flush()
+
+        url = reverse("notion:api-sync-job-events", args=[job.job_id])
+        response = self.client.get(url, HTTP_ACCEPT="text/event-stream")
+        body = b"".join(response.streaming_content).decode("utf-8")
+
+        self.assertIn("id: 2\nevent: snapshot", body)
+        self.assertNotIn("event: end", body)
+
+    def test_sync_job_events_other_user_cannot_view(self):
+        other = get_user_model().objects.create_user(username="other-events", password="password")
+        job = NotionSyncJob.objects.create(job_id="job-events-private", created_by=other)
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("notion:api-sync-job-events", args=[job.job_id]))
+        self.assertEqual(response.status_code, 404)
+
     def test_reconcile_stale_sync_jobs_marks_running_and_queued_failed(self):
         stale_running = NotionSyncJob.objects.create(
             job_id="job-stale-running",
@@ -352,8 +1108,27 @@ class NotionAPITestCase(TestCase):
             finished_at=timezone.now(),
         )
 
+        celery_running = NotionSyncJob.objects.create(
+            job_id="job-celery-running",
+            created_by=self.user,
+            status=NotionSyncJob.STATUS_RUNNING,
+            executor=NotionSyncJob.EXECUTOR_CELERY,
+            heartbeat_at=timezone.now(),
+        )
+        celery_expired = NotionSyncJob.objects.create(
+            job_id="job-celery-expired",
+            created_by=self.user,
+            status=NotionSyncJob.STATUS_RUNNING,
+            executor=NotionSyncJob.EXECUTOR_CELERY,
+            heartbeat_at=timezone.now() - timedelta(hours=1),
+        )
+
         updated = reconcile_stale_sync_jobs()
-        self.assertEqual(updated, 2)
+        self.assertEqual(updated, 3)
+        celery_running.refresh_from_db()
+        self.assertEqual(celery_running.status, NotionSyncJob.STATUS_RUNNING)
+        celery_expired.refresh_from_db()
+        self.assertEqual(celery_expired.status, NotionSyncJob.STATUS_FAILED)
 
         stale_running.refresh_from_db()
         stale_queued.refresh_from_db()
@@ -432,8 +1207,7 @@ class NotionAPITestCase(TestCase):
             rag_document_id="doc-existing",
             last_edited_time=timezone.now(),
         )
-        from notion_integration.api_views import _compute_notion_content_hash
-        row.content_hash = _compute_notion_content_hash(row)
+        row.content_hash = row.compute_content_hash()
         row.save(update_fields=["content_hash"])
 
         self.client.force_authenticate(self.user)
@@ -446,8 +1220,196 @@ class NotionAPITestCase(TestCase):
         self.assertEqual(body["skipped_unchanged"], 1)
         post_mock.assert_not_called()
 
+    def test_partial_save_keeps_fingerprint_written_by_concurrent_sync(self):
+        NotionContent.objects.create(
+            notion_id="page-race",
+            object_type="page",
+            title="Handbook",
+            plain_text="Old text",
+            raw_metadata={},
+        )
+        ingesting = NotionContent.objects.get(notion_id="page-race")
+        synced = NotionContent.objects.get(notion_id="page-race")
+        synced.plain_text = "New text"
+        synced.save()
+
+        ingesting.content_hash = ingesting.compute_content_hash()
+        ingesting.save(update_fields=["content_hash"])
+
+        stored = NotionContent.objects.get(notion_id="page-race")
+        self.assertEqual(stored.content_fingerprint, synced.compute_content_hash())
+        self.assertNotEqual(stored.content_hash, stored.content_fingerprint)
+
+    @override_settings(RAG_SECTION_MIN_CHARS=10)
+    @mock.patch("notion_integration.api_views.requests.delete")
+    @mock.patch("notion_integration.api_views.requests.post")
+    def test_ingest_rag_reingests_only_changed_sections(self, post_mock, delete_mock):
+        collector = PageTextCollector()
+        collector.add(["Intro text"])
+        collector.add(["Vacation"], heading_level=1)
+        collector.add(["Ten days a year"])
+        collector.add(["Expenses"], heading_level=1)
+        collector.add(["Submit receipts monthly"])
+        row = NotionContent.objects.create(
+            notion_id="page-sections",
+            object_type="page",
+            title="Handbook",
+            url="https://www.notion.so/page-sections",
+            plain_text=collector.text,
+            headings=collector.headings,
+            rag_document_id="doc-whole-page",
+            last_edited_time=timezone.now(),
+        )
+        posted = []
+
+        def post(url, headers=None, json=None, timeout=None):
+            posted.append(json)
+            response = mock.MagicMock()
+            response.status_code = 200
+            response.json.return_value = {"document_id": f"doc-{len(posted)}"}
+            return response
+
+        post_mock.side_effect = post
+        delete_mock.return_value = mock.MagicMock(status_code=200)
+
+        first = _run_notion_rag_ingest(max_items=None, only_changed=True, user=self.user, concurrency=1)
+
+        self.assertEqual(first["sections_ingested"], 3)
+        self.assertEqual([payload["metadata"]["notion_section_anchor"] for payload in posted], ["intro", "vacation", "expenses"])
+        self.assertTrue(all(payload["metadata"]["source"] == row.url for payload in posted))
+        delete_mock.assert_called_once()
+        self.assertIn("doc-whole-page", delete_mock.call_args.args[0])
+        row.refresh_from_db()
+        self.assertEqual(row.rag_document_id, "")
+        self.assertEqual(row.sections.count(), 3)
+
+        row.plain_text = row.plain_text.replace("Ten days", "Twelve days")
+        row.headings = [
+            {**heading, "offset": heading["offset"] + 3 if heading["title"] == "Expenses" else heading["offset"]}
+            for heading in row.headings
+        ]
+        row.save()
+        posted.clear()
+        delete_mock.reset_mock()
+
+        second = _run_notion_rag_ingest(max_items=None, only_changed=True, user=self.user, concurrency=1)
+
+        self.assertEqual(second["sections_ingested"], 1)
+        self.assertEqual(second["sections_unchanged"], 2)
+        self.assertEqual(posted[0]["metadata"]["notion_section_anchor"], "vacation")
+        self.assertIn("Twelve days", posted[0]["content"])
+        delete_mock.assert_called_once()
+        self.assertIn("doc-2", delete_mock.call_args.args[0])
+
+        third = _run_notion_rag_ingest(max_items=None, only_changed=True, user=self.user, concurrency=1)
+        self.assertEqual(third["skipped_unchanged"], 1)
+
+    @mock.patch("notion_integration.api_views.requests.post")
+    def test_ingest_rag_selects_changed_rows_by_fingerprint(self, post_mock):
+        unchanged = NotionContent.objects.create(
+            notion_id="page-unchanged", object_type="page", plain_text="same", rag_document_id="doc-same"
+        )
+        NotionContent.objects.filter(pk=unchanged.pk).update(content_hash=unchanged.content_fingerprint)
+        edited = NotionContent.objects.create(
+            notion_id="page-edited", object_type="page", plain_text="old", rag_document_id="doc-edited"
+        )
+        NotionContent.objects.filter(pk=edited.pk).update(content_hash=edited.content_fingerprint)
+        edited.plain_text = "new"
+        edited.save(update_fields=["plain_text"])
+
+        post_response = mock.MagicMock()
+        post_response.json.return_value = {"document_id": "doc-edited-2"}
+        post_mock.return_value = post_response
+
+        with mock.patch("notion_integration.api_views.requests.delete") as delete_mock:
+            delete_mock.return_value.status_code = 200
+            result = _run_notion_rag_ingest(max_items=None, only_changed=True, user=self.user, concurrency=1)
+
+        self.assertEqual(result["processed"], 2)
+        self.assertEqual(result["skipped_unchanged"], 1)
+        self.assertEqual(result["ingested"], 1)
+        self.assertEqual(post_mock.call_args.kwargs["json"]["metadata"]["notion_id"], "page-edited")
+        edited.refresh_from_db()
+        self.assertEqual(edited.content_hash, edited.content_fingerprint)
+        self.assertEqual(edited.rag_document_id, "doc-edited-2")
+
+    @mock.patch("notion_integration.api_views.time.sleep")
+    @mock.patch("notion_integration.api_views.requests.post")
+    def test_ingest_rag_retries_transient_failures_in_parallel(self, post_mock, sleep_mock):
+        for index in range(5):
+            NotionContent.objects.create(
+                notion_id=f"page-par-{index}",
+                object_type="page",
+                title=f"Doc {index}",
+                plain_text=f"text {index}",
+                last_edited_time=timezone.now(),
+            )
+
+        unavailable = mock.MagicMock()
+        unavailable.status_code = 503
+        unavailable.headers = {}
+
+        def post(url, headers=None, json=None, timeout=None):
+            if json["metadata"]["notion_id"] == "page-par-2" and not post.failed_once:
+                post.failed_once = True
+                return unavailable
+            ok = mock.MagicMock()
+            ok.status_code = 200
+            ok.json.return_value = {"document_id": f"doc-{json['metadata']['notion_id']}"}
+            return ok
+
+        post.failed_once = False
+        post_mock.side_effect = post
+
+        result = _run_notion_rag_ingest(max_items=None, only_changed=True, user=self.user, concurrency=3)
+
+        self.assertEqual(result["ingested"], 5)
+        self.assertEqual(result["failed"], 0)
+        self.assertEqual(result["retried"], 1)
+        self.assertEqual(result["concurrency"], 3)
+        self.assertEqual(post_mock.call_count, 6)
+        sleep_mock.assert_called_once_with(1.0)
+        retried_row = next(row for row in result["row_results"] if row["notion_id"] == "page-par-2")
+        self.assertEqual(retried_row["attempts"], 2)
+        self.assertEqual(NotionContent.objects.get(notion_id="page-par-2").rag_document_id, "doc-page-par-2")
+
+    @mock.patch("notion_integration.api_views.time.sleep")
+    @mock.patch("notion_integration.api_views.requests.post")
+    def test_ingest_rag_does_not_retry_post_after_timeout_or_server_error(self, post_mock, sleep_mock):
+        NotionContent.objects.create(notion_id="page-timeout", object_type="page", plain_text="text")
+        NotionContent.objects.create(notion_id="page-502", object_type="page", plain_text="text")
+        bad_gateway = mock.MagicMock(status_code=502, headers={})
+        bad_gateway.raise_for_status.side_effect = requests.exceptions.HTTPError("502 Bad Gateway")
+
+        def post(url, headers=None, json=None, timeout=None):
+            if json["metadata"]["notion_id"] == "page-timeout":
+                raise requests.exceptions.ReadTimeout("read timed out")
+            return bad_gateway
+
+        post_mock.side_effect = post
+
+        result = _run_notion_rag_ingest(max_items=None, only_changed=True, user=self.user, concurrency=100)
+
+        self.assertEqual(result["failed"], 2)
+        self.assertEqual(post_mock.call_count, 2)
+        self.assertEqual(result["concurrency"], 16)
+        sleep_mock.assert_not_called()
+
+    @mock.patch("notion_integration.api_views.requests.post")
+    def test_ingest_rag_records_failed_rows(self, post_mock):
+        NotionContent.objects.create(notion_id="page-fail", object_type="page", plain_text="text")
+        post_mock.side_effect = ValueError("boom")
+
+        result = _run_notion_rag_ingest(max_items=None, only_changed=True, user=self.user, concurrency=2)
+
+        self.assertEqual(result["failed"], 1)
+        self.assertEqual(result["row_results"], [{"notion_id": "page-fail", "status": "failed", "error": "boom"}])
+        self.assertEqual(NotionContent.objects.get(notion_id="page-fail").rag_document_id, "")
 
 class NotionServiceRetryTestCase(SimpleTestCase):
+    def setUp(self):
+        rate_limit._limiters.clear()
+
     @mock.patch.dict("os.environ", {"NOTION_INTERNAL_TOKEN": "test-token", "NOTION_API_MAX_RETRIES": "2"})
     @mock.patch("notion_integration.services.time.sleep")
     @mock.patch("notion_integration.services.requests.request")
@@ -511,6 +1473,60 @@ class NotionServiceRetryTestCase(SimpleTestCase):
         sleep_mock.assert_called_once_with(1.0)
 
 
+class NotionRateLimiterTestCase(SimpleTestCase):
+    def setUp(self):
+        rate_limit._limiters.clear()
+
+    @mock.patch("notion_integration.rate_limit.time.monotonic")
+    def test_bucket_allows_burst_then_spaces_requests(self, monotonic_mock):
+        monotonic_mock.return_value = 100.0
+        bucket = rate_limit.LocalTokenBucket(rate=3, capacity=3)
+
+        waits = [bucket.reserve() for _ in range(5)]
+
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 1 / 3)
+        self.assertAlmostEqual(waits[4], 2 / 3)
+
+    @mock.patch("notion_integration.rate_limit.time.monotonic")
+    def test_bucket_pause_delays_next_reservation(self, monotonic_mock):
+        monotonic_mock.return_value = 100.0
+        bucket = rate_limit.LocalTokenBucket(rate=3, capacity=3)
+
+        bucket.pause(5)
+
+        self.assertAlmostEqual(bucket.reserve(), 5 + 1 / 3)
+
+    @mock.patch.dict("os.environ", {"NOTION_INTERNAL_TOKEN": "shared-token"})
+    def test_services_share_one_limiter_per_token(self):
+        self.assertIs(NotionService().rate_limiter, NotionService().rate_limiter)
+
+    @mock.patch("notion_integration.rate_limit.RATE_LIMITER_MAX_TOKENS", 2)
+    def test_limiter_registry_evicts_least_recently_used_token(self):
+        first = rate_limit.get_rate_limiter("token-1")
+        rate_limit.get_rate_limiter("token-2")
+        self.assertIs(rate_limit.get_rate_limiter("token-1"), first)
+
+        rate_limit.get_rate_limiter("token-3")
+
+        self.assertEqual(len(rate_limit.get_rate_limit_metrics()), 2)
+        self.assertIs(rate_limit.get_rate_limiter("token-1"), first)
+
+    @mock.patch("notion_integration.rate_limit.time.sleep")
+    def test_limiter_records_queued_and_throttled_metrics(self, sleep_mock):
+        limiter = rate_limit.get_rate_limiter("metrics-token")
+        for _ in range(4):
+            limiter.acquire()
+        limiter.record_throttled(2)
+
+        metrics = rate_limit.get_rate_limit_metrics()[0]
+        self.assertEqual(metrics["acquired"], 4)
+        self.assertEqual(metrics["queued"], 1)
+        self.assertEqual(metrics["throttled"], 1)
+        self.assertEqual(metrics["backend"], "local")
+        sleep_mock.assert_called_once()
+
+
 class NotionServiceExtractionTestCase(SimpleTestCase):
     def test_extract_text_preserves_external_urls_and_captions(self):
         service = object.__new__(NotionService)
@@ -571,3 +1587,300 @@ class NotionServiceExtractionTestCase(SimpleTestCase):
         text = service._extract_text_from_blocks(blocks)
         self.assertIn("ok", text)
         self.assertIn("fallback", text)
+
+
+class NotionBlockCacheTestCase(TestCase):
+    def setUp(self):
+        self.tree = {"page": ["a", "b"], "a": ["a1", "a2"], "b": ["b1"]}
+        self.edited = {block_id: "2026-03-01T00:00:00.000Z" for block_id in ["page", "a", "b", "a1", "a2", "b1"]}
+        self.fetched = []
+        self.service = object.__new__(NotionService)
+        self.service.retrieve_page = lambda page_id: {"id": page_id, "last_edited_time": self.edited["page"]}
+
+        def list_block_children(block_id, page_size=50, start_cursor=None):
+            self.fetched.append(block_id)
+            return {
+                "results": [
+                    {
+                        "id": child_id,
+                        "type": "paragraph",
+                        "has_children": child_id in self.tree,
+                        "last_edited_time": self.edited[child_id],
+                        "paragraph": {"rich_text": [{"plain_text": f"text {child_id}"}]},
+                    }
+                    for child_id in self.tree.get(block_id, [])
+                ],
+                "has_more": False,
+                "next_cursor": None,
+            }
+
+        self.service.list_block_children = list_block_children
+
+    def _sync_page(self, concurrency):
+        self.fetched = []
+        cache = NotionPageBlockCache.for_page("page")
+        payload = self.service.get_page_content("page", concurrency=concurrency, block_cache=cache)
+        cache.save(prune=True)
+        return payload["text_content"]
+
+    def test_unchanged_subtrees_are_served_from_cache(self):
+        for concurrency in (1, 3):
+            with self.subTest(concurrency=concurrency):
+                NotionBlockChildren.objects.all().delete()
+                self.edited["page"] = self.edited["b"] = "2026-03-01T00:00:00.000Z"
+                first = self._sync_page(concurrency)
+                self.assertEqual(sorted(self.fetched), ["a", "b", "page"])
+
+                self.assertEqual(self._sync_page(concurrency), first)
+                self.assertEqual(self.fetched, [])
+
+                self.edited["page"] = self.edited["b"] = "2026-03-02T00:00:00.000Z"
+                self.assertEqual(self._sync_page(concurrency), first)
+                self.assertEqual(sorted(self.fetched), ["b", "page"])
+
+    def test_save_prunes_blocks_no_longer_on_page(self):
+        self._sync_page(1)
+        self.tree["page"] = ["a"]
+        self.edited["page"] = "2026-03-02T00:00:00.000Z"
+        self._sync_page(1)
+        self.assertEqual(
+            sorted(NotionBlockChildren.objects.values_list("block_id", flat=True)),
+            ["a", "page"],
+        )
+
+    @mock.patch.dict("os.environ", {"NOTION_BLOCK_CACHE_MAX_AGE_HOURS": "0"})
+    def test_cache_disabled_with_zero_max_age(self):
+        self.assertIsNone(NotionPageBlockCache.for_page("page"))
+
+    @mock.patch.dict("os.environ", {"NOTION_BLOCK_CACHE_MAX_AGE_HOURS": "a day"})
+    def test_malformed_max_age_falls_back_to_default(self):
+        with self.assertLogs("notion_integration.services", level="WARNING") as logs:
+            cache = NotionPageBlockCache.for_page("page")
+        self.assertEqual(cache.max_age, timedelta(hours=24))
+        self.assertIn("notion_invalid_setting name=NOTION_BLOCK_CACHE_MAX_AGE_HOURS", logs.output[0])
+
+
+class NotionDatabaseRowMirrorTestCase(TestCase):
+    def _row(self, row_id, name, edited, created="2026-03-01T00:00:00.000Z"):
+        return {
+            "id": row_id,
+            "created_time": created,
+            "last_edited_time": edited,
+            "properties": {"Name": {"type": "title", "title": [{"plain_text": name}]}},
+        }
+
+    def _notion(self, rows):
+        notion = mock.Mock()
+        notion.extract_title.side_effect = lambda obj: _row_title(obj)
+        notion.query_database.return_value = {"results": rows, "has_more": False}
+        return notion
+
+    def test_first_sync_mirrors_all_rows_then_queries_only_changes(self):
+        notion = self._notion(
+            [
+                self._row("row-1", "Alpha", "2026-03-02T10:00:00.000Z"),
+                self._row("row-2", "Beta", "2026-03-02T11:00:00.000Z", created="2026-03-01T01:00:00.000Z"),
+            ]
+        )
+        text = _sync_database_rows(notion, "db-1")
+
+        self.assertEqual(text, "Alpha: Name: Alpha\nBeta: Name: Beta")
+        self.assertIsNone(notion.query_database.call_args.kwargs["query_filter"])
+        mirror = NotionDatabaseMirror.objects.get(database_id="db-1")
+        self.assertEqual(mirror.rows_last_edited_time, datetime(2026, 3, 2, 11, 0, tzinfo=dt_timezone.utc))
+
+        notion.query_database.reset_mock()
+        notion.query_database.return_value = {
+            "results": [self._row("row-1", "Alpha v2", "2026-03-03T09:00:00.000Z")],
+            "has_more": False,
+        }
+        text = _sync_database_rows(notion, "db-1")
+
+        self.assertEqual(text, "Alpha v2: Name: Alpha v2\nBeta: Name: Beta")
+        query_filter = notion.query_database.call_args.kwargs["query_filter"]
+        self.assertEqual(query_filter["timestamp"], "last_edited_time")
+        self.assertEqual(query_filter["last_edited_time"]["on_or_after"], "2026-03-02T10:55:00+00:00")
+        self.assertEqual(NotionDatabaseRow.objects.filter(database_id="db-1").count(), 2)
+
+    def test_reconcile_pass_drops_rows_notion_no_longer_returns(self):
+        notion = self._notion(
+            [
+                self._row("row-1", "Alpha", "2026-03-02T10:00:00.000Z"),
+                self._row("row-2", "Beta", "2026-03-02T11:00:00.000Z"),
+            ]
+        )
+        _sync_database_rows(notion, "db-1")
+        NotionDatabaseMirror.objects.filter(database_id="db-1").update(
+            reconciled_at=timezone.now() - timedelta(days=2)
+        )
+        notion.query_database.return_value = {
+            "results": [self._row("row-2", "Beta", "2026-03-02T11:00:00.000Z")],
+            "has_more": False,
+        }
+        record = mock.Mock()
+
+        text = _sync_database_rows(notion, "db-1", record=record)
+
+        self.assertEqual(text, "Beta: Name: Beta")
+        self.assertFalse(NotionDatabaseRow.objects.filter(row_id="row-1").exists())
+        self.assertIsNone(notion.query_database.call_args.kwargs["query_filter"])
+        record.assert_called_once_with(
+            "database_rows_synced", notion_id="db-1", mode="full", rows_fetched=1, rows_removed=1, requests=1
+        )
+
+
+def _row_title(obj):
+    prop = (obj.get("properties") or {}).get("Name") or {}
+    return "".join(part.get("plain_text", "") for part in prop.get("title", []))
+
+
+class NotionSectionSplitTestCase(SimpleTestCase):
+    def test_sections_are_anchored_on_headings(self):
+        text = "Intro\nSetup\nstep one\nSetup\nstep two"
+        headings = [{"offset": 6, "level": 2, "title": "Setup"}, {"offset": 21, "level": 2, "title": "Setup"}]
+        sections = split_notion_sections(text, headings)
+        self.assertEqual([section["anchor"] for section in sections], ["intro", "setup", "setup-2"])
+        self.assertEqual(sections[1]["text"], "Setup\nstep one")
+
+    def test_editing_one_section_keeps_other_hashes(self):
+        before = split_notion_sections("A\none\nB\ntwo", [{"offset": 0, "title": "A"}, {"offset": 6, "title": "B"}])
+        after = split_notion_sections("A\none!\nB\ntwo", [{"offset": 0, "title": "A"}, {"offset": 7, "title": "B"}])
+        self.assertNotEqual(before[0]["content_hash"], after[0]["content_hash"])
+        self.assertEqual(before[1]["content_hash"], after[1]["content_hash"])
+
+
+class NotionServiceBlockTraversalTestCase(SimpleTestCase):
+    def _service_for_tree(self, tree):
+        service = object.__new__(NotionService)
+
+        def list_block_children(block_id, page_size=50, start_cursor=None):
+            children = tree.get(block_id, [])
+            offset = int(start_cursor or 0)
+            page = children[offset:offset + 2]
+            has_more = offset + 2 < len(children)
+            return {
+                "results": [
+                    {
+                        "id": child_id,
+                        "type": "paragraph",
+                        "has_children": child_id in tree,
+                        "paragraph": {"rich_text": [{"plain_text": f"text {child_id}"}]},
+                    }
+                    for child_id in page
+                ],
+                "has_more": has_more,
+                "next_cursor": str(offset + 2) if has_more else None,
+            }
+
+        service.list_block_children = list_block_children
+        return service
+
+    def _traverse(self, tree, concurrent, max_blocks=5000, max_depth=20):
+        service = self._service_for_tree(tree)
+        state = {"count": 0, "max_blocks": max_blocks, "max_depth": max_depth, "visited_block_ids": set()}
+        if concurrent:
+            blocks = service._get_all_blocks_concurrent("page", state=state, concurrency=4)
+        else:
+            blocks = service._get_all_blocks_recursive("page", state=state)
+        return [block["id"] for block in blocks], state["count"]
+
+    def test_concurrent_traversal_matches_serial_order_and_limits(self):
+        tree = {
+            "page": ["a", "b", "c", "d", "e"],
+            "a": ["a1", "a2", "a3"],
+            "a2": ["a2x", "a2y"],
+            "b": ["b1"],
+            "b1": ["b1x"],
+            "d": ["d1", "a"],
+            "a2y": ["deep"],
+        }
+        for max_blocks, max_depth in [(5000, 20), (7, 20), (3, 20), (5000, 1), (10, 2)]:
+            with self.subTest(max_blocks=max_blocks, max_depth=max_depth):
+                self.assertEqual(
+                    self._traverse(tree, concurrent=True, max_blocks=max_blocks, max_depth=max_depth),
+                    self._traverse(tree, concurrent=False, max_blocks=max_blocks, max_depth=max_depth),
+                )
+
+    def test_text_only_traversal_matches_block_extraction(self):
+        tree = {
+            "page": ["a", "b", "c"],
+            "a": ["a1", "a2"],
+            "a2": ["a2x"],
+            "c": ["c1", "a"],
+        }
+        for max_blocks in (5000, 4):
+            expected = None
+            for concurrency in (1, 3):
+                with self.subTest(max_blocks=max_blocks, concurrency=concurrency):
+                    service = self._service_for_tree(tree)
+                    service.retrieve_page = lambda page_id: {"id": page_id}
+                    full = service.get_page_content("page", max_blocks=max_blocks, concurrency=concurrency)
+                    lean = service.get_page_content(
+                        "page", max_blocks=max_blocks, concurrency=concurrency, include_blocks=False
+                    )
+                    self.assertEqual(lean["text_content"], full["text_content"])
+                    self.assertEqual(lean["block_count"], full["block_count"])
+                    self.assertEqual(lean["blocks"], [])
+                    expected = expected or full["text_content"]
+                    self.assertEqual(full["text_content"], expected)
+
+    def test_concurrent_traversal_stops_fetching_once_window_is_full(self):
+        tree = {"page": [f"c{index}" for index in range(6)]}
+        tree.update({f"c{index}": [f"c{index}a", f"c{index}b"] for index in range(6)})
+        service = self._service_for_tree(tree)
+        list_block_children = service.list_block_children
+        fetched = []
+
+        def counting_list_block_children(block_id, page_size=50, start_cursor=None):
+            if start_cursor is None:
+                fetched.append(block_id)
+            return list_block_children(block_id, page_size=page_size, start_cursor=start_cursor)
+
+        service.list_block_children = counting_list_block_children
+        state = {"count": 0, "max_blocks": 3, "max_depth": 20, "visited_block_ids": set()}
+        blocks = service._get_all_blocks_concurrent("page", state=state, concurrency=4)
+
+        self.assertEqual([block["id"] for block in blocks], ["c0", "c0a", "c0b"])
+        self.assertEqual(sorted(fetched), ["c0", "page"])
+
+    def test_malformed_block_concurrency_setting_falls_back_to_serial(self):
+        service = self._service_for_tree({"page": ["a"]})
+        service.retrieve_page = lambda page_id: {"id": page_id}
+        with mock.patch.dict("os.environ", {"NOTION_BLOCK_FETCH_CONCURRENCY": "four"}):
+            content = service.get_page_content("page")
+        self.assertEqual(content["block_count"], 1)
+
+    def test_concurrent_traversal_attaches_children(self):
+        service = self._service_for_tree({"page": ["a"], "a": ["a1"]})
+        state = {"count": 0, "max_blocks": 5000, "max_depth": 20, "visited_block_ids": set()}
+        blocks = service._get_all_blocks_concurrent("page", state=state, concurrency=2)
+        self.assertEqual([child["id"] for child in blocks[0]["children"]], ["a1"])
+
+    def test_concurrent_traversal_honours_cancellation(self):
+        from .services import NotionSyncCancelled
+
+        service = self._service_for_tree({"page": ["a"], "a": ["a1"]})
+        state = {"count": 0, "max_blocks": 5000, "max_depth": 20, "visited_block_ids": set()}
+        with self.assertRaises(NotionSyncCancelled):
+            service._get_all_blocks_concurrent("page", state=state, concurrency=2, should_cancel=lambda: True)
+
+
+class NotionBenchmarkTestCase(TestCase):
+    def test_benchmark_reports_sync_and_ingest_stats_and_rolls_back(self):
+        config = BenchmarkConfig(
+            pages=3, blocks_per_page=5, depth=2, fanout=2, databases=1, rows_per_database=3, runs=2, touch_fraction=0.5
+        )
+
+        report = run_benchmark(config)
+
+        first, second = report["rounds"]
+        self.assertEqual(first["sync"]["processed"], 4)
+        self.assertEqual(first["sync"]["errors"], 0)
+        self.assertGreater(first["sync"]["requests_per_item"], 1)
+        self.assertGreater(first["sync"]["db_writes"], 0)
+        self.assertIsNotNone(first["sync"]["p95_ms"])
+        self.assertEqual(first["ingest"]["ingested"], 4)
+        self.assertTrue(second["sync"]["incremental"])
+        # One page and one database row were edited, so their documents change and are re-ingested.
+        self.assertEqual(second["ingest"]["ingested"], 2)
+        self.assertFalse(NotionContent.objects.exists())
@@ -10,10 +10,13 @@ from .api_views import (
     NotionSyncAPIView,
     NotionSyncAsyncAPIView,
     NotionSyncJobStatusAPIView,
+    NotionSyncJobEventsAPIView,
     NotionSyncJobCancelAPIView,
+    NotionSyncJobResumeAPIView,
     NotionSyncActiveJobAPIView,
     NotionSyncLatestJobAPIView,
     NotionIngestToRAGAPIView,
+    NotionRateLimitMetricsAPIView,
 )
 
 app_name = "notion"
@@ -27,6 +30,9 @@ urlpatterns = [
     path("api/sync/jobs/active/", NotionSyncActiveJobAPIView.as_view(), name="api-sync-jobs-active"),
     path("api/sync/jobs/latest/", NotionSyncLatestJobAPIView.as_view(), name="api-sync-jobs-latest"),
     path("api/sync/jobs/<str:job_id>/", NotionSyncJobStatusAPIView.as_view(), name="api-sync-job-status"),
+    path("api/sync/jobs/<str:job_id>/events/", NotionSyncJobEventsAPIView.as_view(), name="api-sync-job-events"),
     path("api/sync/jobs/<str:job_id>/cancel/", NotionSyncJobCancelAPIView.as_view(), name="api-sync-job-cancel"),
+    path("api/sync/jobs/<str:job_id>/resume/", NotionSyncJobResumeAPIView.as_view(), name="api-sync-job-resume"),
     path("api/ingest-rag/", NotionIngestToRAGAPIView.as_view(), name="api-ingest-rag"),
+    path("api/rate-limit/", NotionRateLimitMetricsAPIView.as_view(), name="api-rate-limit"),
 ]
@@ -15,7 +15,11 @@ RAG_API_TIMEOUT = 90
 @require_http_methods(["GET"])
 def dashboard(request):
     """Main RAG search dashboard"""
-    return render(request, "search/dashboard.html")
+    return render(
+        request,
+        "search/dashboard.html",
+        {"notion_sync_event_stream": getattr(settings, "NOTION_SYNC_EVENT_STREAM", False)},
+    )
 
 
 @login_required
@@ -20,6 +20,14 @@ python manage.py migrate --noinput
 echo "Ensuring superuser exists..."
 python manage.py ensure_superuser
 
+# Notion sync jobs go to Celery when a broker is configured; start the worker next
+# to Gunicorn so they are not left queued. Without CELERY_BROKER_URL jobs run on
+# web worker threads instead.
+if [ -n "$CELERY_BROKER_URL" ]; then
+    echo "Starting Celery worker for the notion_sync queue..."
+    celery -A config worker -Q notion_sync --concurrency="${CELERY_WORKER_CONCURRENCY:-2}" --loglevel=info &
+fi
+
 # Start Gunicorn with Django app
 echo "Starting Gunicorn on 0.0.0.0:8000 with Django..."
 exec gunicorn config.wsgi:application \